@@ -0,0 +1,99 @@
+# Simulation du module `cosmic` (Pimoroni Cosmic Unicorn) pour l'exécution sur PC.
+import hostsim
+
+
+class Channel:
+    """Canal du synthétiseur : les tonalités sont seulement comptées."""
+
+    def __init__(self, number):
+        self.number = number
+        self.current_frequency = 0
+        self.playing = False
+
+    def play_tone(self, frequency, volume=None, attack=None, release=None):
+        self.current_frequency = frequency
+        self.playing = True
+        hostsim.sim.stats.tones += 1
+
+    def frequency(self, frequency):
+        self.current_frequency = frequency
+
+    def volume(self, volume=None):
+        return 1.0
+
+    def configure(self, *args, **kwargs):
+        pass
+
+    def trigger_attack(self):
+        self.playing = True
+
+    def trigger_release(self):
+        self.playing = False
+
+
+class CosmicUnicorn:
+    """Matrice 32 x 32 simulée : les boutons viennent du script, update() copie le framebuffer."""
+
+    WIDTH = 32
+    HEIGHT = 32
+
+    # Numéros de broches identiques à la carte réelle.
+    SWITCH_A = 0
+    SWITCH_B = 1
+    SWITCH_C = 3
+    SWITCH_D = 6
+    SWITCH_SLEEP = 27
+    SWITCH_VOLUME_UP = 7
+    SWITCH_VOLUME_DOWN = 8
+    SWITCH_BRIGHTNESS_UP = 21
+    SWITCH_BRIGHTNESS_DOWN = 26
+
+    def __init__(self):
+        self.channels = [Channel(i) for i in range(8)]
+        self.volume = 0.5
+
+    def update(self, graphics):
+        sim = hostsim.sim
+        sim.stats.updates += 1
+        sim.framebuffer = bytes(graphics)
+        if sim.record_frames:
+            sim.frames.append((sim.clock.now, sim.framebuffer))
+        if sim.update_cost:
+            sim.clock.sleep(sim.update_cost)
+
+    def clear(self):
+        hostsim.sim.framebuffer = bytes(self.WIDTH * self.HEIGHT * 4)
+
+    def is_pressed(self, switch):
+        return hostsim.sim.buttons.is_pressed(switch)
+
+    def set_brightness(self, value):
+        hostsim.sim.brightness = max(0.0, min(1.0, value))
+
+    def get_brightness(self):
+        return hostsim.sim.brightness
+
+    def adjust_brightness(self, delta):
+        self.set_brightness(hostsim.sim.brightness + delta)
+
+    def set_volume(self, value):
+        self.volume = value
+
+    def get_volume(self):
+        return self.volume
+
+    def adjust_volume(self, delta):
+        self.volume += delta
+
+    def light(self):
+        return 0
+
+    def synth_channel(self, number):
+        return self.channels[number]
+
+    def play_synth(self):
+        pass
+
+    def stop_playing(self):
+        for channel in self.channels:
+            channel.playing = False
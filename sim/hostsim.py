@@ -0,0 +1,415 @@
+# Cœur du simulateur : horloge virtuelle, compteurs, boutons scriptés et fausse API OPT.
+import gc
+import json
+import random
+import threading
+import time
+import zlib
+import _thread
+
+TICKS_PERIOD = 1 << 30  # Même période que time.ticks_ms() sur le RP2040.
+RTC_DEFAULT_EPOCH = 1609459200  # 2021-01-01 00:00:00 UTC : date du RTC du Pico avant synchronisation NTP.
+
+
+class SimulationEnd(BaseException):
+    """Levée quand la durée virtuelle demandée est écoulée (hérite de BaseException pour traverser les `except Exception`)."""
+
+
+class SimulationReset(BaseException):
+    """Levée par machine.reset()."""
+
+
+class Stats:
+    """Compteurs des chemins critiques mesurés pendant la simulation."""
+
+    def __init__(self):
+        self.updates = 0  # Appels à CosmicUnicorn.update() (flushes vers la matrice).
+        self.pixel_writes = 0  # Appels à PicoGraphics.pixel().
+        self.pixels_filled = 0  # Pixels touchés par clear(), rectangle() et text().
+        self.pens_created = 0  # Appels à PicoGraphics.create_pen().
+        self.http_calls = 0  # Requêtes HTTP servies par la fausse API.
+        self.http_by_path = {}  # Requêtes par chemin.
+        self.tls_handshakes = 0  # Handshakes TLS (une connexion urequests = un handshake).
+        self.dns_lookups = 0  # Résolutions getaddrinfo.
+        self.if_none_match = 0  # Requêtes conditionnelles reçues (If-None-Match).
+        self.not_modified = 0  # Réponses 304 servies.
+        self.ntp_calls = 0  # Requêtes NTP.
+        self.tones = 0  # Tonalités jouées.
+        self.irq_handlers = 0  # Interruptions de broches enregistrées (machine.Pin.irq).
+        self.wlan_objects = 0  # Objets network.WLAN créés.
+        self.gc_collections = 0  # gc.collect() explicites.
+        self.gc_auto = 0  # Collectes déclenchées par gc.threshold() ou par un tas plein.
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class Clock:
+    """Horloge virtuelle.
+
+    Le thread principal fait avancer le temps dans sleep(). Les autres threads (second cœur)
+    sont ordonnancés de façon coopérative : un thread qui dort est réveillé quand le temps
+    virtuel atteint son échéance, et le thread principal attend qu'il se rendorme avant de
+    continuer. Les exécutions sont ainsi reproductibles.
+    """
+
+    def __init__(self, duration=None):
+        self.now = 0.0  # Secondes virtuelles depuis le démarrage.
+        self.duration = duration  # Durée virtuelle maximale (None = illimitée).
+        self.ended = False
+        self.cond = threading.Condition()
+        self.main_ident = threading.get_ident()
+        self.sleepers = []  # Liste de [échéance, numéro, ident] des threads secondaires endormis.
+        self.woken = set()  # Threads secondaires autorisés à repartir.
+        self.running_workers = 0  # Threads secondaires en cours d'exécution.
+        self.seq = 0
+        self.on_advance = None  # Appelée avec (avant, après) à chaque avancée du thread principal.
+        self.drift = 0.0  # Écart relatif de l'oscillateur du Pico (ticks et RTC) par rapport au temps réel.
+
+    # --- Primitives appelées par les modules simulés ---
+
+    def sleep(self, seconds):
+        if seconds < 0:
+            seconds = 0
+        if threading.get_ident() == self.main_ident:
+            self._advance_main(seconds)
+        else:
+            self._sleep_worker(seconds)
+
+    def local(self):
+        """Secondes écoulées vues par l'oscillateur du Pico (dérive comprise)."""
+        return self.now * (1 + self.drift)
+
+    def ticks_ms(self):
+        return int(self.local() * 1000) % TICKS_PERIOD
+
+    def ticks_us(self):
+        return int(self.local() * 1000000) % TICKS_PERIOD
+
+    def start_thread(self, function, args):
+        """Démarre un thread secondaire ordonnancé par l'horloge virtuelle."""
+        with self.cond:
+            self.running_workers += 1
+
+        def runner():
+            try:
+                function(*args)
+            except SimulationEnd:
+                pass
+            except Exception as e:
+                print(f"[sim] Exception dans le thread secondaire : {e!r}")
+            finally:
+                with self.cond:
+                    self.running_workers -= 1
+                    self.cond.notify_all()
+
+        return _real_start_new_thread(runner, ())
+
+    # --- Implémentation ---
+
+    def _wait_workers(self):
+        # Attend que tous les threads secondaires soient endormis ou terminés.
+        # Le délai réel évite un interblocage si un thread attend autre chose que l'horloge.
+        deadline = time.monotonic() + 5
+        while self.running_workers > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print("[sim] Un thread secondaire ne rend pas la main, poursuite de la simulation.")
+                return
+            self.cond.wait(remaining)
+
+    def _advance_main(self, seconds):
+        with self.cond:
+            self._wait_workers()
+            previous = self.now  # Les fronts pendant le réveil des threads secondaires comptent aussi.
+            target = self.now + seconds
+            if self.duration is not None and target >= self.duration:
+                target = self.duration
+            while self.sleepers:
+                self.sleepers.sort()
+                wake_at, _, ident = self.sleepers[0]
+                if wake_at > target:
+                    break
+                self.sleepers.pop(0)
+                if wake_at > self.now:
+                    self.now = wake_at
+                self.woken.add(ident)
+                self.running_workers += 1
+                self.cond.notify_all()
+                self._wait_workers()
+            self.now = target
+            if self.on_advance and target > previous:
+                self.on_advance(previous, target)
+            if self.duration is not None and self.now >= self.duration:
+                self._end()
+
+    def _sleep_worker(self, seconds):
+        ident = threading.get_ident()
+        with self.cond:
+            if self.ended:
+                raise SimulationEnd()
+            self.seq += 1
+            self.sleepers.append([self.now + seconds, self.seq, ident])
+            self.running_workers -= 1
+            self.cond.notify_all()
+            while ident not in self.woken and not self.ended:
+                self.cond.wait()
+            self.woken.discard(ident)
+            if self.ended:
+                raise SimulationEnd()
+
+    def _end(self):
+        self.ended = True
+        self.cond.notify_all()
+        raise SimulationEnd()
+
+
+class Heap:
+    """Tas MicroPython approché pour gc.mem_free(), gc.mem_alloc(), gc.threshold() et gc.collect().
+
+    Une partie fixe reste vivante ; les données reçues ou envoyées sur le réseau et chaque reprise
+    d'une tâche uasyncio laissent des objets temporaires, récupérés par la prochaine collecte.
+    """
+
+    def __init__(self, stats, size=180 * 1024, live=70 * 1024):
+        self.stats = stats
+        self.size = size
+        self.live = live  # Octets toujours référencés.
+        self.garbage = 0  # Octets alloués puis abandonnés depuis la dernière collecte.
+        self.limit = -1  # Seuil de gc.threshold() (-1 = désactivé).
+        self.since = 0  # Octets alloués depuis la dernière collecte.
+
+    def allocate(self, size):
+        self.since += size
+        if self.limit >= 0 and self.since >= self.limit:
+            self.collect(auto=True)
+        elif self.live + self.garbage + size > self.size:
+            self.collect(auto=True)  # Tas plein : collecte forcée, comme MicroPython avant un MemoryError.
+        self.garbage += size
+
+    def collect(self, auto=False):
+        if auto:
+            self.stats.gc_auto += 1
+        else:
+            self.stats.gc_collections += 1
+        self.garbage = 0
+        self.since = 0
+
+    def mem_alloc(self):
+        return self.live + self.garbage
+
+    def mem_free(self):
+        return self.size - self.mem_alloc()
+
+    def threshold(self, amount=None):
+        if amount is None:
+            return self.limit
+        self.limit = amount
+
+
+class Buttons:
+    """Appuis de boutons scriptés : liste de (début, fin, numéro de bouton) en secondes virtuelles.
+
+    Les gestionnaires enregistrés par machine.Pin.irq() sont appelés à chaque front, quand le
+    thread principal fait avancer l'horloge au-delà de l'instant du front.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.presses = []
+        self.handlers = {}  # Numéro de broche -> gestionnaire d'interruption.
+        clock.on_advance = self.fire
+
+    def press(self, at, switch, duration=0.1):
+        self.presses.append((at, at + duration, switch))
+
+    def edges(self):
+        for start, end, switch in self.presses:
+            yield start, switch
+            yield end, switch
+
+    def next_edge(self, after):
+        """Instant du prochain front (d'une broche surveillée) strictement après `after`, ou None."""
+        times = [at for at, switch in self.edges() if at > after and switch in self.handlers]
+        return min(times) if times else None
+
+    def fire(self, previous, now):
+        # Chaque gestionnaire s'exécute à l'instant de son front, même si l'horloge a avancé
+        # d'un coup au-delà (long rendu) : il lit alors l'heure et l'état de la broche de ce front.
+        for at, switch in sorted(self.edges()):
+            if previous < at <= now and switch in self.handlers:
+                self.clock.now = at
+                try:
+                    self.handlers[switch](switch)
+                finally:
+                    self.clock.now = now
+
+    def is_pressed(self, switch):
+        now = self.clock.now
+        for start, end, pressed in self.presses:
+            if pressed == switch and start <= now < end:
+                return True
+        return False
+
+
+AGENCY_NAMES = [
+    "Agence Nouméa Centre", "Agence Magenta", "Agence Dumbéa Médipôle", "Agence Mont-Dore",
+    "Agence Païta", "Agence Koné", "Agence Bourail", "Agence La Foa", "Agence Lifou Wé",
+    "Agence Ducos", "Agence Rivière Salée", "Agence Koumac", "Agence Poindimié", "Agence Maré Tadine",
+    "Agence Vallée des Colons", "Agence Anse Vata", "Agence Thio", "Agence Houaïlou",
+]
+
+
+class FakeOptApi:
+    """Fausse API api.opt.nc : liste des agences et temps d'attente qui évoluent avec le temps virtuel."""
+
+    BASE = "/temps-attente-agences/agences"
+
+    def __init__(self, clock, stats, agencies=8, latency=0.25, handshake=0.6, seed=1,
+                 iot_wait_times=True, outages=()):
+        self.clock = clock
+        self.stats = stats
+        self.latency = latency  # Latence d'une requête (secondes virtuelles).
+        self.handshake = handshake  # Coût d'un handshake TLS (secondes virtuelles).
+        self.iot_wait_times = iot_wait_times  # La liste /agences/iot contient-elle realMaxWaitingTimeMs ?
+        self.outages = list(outages)  # Intervalles (début, fin) pendant lesquels l'API répond 503.
+        rng = random.Random(seed)
+        self.agencies = []
+        for i in range(agencies):
+            self.agencies.append({
+                "idAgence": 100 + i * 7,
+                "designation": AGENCY_NAMES[i % len(AGENCY_NAMES)],
+                "base": rng.randint(0, 14) * 60000,  # Temps d'attente moyen.
+                "swing": rng.randint(0, 6) * 60000,  # Amplitude de variation.
+                "period": rng.randint(300, 3600),  # Période de variation (secondes).
+            })
+
+    def is_down(self):
+        now = self.clock.now
+        return any(start <= now < end for start, end in self.outages)
+
+    def wait_time(self, agency):
+        # Variation triangulaire déterministe autour de la valeur moyenne.
+        phase = (self.clock.now % agency["period"]) / agency["period"]
+        tri = 1 - abs(2 * phase - 1)
+        value = agency["base"] + int(agency["swing"] * (2 * tri - 1))
+        return max(0, value // 60000 * 60000)  # L'API publie des temps à la minute près.
+
+    def describe(self, agency, with_wait):
+        data = {
+            "idAgence": agency["idAgence"],
+            "designation": agency["designation"],
+            "type": "AGENCE",
+            "adresse": {"rue": "1 rue de la Poste", "commune": "NOUMEA", "codePostal": "98800"},
+            "coordonnees": {"latitude": -22.27, "longitude": 166.44},
+            "horaires": "Lundi-Vendredi 07h45-15h30",
+        }
+        if with_wait:
+            data["realMaxWaitingTimeMs"] = self.wait_time(agency)
+        return data
+
+    def handle(self, method, path, headers):
+        """Traite une requête et retourne (statut, en-têtes, corps en bytes)."""
+        self.stats.http_calls += 1
+        self.stats.http_by_path[path] = self.stats.http_by_path.get(path, 0) + 1
+        if self.is_down():
+            return 503, {"Content-Type": "text/plain"}, b"Service Unavailable"
+        if headers.get("x-apikey") in (None, ""):
+            return 401, {"Content-Type": "text/plain"}, b"Unauthorized"
+        if method != "GET" or not path.startswith(self.BASE):
+            return 404, {"Content-Type": "text/plain"}, b"Not Found"
+        rest = path[len(self.BASE):].strip("/")
+        if rest == "iot":
+            # La liste est envoyée en chunked, comme les réponses volumineuses du vrai serveur.
+            body = [self.describe(a, self.iot_wait_times) for a in self.agencies]
+            return 200, {"Content-Type": "application/json", "Transfer-Encoding": "chunked"}, \
+                json.dumps(body).encode()
+        else:
+            agency = None
+            if rest.isdigit():
+                agency = next((a for a in self.agencies if a["idAgence"] == int(rest)), None)
+            if agency is None:
+                return 404, {"Content-Type": "text/plain"}, b"Not Found"
+            body = self.describe(agency, True)
+            # Réponse par agence avec validateur : 304 si le client connaît déjà cette version.
+            content = json.dumps(body).encode()
+            etag = '"%08x"' % zlib.crc32(content)
+            self.stats.if_none_match += "If-None-Match" in headers
+            if headers.get("If-None-Match") == etag:
+                self.stats.not_modified += 1
+                return 304, {"ETag": etag}, b""
+            return 200, {"Content-Type": "application/json", "ETag": etag}, content
+
+
+class Simulation:
+    """Regroupe l'état partagé par les modules simulés (cosmic, picographics, network...)."""
+
+    def __init__(self, duration=None, agencies=8, latency=0.25, handshake=0.6, seed=1,
+                 iot_wait_times=True, outages=(), update_cost=0.0005, pixel_cost=0.00001,
+                 wifi_connect_delay=2.0, wifi_drops=(), ntp_fail=(), drift_ppm=0.0):
+        self.clock = Clock(duration)
+        self.clock.drift = drift_ppm / 1000000
+        self.stats = Stats()
+        self.buttons = Buttons(self.clock)
+        self.heap = Heap(self.stats)
+        self.api = FakeOptApi(self.clock, self.stats, agencies, latency, handshake, seed,
+                              iot_wait_times, outages)
+        self.update_cost = update_cost  # Coût virtuel d'un flush vers la matrice.
+        self.pixel_cost = pixel_cost  # Coût virtuel d'une écriture de pixel.
+        self.wifi_connect_delay = wifi_connect_delay  # Délai entre connect() et l'obtention du lien.
+        self.wifi_drops = list(wifi_drops)  # Intervalles (début, fin) de coupure WiFi.
+        self.ntp_fail = set(ntp_fail)  # Serveurs NTP qui ne répondent pas.
+        self.rtc_base = RTC_DEFAULT_EPOCH  # time.time() = rtc_base + temps virtuel vu par l'oscillateur.
+        self.real_epoch = 1731870000  # Heure UTC « réelle » au démarrage (2024-11-17 19:00 UTC, 06:00 à Nouméa).
+        self.frames = []  # Copies du framebuffer à chaque flush si record_frames est actif.
+        self.record_frames = False
+        self.framebuffer = None  # Dernier framebuffer poussé vers la matrice.
+        self.brightness = 0.5
+
+    def wifi_up(self):
+        now = self.clock.now
+        return not any(start <= now < end for start, end in self.wifi_drops)
+
+
+_real_start_new_thread = _thread.start_new_thread
+_real_gmtime = time.gmtime
+sim = None  # Instance courante, créée par install().
+
+
+def install(simulation):
+    """Active la simulation : horloge virtuelle dans `time`, threads ordonnancés, modules MicroPython."""
+    global sim
+    sim = simulation
+    clock = simulation.clock
+
+    def ticks_diff(a, b):
+        return ((a - b + TICKS_PERIOD // 2) % TICKS_PERIOD) - TICKS_PERIOD // 2
+
+    def ticks_add(a, delta):
+        return (a + delta) % TICKS_PERIOD
+
+    def virtual_time():
+        return int(simulation.rtc_base + clock.local())
+
+    def localtime(secs=None):
+        if secs is None:
+            secs = virtual_time()
+        return tuple(_real_gmtime(secs))[:8]
+
+    time.sleep = clock.sleep
+    time.sleep_ms = lambda ms: clock.sleep(ms / 1000)
+    time.sleep_us = lambda us: clock.sleep(us / 1000000)
+    time.ticks_ms = clock.ticks_ms
+    time.ticks_us = clock.ticks_us
+    time.ticks_diff = ticks_diff
+    time.ticks_add = ticks_add
+    time.time = virtual_time
+    time.localtime = localtime
+    time.gmtime = localtime
+    _thread.start_new_thread = clock.start_thread
+    heap = simulation.heap
+    gc.collect = heap.collect  # Le ramasse-miettes de l'hôte continue de fonctionner automatiquement.
+    gc.mem_free = heap.mem_free
+    gc.mem_alloc = heap.mem_alloc
+    gc.threshold = heap.threshold
+    return simulation
@@ -0,0 +1,65 @@
+# Simulation du module `machine`.
+import hostsim
+
+
+def reset():
+    raise hostsim.SimulationReset()
+
+
+def soft_reset():
+    raise hostsim.SimulationReset()
+
+
+def freq(value=None):
+    return 125000000
+
+
+def unique_id():
+    return b'\xe6\x61\x38\x10\x23\x45\x67\x89'
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, number, mode=-1, pull=-1, value=None):
+        self.number = number
+        self.mode = mode
+        self._value = value or 0
+
+    def value(self, value=None):
+        if value is None:
+            if self.mode == Pin.IN:
+                # Boutons de la carte : actifs à l'état bas (résistance de tirage vers le haut).
+                return 0 if hostsim.sim.buttons.is_pressed(self.number) else 1
+            return self._value
+        self._value = value
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        """Le gestionnaire est appelé avec la broche à chaque front d'appui ou de relâchement scripté."""
+        hostsim.sim.stats.irq_handlers += 1
+        hostsim.sim.buttons.handlers[self.number] = lambda number: handler(self)
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+class RTC:
+    def datetime(self, value=None):
+        import time
+        if value is None:
+            t = time.localtime()
+            return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+        # (année, mois, jour, jour de semaine, heure, minute, seconde, sous-seconde) : recale time.time()
+        import calendar
+        sim = hostsim.sim
+        seconds = calendar.timegm((value[0], value[1], value[2], value[4], value[5], value[6], 0, 0, 0))
+        sim.rtc_base = seconds - sim.clock.local()
+        return None
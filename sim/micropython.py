@@ -0,0 +1,25 @@
+# Simulation du module `micropython`.
+
+
+def const(value):
+    return value
+
+
+def native(function):
+    return function
+
+
+def viper(function):
+    return function
+
+
+def mem_info(verbose=False):
+    pass
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def schedule(function, arg):
+    function(arg)
@@ -0,0 +1,57 @@
+# Simulation du module `network` (WiFi du Pico W).
+import hostsim
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_WRONG_PASSWORD = -3
+STAT_NO_AP_FOUND = -2
+STAT_CONNECT_FAIL = -1
+STAT_GOT_IP = 3
+
+
+class WLAN:
+    """Interface WiFi simulée : le lien s'établit `wifi_connect_delay` secondes après connect().
+
+    Une coupure (--wifi-drop) fait perdre l'association : le lien ne revient qu'après un nouveau connect().
+    """
+
+    _connected_at = None  # Partagé entre toutes les instances, comme le matériel réel.
+
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        hostsim.sim.stats.wlan_objects += 1
+
+    def active(self, state=None):
+        return True
+
+    def connect(self, ssid=None, password=None):
+        if WLAN._connected_at is None:
+            WLAN._connected_at = hostsim.sim.clock.now + hostsim.sim.wifi_connect_delay
+
+    def disconnect(self):
+        WLAN._connected_at = None
+
+    def isconnected(self):
+        sim = hostsim.sim
+        if WLAN._connected_at is None or sim.clock.now < WLAN._connected_at:
+            return False
+        if not sim.wifi_up():
+            WLAN._connected_at = None  # Association perdue : il faut rappeler connect() après la coupure.
+            return False
+        return True
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return -60
+        if self.isconnected():
+            return STAT_GOT_IP
+        return STAT_CONNECTING if WLAN._connected_at is not None else STAT_IDLE
+
+    def ifconfig(self, config=None):
+        return ('192.168.1.42', '255.255.255.0', '192.168.1.1', '192.168.1.1')
+
+    def config(self, *args, **kwargs):
+        return None
@@ -0,0 +1,21 @@
+# Simulation du module `ntptime`.
+import hostsim
+
+host = "pool.ntp.org"
+timeout = 1
+
+
+def time():
+    sim = hostsim.sim
+    sim.stats.ntp_calls += 1
+    if host in sim.ntp_fail or not sim.wifi_up():
+        sim.clock.sleep(timeout)
+        raise OSError(110)  # ETIMEDOUT
+    sim.clock.sleep(0.05)
+    return int(sim.real_epoch + sim.clock.now)
+
+
+def settime():
+    sim = hostsim.sim
+    t = time()
+    sim.rtc_base = t - sim.clock.local()
@@ -0,0 +1,147 @@
+# Simulation du module `picographics` : framebuffer 32 x 32 en mémoire au format RGB888.
+import hostsim
+
+DISPLAY_COSMIC_UNICORN = 17
+PEN_RGB888 = 7
+
+WIDTH = 32
+HEIGHT = 32
+BYTES_PER_PIXEL = 4  # uint32 0x00RRGGBB en little-endian, comme la cible.
+
+# Police 3 x 5 approximant "bitmap5" (les minuscules utilisent les majuscules).
+_FONT = {
+    'A': "010101111101101", 'B': "110101110101110", 'C': "011100100100011", 'D': "110101101101110",
+    'E': "111100110100111", 'F': "111100110100100", 'G': "011100101101011", 'H': "101101111101101",
+    'I': "111010010010111", 'J': "001001001101010", 'K': "101101110101101", 'L': "100100100100111",
+    'M': "101111111101101", 'N': "110101101101101", 'O': "010101101101010", 'P': "110101110100100",
+    'Q': "010101101110011", 'R': "110101110101101", 'S': "011100010001110", 'T': "111010010010010",
+    'U': "101101101101111", 'V': "101101101101010", 'W': "101101111111101", 'X': "101101010101101",
+    'Y': "101101010010010", 'Z': "111001010100111",
+    '0': "111101101101111", '1': "010110010010111", '2': "110001010100111", '3': "110001010001110",
+    '4': "101101111001001", '5': "111100110001110", '6': "011100111101111", '7': "111001010010010",
+    '8': "111101111101111", '9': "111101111001110",
+    '.': "000000000000010", '-': "000000111000000", ':': "000010000010000", "'": "010010000000000",
+    '/': "001001010100100", '(': "010100100100010", ')': "010001001001010", '!': "010010010000010",
+}
+_UNKNOWN = "111101101101111"
+_CHAR_WIDTH = 3
+_SPACE_WIDTH = 3
+
+
+class PicoGraphics(bytearray):
+    """Hérite de bytearray pour que memoryview(graphics) expose le framebuffer comme sur la cible."""
+
+    def __new__(cls, display=DISPLAY_COSMIC_UNICORN, pen_type=PEN_RGB888, **kwargs):
+        return super().__new__(cls, WIDTH * HEIGHT * BYTES_PER_PIXEL)
+
+    def __init__(self, display=DISPLAY_COSMIC_UNICORN, pen_type=PEN_RGB888, **kwargs):
+        super().__init__(WIDTH * HEIGHT * BYTES_PER_PIXEL)
+        self.pen = 0
+        self.font = "bitmap8"
+        self.clip = (0, 0, WIDTH, HEIGHT)
+
+    # --- Stylos ---
+
+    def create_pen(self, r, g, b):
+        hostsim.sim.stats.pens_created += 1
+        return ((r & 0xFF) << 16) | ((g & 0xFF) << 8) | (b & 0xFF)
+
+    def create_pen_hsv(self, h, s, v):
+        return self.create_pen(int(v * 255), int(v * 255), int(v * 255))
+
+    def set_pen(self, pen):
+        self.pen = pen
+
+    def get_bounds(self):
+        return WIDTH, HEIGHT
+
+    def set_font(self, font):
+        self.font = font
+
+    def set_clip(self, x, y, w, h):
+        self.clip = (x, y, x + w, y + h)
+
+    def remove_clip(self):
+        self.clip = (0, 0, WIDTH, HEIGHT)
+
+    # --- Dessin ---
+
+    def _put(self, x, y):
+        cx0, cy0, cx1, cy1 = self.clip
+        if cx0 <= x < cx1 and cy0 <= y < cy1:
+            i = (y * WIDTH + x) * BYTES_PER_PIXEL
+            pen = self.pen
+            self[i] = pen & 0xFF
+            self[i + 1] = (pen >> 8) & 0xFF
+            self[i + 2] = (pen >> 16) & 0xFF
+            self[i + 3] = 0
+            return 1
+        return 0
+
+    def _cost(self, pixels):
+        sim = hostsim.sim
+        if sim.pixel_cost and pixels:
+            sim.clock.sleep(sim.pixel_cost * pixels)
+
+    def pixel(self, x, y):
+        hostsim.sim.stats.pixel_writes += 1
+        self._put(int(x), int(y))
+        self._cost(1)
+
+    def clear(self):
+        n = 0
+        for y in range(HEIGHT):
+            for x in range(WIDTH):
+                n += self._put(x, y)
+        hostsim.sim.stats.pixels_filled += n
+        self._cost(n)
+
+    def rectangle(self, x, y, w, h):
+        n = 0
+        for py in range(int(y), int(y + h)):
+            for px in range(int(x), int(x + w)):
+                n += self._put(px, py)
+        hostsim.sim.stats.pixels_filled += n
+        self._cost(n)
+
+    def pixel_span(self, x, y, length):
+        self.rectangle(x, y, length, 1)
+
+    def line(self, x1, y1, x2, y2, thickness=1):
+        n = 0
+        steps = max(abs(x2 - x1), abs(y2 - y1), 1)
+        for i in range(steps + 1):
+            n += self._put(round(x1 + (x2 - x1) * i / steps), round(y1 + (y2 - y1) * i / steps))
+        hostsim.sim.stats.pixels_filled += n
+        self._cost(n)
+
+    def measure_text(self, text, scale=1, spacing=1, fixed_width=False):
+        width = 0
+        for c in text:
+            width += ((_SPACE_WIDTH if c == ' ' else _CHAR_WIDTH) + spacing) * scale
+        return width
+
+    def text(self, text, x, y, wordwrap=-1, scale=1, angle=0, spacing=1, fixed_width=False):
+        n = 0
+        x = int(x)
+        y = int(y)
+        scale = max(1, int(scale))
+        for c in str(text):
+            if c == ' ':
+                x += (_SPACE_WIDTH + spacing) * scale
+                continue
+            bits = _FONT.get(c.upper(), _UNKNOWN)
+            for row in range(5):
+                for col in range(_CHAR_WIDTH):
+                    if bits[row * _CHAR_WIDTH + col] == '1':
+                        for sy in range(scale):
+                            for sx in range(scale):
+                                n += self._put(x + col * scale + sx, y + row * scale + sy)
+            x += (_CHAR_WIDTH + spacing) * scale
+        hostsim.sim.stats.pixels_filled += n
+        self._cost(n)
+
+    def get_pixel(self, x, y):
+        """Outil de test : couleur (r, g, b) d'un pixel du framebuffer."""
+        i = (y * WIDTH + x) * BYTES_PER_PIXEL
+        return self[i + 2], self[i + 1], self[i]
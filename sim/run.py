@@ -0,0 +1,155 @@
+# Lance src/main.py sur PC avec le matériel simulé et affiche les compteurs mesurés.
+#
+# Exemple : python sim/run.py --seconds 120 --press 40:C --press 41:C --press 42:C --quiet
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import runpy
+import shutil
+import sys
+import tempfile
+
+import hostsim
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+BUTTONS = {
+    "A": 0, "B": 1, "C": 3, "D": 6, "SLEEP": 27,
+    "VOLUME_UP": 7, "VOLUME_DOWN": 8, "BRIGHTNESS_UP": 21, "BRIGHTNESS_DOWN": 26,
+}
+
+
+def parse_interval(text):
+    start, end = text.split(":")
+    return float(start), float(end)
+
+
+def parse_press(text):
+    """Format : SECONDES:BOUTON[:DURÉE], par exemple 40:C ou 12.5:B:0.3."""
+    parts = text.split(":")
+    duration = float(parts[2]) if len(parts) > 2 else 0.1
+    return float(parts[0]), BUTTONS[parts[1].upper()], duration
+
+
+def ascii_frame(framebuffer):
+    """Représentation texte du framebuffer (un caractère par LED)."""
+    lines = []
+    for y in range(32):
+        row = []
+        for x in range(32):
+            i = (y * 32 + x) * 4
+            b, g, r = framebuffer[i], framebuffer[i + 1], framebuffer[i + 2]
+            if not (r or g or b):
+                row.append(".")
+            elif r > 200 and g > 200 and b > 200:
+                row.append("W")
+            elif r >= g and r >= b:
+                row.append("Y" if g > 150 else "R")
+            elif g >= b:
+                row.append("G")
+            else:
+                row.append("B")
+        lines.append("".join(row))
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Exécute main.py avec le matériel Cosmic Unicorn simulé.")
+    parser.add_argument("--main", default=os.path.join(SRC, "main.py"), help="Script à exécuter.")
+    parser.add_argument("--env", default=os.path.join(SRC, "information.env"), help="Fichier information.env.")
+    parser.add_argument("--seconds", type=float, default=120, help="Durée virtuelle de la simulation.")
+    parser.add_argument("--agencies", type=int, default=8, help="Nombre d'agences de la fausse API.")
+    parser.add_argument("--latency", type=float, default=0.25, help="Latence d'une requête HTTP (s).")
+    parser.add_argument("--handshake", type=float, default=0.6, help="Coût d'un handshake TLS (s).")
+    parser.add_argument("--no-iot-wait-times", action="store_true",
+                        help="La liste /agences/iot ne contient pas realMaxWaitingTimeMs.")
+    parser.add_argument("--outage", action="append", default=[], type=parse_interval,
+                        help="Panne de l'API, format DEBUT:FIN en secondes (répétable).")
+    parser.add_argument("--wifi-drop", action="append", default=[], type=parse_interval,
+                        help="Coupure WiFi, format DEBUT:FIN en secondes (répétable).")
+    parser.add_argument("--ntp-fail", action="append", default=[], help="Serveur NTP injoignable (répétable).")
+    parser.add_argument("--drift-ppm", type=float, default=0.0,
+                        help="Dérive de l'oscillateur du Pico (ticks et RTC) en ppm, mesurée par NTP.")
+    parser.add_argument("--press", action="append", default=[], type=parse_press,
+                        help="Appui bouton, format SECONDES:BOUTON[:DURÉE] (répétable).")
+    parser.add_argument("--update-cost-ms", type=float, default=0.5, help="Coût virtuel d'un flush (ms).")
+    parser.add_argument("--pixel-cost-us", type=float, default=10, help="Coût virtuel d'un pixel (µs).")
+    parser.add_argument("--seed", type=int, default=1, help="Graine de la fausse API.")
+    parser.add_argument("--flash", help="Répertoire servant de flash, conservé entre deux exécutions "
+                                        "(par défaut un répertoire temporaire effacé à la fin).")
+    parser.add_argument("--quiet", action="store_true", help="Masque les messages du programme.")
+    parser.add_argument("--ascii", action="store_true", help="Affiche le dernier framebuffer.")
+    parser.add_argument("--json", action="store_true", help="Affiche les compteurs au format JSON.")
+    return parser
+
+
+def run(args):
+    simulation = hostsim.Simulation(
+        duration=args.seconds, agencies=args.agencies, latency=args.latency,
+        handshake=args.handshake, seed=args.seed, iot_wait_times=not args.no_iot_wait_times,
+        outages=args.outage, update_cost=args.update_cost_ms / 1000,
+        pixel_cost=args.pixel_cost_us / 1000000, wifi_drops=args.wifi_drop, ntp_fail=args.ntp_fail,
+        drift_ppm=args.drift_ppm)
+    for at, switch, duration in args.press:
+        simulation.buttons.press(at, switch, duration)
+    hostsim.install(simulation)
+    random.seed(args.seed)  # Gigue des réessais reproductible d'une exécution à l'autre.
+
+    # Le programme lit et écrit ses fichiers dans le répertoire courant (la « flash »).
+    if args.flash:
+        workdir = os.path.abspath(args.flash)
+        os.makedirs(workdir, exist_ok=True)
+    else:
+        workdir = tempfile.mkdtemp(prefix="cosmic-sim-")
+    if os.path.exists(args.env):
+        shutil.copy(args.env, os.path.join(workdir, "information.env"))
+    previous = os.getcwd()
+    os.chdir(workdir)
+    output = io.StringIO()
+    outcome = "fin de la durée simulée"
+    try:
+        with contextlib.redirect_stdout(output) if args.quiet else contextlib.nullcontext():
+            runpy.run_path(args.main, run_name="__main__")
+        outcome = "fin du programme"
+    except hostsim.SimulationEnd:
+        pass
+    except hostsim.SimulationReset:
+        outcome = "machine.reset()"
+    finally:
+        os.chdir(previous)
+        if not args.flash:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return simulation, outcome
+
+
+def report(simulation, outcome, args):
+    stats = simulation.stats.as_dict()
+    elapsed = simulation.clock.now
+    stats["virtual_seconds"] = round(elapsed, 3)
+    stats["outcome"] = outcome
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+    else:
+        print(f"Simulation : {elapsed:.1f} s virtuelles ({outcome})")
+        for key, value in stats.items():
+            if key not in ("virtual_seconds", "outcome", "http_by_path"):
+                rate = f"  ({value / elapsed:.1f}/s)" if elapsed and isinstance(value, int) else ""
+                print(f"  {key:<16} {value}{rate}")
+        for path, count in sorted(simulation.stats.http_by_path.items()):
+            print(f"    {count:>5}  GET {path}")
+    if args.ascii and simulation.framebuffer:
+        print(ascii_frame(simulation.framebuffer))
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    simulation, outcome = run(args)
+    report(simulation, outcome, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# Simulation du module `uasyncio` : ordonnanceur coopératif sur l'horloge virtuelle.
+#
+# Seul le sous-ensemble utilisé par main.py est fourni : run, create_task, sleep, sleep_ms,
+# Task.cancel, Event, ThreadSafeFlag et CancelledError. Les tâches prêtes au même instant s'exécutent dans
+# l'ordre où elles ont été planifiées, comme dans uasyncio.
+import hostsim
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class _Sleep:
+    """Objet attendu par `await sleep(...)` : rend la main à l'ordonnanceur pour `seconds`."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __await__(self):
+        yield self
+
+
+class Task:
+    def __init__(self, coro):
+        self.coro = coro
+        self.done = False
+        self.cancelled = False
+        self.waiters = []  # Tâches qui attendent la fin de celle-ci.
+        self.result = None
+
+    def cancel(self):
+        if self.done:
+            return False
+        self.cancelled = True
+        _loop.wake(self)
+        return True
+
+    def __await__(self):
+        if not self.done:
+            self.waiters.append(_loop.current)
+            yield _WAIT
+        return self.result
+
+
+TASK_STEP_ALLOC = 32  # Octets temporaires laissés par une reprise de tâche (objet d'attente, arguments).
+
+_WAIT = object()  # La tâche courante reste suspendue jusqu'à ce qu'on la réveille.
+
+
+class Event:
+    def __init__(self):
+        self.state = False
+        self.waiting = []
+
+    def is_set(self):
+        return self.state
+
+    def set(self):
+        self.state = True
+        for task in self.waiting:
+            _loop.wake(task)
+        self.waiting = []
+
+    def clear(self):
+        self.state = False
+
+    async def wait(self):
+        if not self.state:
+            self.waiting.append(_loop.current)
+            await _Suspend()
+        return True
+
+
+class ThreadSafeFlag:
+    """Drapeau levé depuis une interruption, attendu par une seule tâche."""
+
+    def __init__(self):
+        self.state = False
+        self.waiting = None
+
+    def set(self):
+        if self.waiting is not None:
+            task, self.waiting = self.waiting, None
+            _loop.wake(task)
+        else:
+            self.state = True
+
+    def clear(self):
+        self.state = False
+
+    async def wait(self):
+        if self.state:
+            self.state = False
+            return
+        self.waiting = _loop.current
+        await _Suspend()
+
+
+class _Suspend:
+    def __await__(self):
+        yield _WAIT
+
+
+class _Loop:
+    def __init__(self):
+        self.queue = []  # [échéance, numéro, tâche]
+        self.seq = 0
+        self.current = None
+
+    def schedule(self, task, delay=0.0):
+        self.seq += 1
+        self.queue.append([hostsim.sim.clock.now + delay, self.seq, task])
+
+    def wake(self, task):
+        for entry in self.queue:
+            if entry[2] is task:
+                self.queue.remove(entry)
+                break
+        self.schedule(task)
+
+    def run_until(self, main):
+        clock = hostsim.sim.clock
+        while not main.done:
+            if not self.queue:
+                raise RuntimeError("uasyncio : plus aucune tâche à exécuter")
+            self.queue.sort(key=lambda entry: (entry[0], entry[1]))
+            wake_at = self.queue[0][0]
+            if wake_at > clock.now:
+                # Un front de bouton avant l'échéance peut réveiller une tâche plus tôt.
+                edge = hostsim.sim.buttons.next_edge(clock.now)
+                if edge is not None and edge < wake_at:
+                    clock.sleep(edge - clock.now)
+                    continue
+                clock.sleep(wake_at - clock.now)
+            wake_at, _, task = self.queue.pop(0)
+            if task.done:
+                continue
+            self.current = task
+            hostsim.sim.heap.allocate(TASK_STEP_ALLOC)
+            try:
+                if task.cancelled:
+                    task.cancelled = False
+                    request = task.coro.throw(CancelledError())
+                else:
+                    request = task.coro.send(None)
+            except (StopIteration, CancelledError) as e:
+                task.done = True
+                task.result = getattr(e, "value", None)
+                for waiter in task.waiters:
+                    self.wake(waiter)
+                continue
+            except Exception as e:
+                task.done = True
+                print(f"[sim] Exception non gérée dans une tâche : {e!r}")
+                if task is main:
+                    raise
+                continue
+            finally:
+                self.current = None
+            if isinstance(request, _Sleep):
+                self.schedule(task, request.seconds)
+            elif request is _WAIT:
+                pass  # Réveillée par Event.set() ou la fin d'une tâche attendue.
+            else:
+                self.schedule(task)  # `yield` nu : repasse en fin de file.
+
+
+_loop = _Loop()
+
+
+def create_task(coro):
+    task = Task(coro)
+    _loop.schedule(task)
+    return task
+
+
+def sleep(seconds):
+    return _Sleep(max(0, seconds))
+
+
+def sleep_ms(ms):
+    return _Sleep(max(0, ms) / 1000)
+
+
+def run(coro):
+    global _loop
+    _loop = _Loop()
+    main = create_task(coro)
+    _loop.run_until(main)
+    return main.result
@@ -0,0 +1,48 @@
+# Simulation du module `urequests` : les requêtes sont servies par la fausse API OPT.
+import json as _json
+
+import hostsim
+
+
+class Response:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+    def json(self):
+        return _json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+def request(method, url, data=None, json=None, headers=None, timeout=None, stream=None):
+    sim = hostsim.sim
+    if not url.startswith("https://api.opt.nc"):
+        raise OSError(-2)  # Hôte inconnu pour le simulateur.
+    if not sim.wifi_up():
+        sim.clock.sleep(timeout or 1)
+        raise OSError(110)  # ETIMEDOUT
+    path = url[len("https://api.opt.nc"):]
+    sim.stats.tls_handshakes += 1  # urequests ouvre une nouvelle connexion TLS à chaque appel.
+    cost = sim.api.handshake + sim.api.latency
+    if timeout is not None and cost > timeout:
+        sim.clock.sleep(timeout)
+        raise OSError(110)  # ETIMEDOUT
+    sim.clock.sleep(cost)
+    status, response_headers, body = sim.api.handle(method, path, headers or {})
+    return Response(status, response_headers, body)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
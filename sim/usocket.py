@@ -0,0 +1,100 @@
+# Simulation du module `usocket` : connexions TCP vers la fausse API (HTTP) et le serveur NTP (UDP).
+import hostsim
+
+AF_INET = 2
+SOCK_STREAM = 1
+SOCK_DGRAM = 2
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+SOL_SOCKET = 1
+SO_REUSEADDR = 4
+
+API_ADDRESS = ("203.0.113.10", 443)  # Adresse fictive de api.opt.nc.
+NTP_PORT = 123
+NTP_DELTA = 2208988800  # Secondes entre 1900 (origine NTP) et 1970.
+
+_hosts = {}  # Adresse fictive -> nom d'hôte résolu (pour reconnaître les serveurs NTP en échec).
+
+
+def getaddrinfo(host, port, family=0, socktype=0, proto=0, flags=0):
+    sim = hostsim.sim
+    sim.stats.dns_lookups += 1
+    if not sim.wifi_up():
+        sim.clock.sleep(1)
+        raise OSError(-2)  # Résolution impossible sans lien WiFi.
+    sim.clock.sleep(0.05)
+    address = API_ADDRESS if host == "api.opt.nc" else ("198.51.100.%d" % (sum(host.encode()) % 250 + 1), port)
+    _hosts[address[0]] = host
+    return [(AF_INET, socktype or SOCK_STREAM, proto, "", (address[0], port))]
+
+
+def _ntp_reply(host, sent):
+    """Réponse SNTP d'un serveur : (instant virtuel d'arrivée, paquet de 48 octets)."""
+    sim = hostsim.sim
+    rtt = 0.02 + (sum(host.encode()) % 7) * 0.01  # Aller-retour propre à chaque serveur (20 à 80 ms).
+    served = sim.real_epoch + sent + rtt / 2 + NTP_DELTA  # Heure réelle du serveur à mi-parcours.
+    seconds = int(served)
+    fraction = int((served - seconds) * (1 << 32))
+    timestamp = seconds.to_bytes(4, "big") + fraction.to_bytes(4, "big")
+    packet = bytes([0x24, 2]) + bytes(30) + timestamp + timestamp  # Version 4, mode serveur, strate 2.
+    return sent + rtt, packet
+
+
+class socket:
+    """Socket simulé : TCP vers api.opt.nc:443 uniquement, UDP vers les serveurs NTP."""
+
+    def __init__(self, family=AF_INET, type=SOCK_STREAM, proto=0):
+        self.type = type
+        self.timeout = None
+        self.connected = False
+        self.closed = False
+        self.replies = []  # Datagrammes en route : [instant d'arrivée, paquet, adresse].
+
+    def settimeout(self, value):
+        self.timeout = value
+
+    def setblocking(self, flag):
+        self.timeout = None if flag else 0
+
+    def setsockopt(self, level, option, value):
+        pass
+
+    def connect(self, address):
+        sim = hostsim.sim
+        if not sim.wifi_up():
+            sim.clock.sleep(self.timeout or 1)
+            raise OSError(110)  # ETIMEDOUT
+        if tuple(address) != API_ADDRESS:
+            raise OSError(113)  # EHOSTUNREACH
+        sim.clock.sleep(sim.api.latency / 2)  # Établissement TCP : un aller-retour.
+        self.connected = True
+
+    def sendto(self, data, address):
+        """Requête NTP : la réponse arrive après l'aller-retour, sauf serveur en échec ou WiFi coupé."""
+        sim = hostsim.sim
+        sim.stats.ntp_calls += 1
+        host = _hosts.get(address[0], address[0])
+        if address[1] != NTP_PORT or host in sim.ntp_fail or not sim.wifi_up():
+            return len(data)  # Datagramme perdu.
+        arrival, packet = _ntp_reply(host, sim.clock.now)
+        self.replies.append([arrival, packet, tuple(address)])
+        return len(data)
+
+    def recvfrom(self, size):
+        sim = hostsim.sim
+        if not self.replies or self.replies[0][0] > sim.clock.now:
+            if self.timeout == 0:
+                raise OSError(11)  # EAGAIN : rien à lire sur un socket non bloquant.
+            wait = self.replies[0][0] - sim.clock.now if self.replies else None
+            if wait is None or (self.timeout is not None and wait > self.timeout):
+                sim.clock.sleep(self.timeout if self.timeout is not None else 1)
+                raise OSError(110)  # ETIMEDOUT
+            sim.clock.sleep(wait)
+        _, packet, address = self.replies.pop(0)
+        return packet[:size], address
+
+    def recv(self, size):
+        return self.recvfrom(size)[0]
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,100 @@
+# Simulation du module `ussl` : flux TLS vers la fausse API, servi en HTTP/1.1 avec keep-alive.
+import hostsim
+
+SERVER_IDLE_TIMEOUT = 30  # Le serveur ferme une connexion inactive au-delà de ce délai (secondes).
+CHUNK = 700  # Taille des blocs des réponses envoyées en Transfer-Encoding: chunked.
+
+
+class TlsStream:
+    def __init__(self, sock):
+        self.sock = sock
+        self.incoming = b""  # Requête en cours de réception.
+        self.outgoing = b""  # Réponses en attente de lecture.
+        self.closed = False
+        self.last_activity = hostsim.sim.clock.now
+
+    def _server_closed(self):
+        sim = hostsim.sim
+        return self.closed or sim.clock.now - self.last_activity > SERVER_IDLE_TIMEOUT
+
+    def write(self, data):
+        sim = hostsim.sim
+        if self.closed:
+            raise OSError(9)  # EBADF
+        if self._server_closed():
+            self.closed = True  # L'écriture passe, la lecture verra la fin de flux.
+            return len(data)
+        sim.heap.allocate(len(data))  # Requête construite par le programme avant l'envoi.
+        self.incoming += bytes(data)
+        while b"\r\n\r\n" in self.incoming:
+            head, _, self.incoming = self.incoming.partition(b"\r\n\r\n")
+            self._serve(head)
+        return len(data)
+
+    def _serve(self, head):
+        sim = hostsim.sim
+        lines = head.decode().split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip()] = value.strip()
+        if not sim.wifi_up():
+            timeout = self.sock.timeout or 5
+            sim.clock.sleep(timeout)
+            raise OSError(110)  # ETIMEDOUT
+        if sim.api.latency > (self.sock.timeout or 1e9):
+            sim.clock.sleep(self.sock.timeout)
+            raise OSError(110)  # ETIMEDOUT
+        sim.clock.sleep(sim.api.latency)
+        status, response_headers, body = sim.api.handle(method, path, headers)
+        response_headers = dict(response_headers)
+        if response_headers.get("Transfer-Encoding") == "chunked":
+            body = b"".join(b"%x\r\n%s\r\n" % (len(body[i:i + CHUNK]), body[i:i + CHUNK])
+                            for i in range(0, len(body), CHUNK)) + b"0\r\n\r\n"
+        else:
+            response_headers["Content-Length"] = str(len(body))
+        response_headers.setdefault("Connection", "keep-alive")
+        head = "HTTP/1.1 %d %s\r\n" % (status, "OK" if status == 200 else "Error")
+        head += "".join("%s: %s\r\n" % item for item in response_headers.items())
+        self.outgoing += head.encode() + b"\r\n" + body
+        self.last_activity = sim.clock.now
+
+    def _take(self, size):
+        if size is None or size < 0:
+            data, self.outgoing = self.outgoing, b""
+        else:
+            data, self.outgoing = self.outgoing[:size], self.outgoing[size:]
+        return data
+
+    def read(self, size=-1):
+        data = self._take(size)
+        hostsim.sim.heap.allocate(len(data))  # Nouvel objet bytes à chaque lecture.
+        return data
+
+    def readinto(self, buffer, size=None):
+        data = self._take(len(buffer) if size is None else size)  # Tampon fourni : aucune allocation.
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        index = self.outgoing.find(b"\n")
+        if index < 0:
+            return self.read()
+        return self.read(index + 1)
+
+    def setblocking(self, flag):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def wrap_socket(sock, server_side=False, key=None, cert=None, cert_reqs=0, cadata=None,
+                server_hostname=None, do_handshake=True):
+    sim = hostsim.sim
+    if not getattr(sock, "connected", False):
+        raise OSError(107)  # ENOTCONN
+    sim.stats.tls_handshakes += 1
+    sim.clock.sleep(sim.api.handshake)
+    return TlsStream(sock)
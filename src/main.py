@@ -1,18 +1,29 @@
 # Imports nécessaires pour les fonctionnalités utilisées dans le script.
 import time  # Gestion du temps et des délais.
 import network  # Module pour gérer la connexion réseau (Wi-Fi).
-import ntptime  # Synchronisation du temps via NTP (Network Time Protocol).
-import urequests as requests  # Pour effectuer des requêtes HTTP (comme des appels API).
+import json  # Décodage des réponses de l'API.
 import os  # Gestion des fichiers et des chemins.
+import struct  # Format binaire de l'instantané des agences enregistré sur la flash.
 import gc  # Gestion de la mémoire (garbage collector).
 import _thread  # Gestion des threads (exécution parallèle).
 import machine  # Pour interagir avec le matériel (comme les boutons, les LEDs).
+import random  # Gigue des délais de réessai de l'API.
+from array import array  # Tableaux compacts pour les bitmaps des glyphes.
+try:
+    import uasyncio as asyncio  # Runtime coopératif : rendu, boutons, agences, WiFi et horloge.
+except ImportError:
+    import asyncio
+try:
+    import usocket as socket  # Sockets pour la connexion HTTPS persistante.
+except ImportError:
+    import socket
+try:
+    import ussl as ssl  # Chiffrement TLS de la connexion à l'API.
+except ImportError:
+    import ssl
 from cosmic import CosmicUnicorn  # Import du module CosmicUnicorn pour gérer l'affichage sur l'appareil.
 from picographics import PicoGraphics, DISPLAY_COSMIC_UNICORN  # Gestion des graphiques pour l'affichage.
 
-# Initialiser attempts pour le suivi des tentatives de connexion WiFi
-attempts = 0
-
 # Constantes pour définir les couleurs utilisées dans l'affichage, définies en RGB.
 COLORS = {
     'YELLOW': (251, 189, 8),
@@ -27,6 +38,270 @@ COLORS = {
     'RED_SMILEY': (237, 28, 36)
 }
 
+# Phases suivies par le moniteur mémoire
+MEMORY_BOOT = 0  # Démarrage, jusqu'à l'affichage du premier écran.
+MEMORY_FETCH = 1  # Après chaque requête HTTP (second cœur).
+MEMORY_RENDER = 2  # Rendu de l'écran agences (une mesure par seconde).
+MEMORY_SCREEN = 3  # Changement d'écran.
+MEMORY_PHASES = ("démarrage", "requête", "rendu", "écran")
+MEMORY_LOW_KB = 20  # En dessous de cette mémoire libre (Ko), l'écran d'information l'affiche en rouge.
+
+
+# Moniteur mémoire : mémorise pour chaque phase le minimum de gc.mem_free() et le maximum de
+# gc.mem_alloc() observés. Après le démarrage, les collectes sont déclenchées par gc.threshold()
+# au lieu d'appels systématiques à gc.collect() après chaque requête.
+class MemoryMonitor:
+    def __init__(self):
+        count = len(MEMORY_PHASES)
+        self.low_free = array('i', [-1] * count)  # Minimum de mémoire libre par phase (-1 = aucune mesure).
+        self.high_alloc = array('i', [0] * count)  # Maximum de mémoire allouée par phase.
+        self.samples = array('I', [0] * count)
+        self.heap = 0  # Taille du tas (libre + alloué), connue après configure().
+
+    def sample(self, phase):
+        """Mesure la mémoire et met à jour les niveaux extrêmes de la phase. Retourne la mémoire libre."""
+        free = gc.mem_free()
+        allocated = gc.mem_alloc()
+        if self.low_free[phase] < 0 or free < self.low_free[phase]:
+            self.low_free[phase] = free
+        if allocated > self.high_alloc[phase]:
+            self.high_alloc[phase] = allocated
+        self.samples[phase] += 1
+        return free
+
+    def configure(self):
+        """Fin du démarrage : une collecte, puis collecte automatique tous les quarts de mémoire libre alloués."""
+        gc.collect()
+        free = gc.mem_free()
+        self.heap = free + gc.mem_alloc()
+        gc.threshold(free // 4)  # Octets alloués depuis la dernière collecte qui en déclenchent une nouvelle.
+        print(f"Mémoire : {free // 1024} Ko libres sur {self.heap // 1024} Ko, collecte automatique activée")
+
+    def lowest(self):
+        """Retourne le minimum de mémoire libre toutes phases confondues (octets)."""
+        measured = [value for value in self.low_free if value >= 0]
+        return min(measured) if measured else gc.mem_free()
+
+    def summary(self):
+        """Résumé des niveaux par phase : minimum libre / maximum alloué en Ko."""
+        parts = []
+        for phase in range(len(MEMORY_PHASES)):
+            if self.samples[phase]:
+                parts.append(f"{MEMORY_PHASES[phase]} {self.low_free[phase] // 1024}/{self.high_alloc[phase] // 1024}")
+        return f"{gc.mem_free() // 1024} Ko libres ; min libre/max alloué (Ko) : " + ", ".join(parts)
+
+
+memory = MemoryMonitor()  # Partagé par les deux cœurs (chaque phase n'est mesurée que par un cœur).
+
+# Phases du démarrage (les phases WiFi, NTP et liste tournent sur le second cœur, dans cet ordre)
+BOOT_DISPLAY = 0  # Initialisation de l'affichage et écran WAIT.
+BOOT_CONFIG = 1  # Lecture de information.env et encodage du code QR.
+BOOT_WIFI = 2  # Connexion WiFi.
+BOOT_NTP = 3  # Première synchronisation de l'heure.
+BOOT_LIST = 4  # Liste des agences (et première agence si la liste n'a pas les temps d'attente).
+BOOT_PHASES = ("affichage", "config", "wifi", "ntp", "liste")
+
+
+# Profil du démarrage : début et fin de chaque phase en millisecondes depuis l'import du script.
+# Les phases peuvent se chevaucher ; le total est l'instant où le premier écran est lancé.
+class BootProfile:
+    def __init__(self):
+        count = len(BOOT_PHASES)
+        self.origin = time.ticks_ms()
+        self.started = array('i', [-1] * count)  # Début de chaque phase (-1 = pas encore commencée).
+        self.finished = array('i', [-1] * count)  # Fin de chaque phase (-1 = en cours).
+        self.total = -1  # Durée totale du démarrage (ms), connue après finish().
+
+    def elapsed(self):
+        return time.ticks_diff(time.ticks_ms(), self.origin)
+
+    def begin(self, phase):
+        """Marque le début d'une phase (seul le premier passage compte)."""
+        if self.started[phase] < 0:
+            self.started[phase] = self.elapsed()
+
+    def done(self, phase):
+        """Marque la fin d'une phase (seul le premier passage compte)."""
+        if self.started[phase] >= 0 and self.finished[phase] < 0:
+            self.finished[phase] = self.elapsed()
+
+    def finish(self):
+        """Fin du démarrage : le premier écran est lancé."""
+        self.total = self.elapsed()
+
+    def summary(self):
+        """Durée de chaque phase avec son intervalle [début-fin] en ms."""
+        parts = []
+        for phase in range(len(BOOT_PHASES)):
+            start = self.started[phase]
+            if start < 0:
+                continue
+            end = self.finished[phase]
+            if end < 0:
+                parts.append(f"{BOOT_PHASES[phase]} en cours [{start}-]")
+            else:
+                parts.append(f"{BOOT_PHASES[phase]} {end - start} [{start}-{end}]")
+        return f"Démarrage en {self.total} ms : " + ", ".join(parts)
+
+
+boot = BootProfile()  # Renseigné par les deux cœurs (chaque phase n'est mesurée que par un cœur).
+
+# Durées des bips (millisecondes)
+BIP_DURATION_MS = 300  # Durée d'un bip.
+BIP_GAP_MS = 300  # Silence après chaque bip (sépare les bips d'une même série).
+
+
+# Séquenceur de bips non bloquant : les tonalités sont mises en file puis démarrées et
+# relâchées par tick() depuis les boucles d'affichage, sans jamais appeler sleep().
+class ToneSequencer:
+    def __init__(self, cu, channel):
+        self.cu = cu
+        self.channel = channel  # Canal du synthétiseur utilisé pour les bips.
+        self.queue = []  # Bips en attente : (fréquence, durée ms, silence ms).
+        self.state = 0  # 0 : inactif, 1 : tonalité en cours, 2 : silence après une tonalité.
+        self.deadline = 0  # Instant (ticks) de fin de la tonalité ou du silence en cours.
+        self.gap = 0  # Silence à respecter après la tonalité en cours.
+
+    def play(self, frequency, count=1, duration=BIP_DURATION_MS, gap=BIP_GAP_MS):
+        """Ajoute count bips à la file ; le premier démarre immédiatement si rien ne joue."""
+        for _ in range(count):
+            self.queue.append((frequency, duration, gap))
+        self.tick()
+
+    def tick(self):
+        """Fait avancer la séquence : à appeler régulièrement, ne bloque jamais."""
+        now = time.ticks_ms()
+        if self.state and time.ticks_diff(now, self.deadline) < 0:
+            return  # Tonalité ou silence en cours.
+        if self.state == 1:
+            self.channel.trigger_release()  # Fin de la tonalité.
+            self.state = 2
+            self.deadline = time.ticks_add(now, self.gap)
+            return
+        self.state = 0
+        if self.queue:
+            frequency, duration, self.gap = self.queue.pop(0)
+            self.channel.play_tone(frequency, 0.3)  # Fréquence du bip, volume 0.3.
+            self.cu.play_synth()
+            self.state = 1
+            self.deadline = time.ticks_add(now, duration)
+
+    def stop(self):
+        """Vide la file et coupe la tonalité en cours."""
+        self.queue = []
+        if self.state == 1:
+            self.channel.trigger_release()
+        self.state = 0
+
+    def busy(self):
+        """Retourne True tant qu'un bip joue ou attend dans la file."""
+        return self.state != 0 or bool(self.queue)
+
+
+# Boutons de la carte (numéros de broches = constantes SWITCH_* de CosmicUnicorn)
+BUTTON_PINS = (
+    CosmicUnicorn.SWITCH_A, CosmicUnicorn.SWITCH_B, CosmicUnicorn.SWITCH_C, CosmicUnicorn.SWITCH_D,
+    CosmicUnicorn.SWITCH_VOLUME_UP, CosmicUnicorn.SWITCH_VOLUME_DOWN,
+    CosmicUnicorn.SWITCH_BRIGHTNESS_UP, CosmicUnicorn.SWITCH_BRIGHTNESS_DOWN,
+)
+BUTTON_DEBOUNCE_MS = 30  # Fronts ignorés pendant ce délai après un front accepté (rebonds).
+BUTTON_QUEUE_SIZE = 16  # Événements en attente au maximum.
+
+
+# Entrée boutons par interruptions : chaque front (après anti-rebond) est daté et rangé dans
+# une file circulaire préallouée. Le gestionnaire d'interruption n'alloue aucun objet.
+class ButtonInput:
+    def __init__(self):
+        count = len(BUTTON_PINS)
+        self.pins = []
+        self.held = bytearray(count)  # État stable de chaque bouton (1 = appuyé).
+        self.last_edge = array('I', [0] * count)  # Instant (ticks) du dernier front accepté.
+        self.unsettled = bytearray(count)  # 1 = front ignoré par l'anti-rebond : niveau à relire à la fin du délai.
+        self.queue_index = bytearray(BUTTON_QUEUE_SIZE)  # File circulaire : index du bouton,
+        self.queue_pressed = bytearray(BUTTON_QUEUE_SIZE)  # appui (1) ou relâchement (0),
+        self.queue_ticks = array('I', [0] * BUTTON_QUEUE_SIZE)  # et instant du front.
+        self.head = 0  # Prochaine case écrite par l'interruption.
+        self.tail = 0  # Prochaine case lue par pop().
+        self.dropped = 0  # Événements perdus (file pleine).
+        self.flag = asyncio.ThreadSafeFlag() if hasattr(asyncio, "ThreadSafeFlag") else None
+        for index in range(count):
+            pin = machine.Pin(BUTTON_PINS[index], machine.Pin.IN, machine.Pin.PULL_UP)
+            pin.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING,
+                    handler=lambda pin, index=index: self.on_edge(index))
+            self.pins.append(pin)
+
+    def on_edge(self, index):
+        """Gestionnaire d'interruption : anti-rebond puis ajout de l'événement à la file."""
+        now = time.ticks_ms()
+        pressed = 1 if self.pins[index].value() == 0 else 0  # Boutons actifs à l'état bas.
+        if pressed == self.held[index]:
+            return
+        if time.ticks_diff(now, self.last_edge[index]) < BUTTON_DEBOUNCE_MS:
+            self.unsettled[index] = 1  # Relâchement rapide ou rebond : settle() relira la broche
+            if self.flag:
+                self.flag.set()
+            return
+        self.accept(index, pressed, now)
+
+    def accept(self, index, pressed, now):
+        """Enregistre un front retenu : nouvel état stable et événement dans la file."""
+        self.held[index] = pressed
+        self.last_edge[index] = now
+        head = (self.head + 1) % BUTTON_QUEUE_SIZE
+        if head == self.tail:
+            self.dropped += 1
+            return
+        self.queue_index[self.head] = index
+        self.queue_pressed[self.head] = pressed
+        self.queue_ticks[self.head] = now
+        self.head = head
+        if self.flag:
+            self.flag.set()
+
+    def settle(self):
+        """Relit les boutons dont un front a été ignoré, une fois le délai d'anti-rebond écoulé, et émet le front manqué."""
+        now = time.ticks_ms()
+        for index in range(len(self.pins)):
+            if self.unsettled[index] and time.ticks_diff(now, self.last_edge[index]) >= BUTTON_DEBOUNCE_MS:
+                self.unsettled[index] = 0
+                pressed = 1 if self.pins[index].value() == 0 else 0
+                if pressed != self.held[index]:
+                    self.accept(index, pressed, now)
+
+    def unsettled_any(self):
+        """Retourne True si un bouton attend d'être relu à la fin de son anti-rebond."""
+        return any(self.unsettled)
+
+    def pop(self):
+        """Retourne le plus ancien événement (bouton, appuyé, instant) ou None si la file est vide."""
+        if self.tail == self.head:
+            return None
+        tail = self.tail
+        self.tail = (tail + 1) % BUTTON_QUEUE_SIZE
+        return BUTTON_PINS[self.queue_index[tail]], self.queue_pressed[tail], self.queue_ticks[tail]
+
+    def pending(self):
+        """Retourne True si un événement attend dans la file (sans le consommer)."""
+        return self.tail != self.head
+
+    def is_held(self, switch):
+        """Retourne True si le bouton est maintenu (état après anti-rebond)."""
+        return self.held[BUTTON_PINS.index(switch)] == 1
+
+    async def wait(self):
+        """Attend le prochain événement (sans scrutation si ThreadSafeFlag est disponible)."""
+        if self.flag:
+            await self.flag.wait()
+        else:
+            await asyncio.sleep_ms(20)
+
+
+# Zone du texte défilant (lignes du bas de l'écran)
+SCROLL_Y = 26  # Première ligne de la zone.
+SCROLL_HEIGHT = 6  # Hauteur de la zone en pixels.
+SCROLL_PADDING = 5  # Espace entre le bord droit et le début du texte au démarrage.
+
+
 # Classe pour gérer l'affichage sur l'écran du Cosmic Unicorn.
 class CosmicUnicornDisplay:
     def __init__(self):
@@ -34,9 +309,20 @@ class CosmicUnicornDisplay:
         self.cu = CosmicUnicorn()  	# Instance de CosmicUnicorn pour gérer l'affichage.
         self.graphics = PicoGraphics(display=DISPLAY_COSMIC_UNICORN)  # Instance pour gérer les graphiques.
         self.width, self.height = self.graphics.get_bounds()  # Récupère les dimensions de l'écran.
+        self.framebuffer = memoryview(self.graphics)  # Accès direct au framebuffer (4 octets par pixel).
         self.pens = {color: self.graphics.create_pen(*rgb) for color, rgb in COLORS.items()}  # Crée des stylos pour les couleurs.
+        self.batch_mode = False  # Mode frame : les dessins marquent la frame sale, un seul flush en fin de frame.
+        self.frame_dirty = False  # Indique si le framebuffer a été modifié depuis le dernier flush.
+        self.frame_flushes = 0  # Nombre de flushes réels vers la matrice pendant la frame en cours.
+        self.frame_pixels = 0  # Nombre de pixels écrits pendant la frame en cours.
+        self.last_frame_stats = (0, 0)  # (flushes, pixels) de la dernière frame terminée.
         self.scroll_shift = 0  # Variable de décalage pour le texte défilant.
-        self.last_scroll_time = time.ticks_ms()  # Enregistre le dernier moment où le texte a défilé.
+        self.scroll_strip = memoryview(bytearray(0))  # Bandeau du nom pré-rendu (SCROLL_HEIGHT lignes).
+        self.scroll_width = self.width  # Largeur du bandeau en pixels.
+        self.blank_row = memoryview(bytearray(self.width * 4))  # Ligne noire pour la fin du bandeau.
+        self.clock_digits = None  # Chiffres HHMM actuellement affichés (None = horloge à redessiner).
+        self.clock_colon = None  # État affiché des deux points de l'horloge.
+        self.age_shown = -1  # Âge des données affiché en minutes (-1 = indicateur masqué).
         self.transition_var = ''  # Variable pour stocker le texte défilant.
         self.graphics.set_font("bitmap5")  # Définit la police utilisée pour l'affichage du texte.
         self.sound_enabled = True  # Indique si le son est activé ou non.
@@ -48,26 +334,121 @@ class CosmicUnicornDisplay:
         self.led_positions_sound_off = [(2, 9), (1, 10), (2, 10), (1, 11), (2, 11), (2, 12)]  # Positions des LEDs rouges quand le son est désactivé.
         self.led_positions_wifi_ko = [(0, 17), (1, 16), (1, 17), (1, 18), (2, 15), (2, 16), (2, 17), (2, 18), (2, 19)]
         self.channel = self.cu.synth_channel(5)  # Canal sonore pour gérer les bips sonores.
+        self.tones = ToneSequencer(self.cu, self.channel)  # Bips joués sans bloquer l'affichage.
+        self.buttons = ButtonInput()  # Appuis reçus par interruptions, consommés depuis la file d'événements.
         self.cu.set_brightness(self.brightness)  # Définit la luminosité initiale de l'écran.
         self.display_mode = 0  # 0: Accueil, 1: Info, 2: Légende, 3: Agences, 4: QR Code
+        self.wifi_status = False  # Dernier état du lien WiFi relevé par le moniteur de connectivité.
+        self.logo_region = None  # Zone pré-rendue du sigle OPT (LOGO_REGION).
+        self.mood_frames = self.render_mood_frames()  # Zones pré-rendues du smiley (MOOD_REGION), une par humeur.
+        self.qr_code = None  # Code QR encodé au démarrage : (taille, lignes en masques de bits).
+        self.welcome_animation = None  # Animation d'accueil, construite au premier affichage.
         self.update_led_sound_status()  # Met à jour les LEDs selon l'état du son.
-        self.previous_wifi_status = False 
         print("Affichage initialisé avec succès")  # Confirmation de l'initialisation réussie.
 
     def clear(self):
         """Efface l'écran sans toucher aux LEDs du son et de pause."""
         self.graphics.set_pen(self.pens['BLACK'])  # Définit la couleur du stylo à noir pour effacer.
         self.graphics.clear()  # Efface l'écran.
+        self.redraw_status()
+
+    def redraw_status(self):
+        """Redessine les LEDs d'état (son, WiFi, pause) après un effacement ou une copie de fond."""
+        self.clock_digits = None  # L'horloge devra être entièrement redessinée.
+        self.clock_colon = None
+        self.age_shown = -1  # L'indicateur d'âge est effacé avec l'écran.
         self.update_led_sound_status()  # Met à jour les LEDs du son.
-        self.update_led_wifi_status(self.check_wifi_status(network.WLAN(network.STA_IF)))  # Maintient l'état des LEDs WiFi
+        self.update_led_wifi_status(self.wifi_status)  # LEDs WiFi redessinées depuis l'état en cache, sans appel réseau
         if self.loop_paused:  # Si la boucle est en pause, affiche la LED de pause.
             self.set_pen('YELLOW')
-            self.graphics.pixel(*self.pause_led_position)
+            self.pixel(*self.pause_led_position)
         self.update()  # Met à jour l'affichage.
 
+    def render_mood_frames(self):
+        """Pré-rend une fois les zones statiques de l'écran agences : le sigle OPT, commun, et pour chaque humeur
+        la zone du smiley et de l'icône de temps.
+
+        Chaque zone est copiée ligne par ligne au format de la matrice (environ 6 Ko au lieu de trois écrans de 4 Ko).
+        Le rendu se fait hors écran (aucun flush) et le framebuffer est effacé ensuite.
+        """
+        batch_mode = self.batch_mode
+        self.batch_mode = True  # Aucun flush pendant le pré-rendu.
+        self.set_pen('BLACK')
+        self.graphics.clear()
+        self.draw_text_opt()
+        self.logo_region = self.capture_region(*LOGO_REGION)  # Sigle OPT, identique pour toutes les humeurs.
+        frames = {}
+        for mood in MOOD_COLORS:
+            self.draw_smiley(mood)  # Efface puis redessine toute la zone de l'humeur.
+            frames[mood] = self.capture_region(*MOOD_REGION)
+        self.set_pen('BLACK')
+        self.graphics.clear()
+        self.batch_mode = batch_mode
+        self.frame_dirty = False
+        return frames
+
+    def capture_region(self, x, y, width, height):
+        """Copie une zone rectangulaire du framebuffer, ligne par ligne."""
+        line = self.width * 4  # Octets par ligne de l'écran.
+        count = width * 4  # Octets par ligne de la zone.
+        region = bytearray(count * height)
+        for dy in range(height):
+            source = (y + dy) * line + x * 4
+            region[dy * count:dy * count + count] = self.framebuffer[source:source + count]
+        return memoryview(region)
+
+    def paste_region(self, region, x, y, width, height):
+        """Recopie dans le framebuffer une zone capturée par capture_region()."""
+        line = self.width * 4
+        count = width * 4
+        framebuffer = self.framebuffer
+        for dy in range(height):
+            target = (y + dy) * line + x * 4
+            framebuffer[target:target + count] = region[dy * count:dy * count + count]
+
+    def draw_mood_screen(self, mood):
+        """Affiche le fond de l'humeur (écran noir, sigle OPT et zone du smiley recopiés) puis les LEDs d'état."""
+        line = self.width * 4
+        framebuffer = self.framebuffer
+        for y in range(self.height):  # Efface l'écran par copies de la ligne noire, sans rasterisation.
+            framebuffer[y * line:y * line + line] = self.blank_row
+        self.paste_region(self.logo_region, *LOGO_REGION)
+        self.paste_region(self.mood_frames[mood], *MOOD_REGION)
+        self.redraw_status()
+
     def update(self):
-        """Met à jour l'affichage."""
+        """Met à jour l'affichage (ou marque la frame comme modifiée en mode frame)."""
+        if self.batch_mode:
+            self.frame_dirty = True  # Le flush sera fait une seule fois par end_frame().
+        else:
+            self.flush()
+
+    def flush(self):
+        """Pousse réellement le framebuffer vers la matrice."""
         self.cu.update(self.graphics)  # Rafraîchit l'écran avec les nouvelles informations graphiques.
+        self.frame_flushes += 1
+        self.frame_dirty = False
+        self.tones.tick()  # Les animations bloquantes font aussi avancer les bips.
+
+    def pixel(self, x, y):
+        """Écrit un pixel avec le stylo courant en le comptabilisant pour la frame."""
+        self.frame_pixels += 1
+        self.graphics.pixel(x, y)
+
+    def begin_frame(self):
+        """Démarre une frame : les appels à update() ne font plus que marquer la frame sale."""
+        self.batch_mode = True
+        self.frame_dirty = False
+        self.frame_flushes = 0
+        self.frame_pixels = 0
+
+    def end_frame(self):
+        """Termine la frame avec un unique flush si nécessaire et retourne (flushes, pixels)."""
+        if self.frame_dirty:
+            self.flush()
+        self.batch_mode = False
+        self.last_frame_stats = (self.frame_flushes, self.frame_pixels)
+        return self.last_frame_stats
 
     def set_pen(self, color):
         """Définit la couleur du stylo graphique."""
@@ -76,49 +457,68 @@ class CosmicUnicornDisplay:
         else:
             print(f"Erreur : La couleur {color} n'est pas définie.")
     
-    def scroll_text(self, message):
-        """Gère le défilement du texte sur l'écran."""
-        PADDING = 5  # Espace entre le texte et les bords de l'écran.
-        STEP_TIME = 0.1  # Intervalle de temps entre chaque étape du défilement.
-        msg_width = self.graphics.measure_text(message, 1)  # Mesure la largeur du texte.
-        time_ms = time.ticks_ms()  # Récupère le temps actuel en millisecondes.
-
-        # Si assez de temps s'est écoulé depuis la dernière étape du défilement.
-        if time_ms - self.last_scroll_time > STEP_TIME * 1000:
-            self.scroll_shift += 1  # Décale le texte vers la gauche.
-            if self.scroll_shift >= msg_width + self.width + PADDING:  # Si le texte est entièrement défilé.
-                self.scroll_shift = -self.width  # Réinitialise le décalage.
-            self.last_scroll_time = time_ms  # Met à jour le dernier temps de défilement.
-
-        # Efface la zone de texte.
-        self.set_pen('BLACK')
-        self.graphics.rectangle(0, 26, self.width, 6)  # Crée une zone de rectangle noire pour le texte.
-        self.set_pen('WHITE')  # Définit le stylo à blanc pour le texte.
-        self.graphics.text(message, PADDING - self.scroll_shift, 26, -1, 1)  # Affiche le texte défilant.
+    def render_scroll_strip(self, message):
+        """Pré-rend le texte défilant dans un bandeau hors écran : écran vide, marge puis texte.
+
+        Le texte est rasterisé une seule fois, par fenêtres de la largeur de l'écran dessinées
+        dans la zone de défilement puis recopiées dans le bandeau.
+        """
+        width = self.width + SCROLL_PADDING + self.graphics.measure_text(message, 1)  # Largeur du bandeau.
+        row = width * 4  # Octets par ligne du bandeau.
+        line = self.width * 4  # Octets par ligne de l'écran.
+        strip = bytearray(row * SCROLL_HEIGHT)
+        framebuffer = self.framebuffer
+        for x in range(0, width, self.width):
+            self.set_pen('BLACK')
+            self.graphics.rectangle(0, SCROLL_Y, self.width, SCROLL_HEIGHT)
+            self.set_pen('WHITE')
+            self.graphics.text(message, self.width + SCROLL_PADDING - x, SCROLL_Y, -1, 1)
+            count = min(self.width, width - x) * 4  # La dernière fenêtre peut être partielle.
+            for y in range(SCROLL_HEIGHT):
+                source = (SCROLL_Y + y) * line
+                strip[y * row + x * 4:y * row + x * 4 + count] = framebuffer[source:source + count]
+        self.scroll_strip = memoryview(strip)
+        self.scroll_width = width
+
+    def scroll_text(self, steps=1):
+        """Gère le défilement du texte sur l'écran (steps = créneaux de frame écoulés, 1 pixel chacun).
+
+        Copie seulement la fenêtre visible du bandeau pré-rendu : coût fixe quelle que soit la longueur du nom.
+        """
+        # Décale le texte d'un pixel par créneau, y compris les frames sautées : vitesse constante.
+        self.scroll_shift += steps
+        if self.scroll_shift >= self.scroll_width:  # Si le texte est entièrement défilé.
+            self.scroll_shift = -self.width  # Réinitialise le décalage.
+
+        line = self.width * 4  # Octets par ligne de l'écran.
+        row = self.scroll_width * 4  # Octets par ligne du bandeau.
+        start = (self.scroll_shift + self.width) * 4  # Début de la fenêtre dans le bandeau.
+        count = max(0, min(line, row - start))  # Octets disponibles dans le bandeau, le reste est noir.
+        framebuffer = self.framebuffer
+        strip = self.scroll_strip
+        for y in range(SCROLL_HEIGHT):
+            target = (SCROLL_Y + y) * line
+            source = y * row + start
+            framebuffer[target:target + count] = strip[source:source + count]
+            if count < line:
+                framebuffer[target + count:target + line] = self.blank_row[count:]
         self.update()  # Met à jour l'écran.
 
     def draw_frame(self, y_start, y_end, color):
         """Dessine un cadre autour du smiley."""
         self.set_pen(color)  # Définit le stylo à la couleur donnée.
         for x in range(0, self.width):  # Dessine les lignes horizontales en haut et en bas.
-            self.graphics.pixel(x, y_start)
-            self.graphics.pixel(x, y_end)
+            self.pixel(x, y_start)
+            self.pixel(x, y_end)
         for y in range(y_start, y_end + 1):  # Dessine les lignes verticales sur les côtés.
-            self.graphics.pixel(0, y)
-            self.graphics.pixel(self.width - 1, y)
+            self.pixel(0, y)
+            self.pixel(self.width - 1, y)
         self.update()  # Met à jour l'affichage.
 
     def draw_text_opt(self):
         """Affiche le texte OPT NC sur la partie gauche de l'écran."""
         self.set_pen('BLUE')  # Définit le stylo à bleu.
-        # Coordonnées des lettres O, P, et T pour former 'OPT'.
-        o_coords = [(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 1), (2, 5), (3, 1), (3, 5), (4, 1), (4, 2), (4, 3), (4, 4), (4, 5)]
-        p_coords = [(6, 1), (6, 2), (6, 3), (6, 4), (6, 5), (7, 1), (7, 3), (8, 1), (8, 2), (8, 3)]
-        t_coords = [(10, 1), (11, 1), (11, 2), (11, 3), (11, 4), (11, 5), (12, 1)]
-        # Dessine chaque lettre en utilisant les coordonnées définies.
-        for coords in [o_coords, p_coords, t_coords]:
-            for x, y in coords:
-                self.graphics.pixel(x, y)
+        self.frame_pixels += blit_glyph(self.graphics, OPT_LOGO, 12, 1, 1)  # Dessine le sigle 'OPT'.
         self.update()  # Met à jour l'affichage.
 
     def draw_smiley(self, mood):
@@ -127,88 +527,36 @@ class CosmicUnicornDisplay:
         self.set_pen('BLACK')
         self.graphics.rectangle(7, 7, 19, 19)  # Efface la zone où le smiley sera dessiné.
 
-        # Coordonnées du smiley, des yeux, de la bouche et de la valeur d'attente en fonction de l'humeur (happy, neutral, sad).
-        smiley_coords = [
-            (13, 8), (14, 8), (15, 8), (16, 8), (17, 8), (18, 8),
-            (11, 9), (12, 9), (13, 9), (18, 9), (19, 9), (20, 9),
-            (10, 10), (11, 10), (20, 10), (21, 10),
-            (9, 11), (10, 11), (21, 11), (22, 11),
-            (8, 12), (9, 12), (22, 12), (23, 12),
-            (8, 13), (23, 13),
-            (7, 14), (8, 14), (23, 14), (24, 14),
-            (7, 15), (24, 15),
-            (7, 16), (24, 16),
-            (7, 17), (24, 17),
-            (7, 18), (24, 18),
-            (7, 19), (8, 19), (23, 19), (24, 19),
-            (8, 20), (23, 20),
-            (8, 21), (9, 21), (22, 21), (23, 21),
-            (9, 22), (10, 22), (21, 22), (22, 22),
-            (10, 23), (11, 23), (20, 23), (21, 23),
-            (11, 24), (12, 24), (13, 24), (18, 24), (19, 24), (20, 24),
-            (13, 25), (14, 25), (15, 25), (16, 25), (17, 25), (18, 25),
-        ]
-        eyes_coords = [
-            (11, 14), (12, 14), (13, 14), (18, 14), (19, 14), (20, 14),
-            (11, 15), (12, 15), (13, 15), (18, 15), (19, 15), (20, 15)
-        ]
-        mouth_coords = {
-            'happy': [(12, 19), (13, 19), (14, 19), (15, 19), (16, 19), (17, 19), (18, 19), (19, 19), (13, 20), (14, 20), (15, 20), (16, 20), (17, 20), (18, 20)],
-            'neutral': [(13, 20), (14, 20), (15, 20), (16, 20), (17, 20), (18, 20)],
-            'sad': [(13, 19), (14, 19), (15, 19), (16, 19), (17, 19), (18, 19), (12, 20), (13, 20), (14, 20), (15, 20), (16, 20), (17, 20), (18, 20), (19, 20)]
-        }
-
-        time_coords = {
-            'happy': [(30, 8), (29, 8), (29, 9), (29, 10), (30, 10), (30, 11), (30, 12), (29, 12), (27, 9), (26, 10), (27, 11)],  # LED pour <5
-            'neutral': [(27, 8), (27, 9), (27, 10), (27, 11), (27, 12), (29, 8), (29, 9), (29, 10), (29, 11), (29, 12), (30, 8), (30, 12), (31, 8), (31, 9), (31, 10), (31, 11), (31, 12), (25, 9), (24, 10), (25, 11)],  # LED pour <10
-            'sad': [(27, 8), (27, 9), (27, 10), (27, 11), (27, 12), (29, 8), (29, 9), (29, 10), (29, 11), (29, 12), (30, 8), (30, 12), (31, 8), (31, 9), (31, 10), (31, 11), (31, 12), (24, 9), (25, 10), (24, 11)],  # LED pour >10
-        }
-
-        mood_color = {
-            'happy': 'GREEN_SMILEY',
-            'neutral': 'YELLOW_SMILEY',
-            'sad': 'RED_SMILEY'
-        }
-
-        # Dessine le smiley.
-        self.set_pen(mood_color[mood])
-        for x, y in smiley_coords:
-            self.graphics.pixel(x, y)
-        for x, y in eyes_coords:
-            self.graphics.pixel(x, y)
-        for x, y in mouth_coords[mood]:
-            self.graphics.pixel(x, y)
-        for x, y in time_coords[mood]:
-            self.graphics.pixel(x, y)
+        # Dessine le smiley, sa bouche et l'icône de temps d'attente à partir des bitmaps précalculés.
+        self.set_pen(MOOD_COLORS[mood])
+        self.frame_pixels += blit_glyph(self.graphics, SMILEY_FACE, 18, 7, 8)
+        self.frame_pixels += blit_glyph(self.graphics, SMILEY_MOUTHS[mood], 8, 12, 19)
+        self.frame_pixels += blit_glyph(self.graphics, TIME_ICONS[mood], 8, 24, 8)
 
         self.update()  # Met à jour l'affichage
-        
-        # Ajouter la logique pour les bips
+
+    def play_mood_bips(self, mood):
+        """Joue les bips associés à l'humeur, une fois la frame affichée."""
         if mood == 'neutral':  # 1 bip si humeur est neutre
             self.play_bip(self.volume)  # Joue un bip avec la fréquence actuelle
         elif mood == 'sad':  # 3 bips si humeur est triste
-            for _ in range(3):
-                self.play_bip(self.volume)  # Joue un bip avec la fréquence actuelle
-                time.sleep(0.3)  # Pause entre les bips
+            self.play_bip(self.volume, 3)  # Bips séparés par BIP_GAP_MS, joués en arrière-plan
 
-    def play_bip(self, frequency):
-        """Joue un bip sonore d'une fréquence donnée si le son est activé."""
+    def play_bip(self, frequency, count=1):
+        """Met en file count bips d'une fréquence donnée si le son est activé (sans bloquer)."""
         try:
             if self.sound_enabled:  # Si le son est activé.
-                self.channel.play_tone(frequency, 0.3)  # Joue une tonalité pendant 0.3 seconde.
-                self.cu.play_synth()  # Joue le son sur le canal synthétique.
-                time.sleep(0.3)  # Attend que le son soit joué.
-                self.channel.trigger_release()  # Arrête le son.
+                self.tones.play(frequency, count)  # Démarré et relâché par tones.tick().
         except Exception as e:
             print(f"Erreur lors de la lecture du bip : {e}")  # Capture toute erreur et l'affiche.
 
     def adjust_brightness(self):
         """Ajuste la luminosité en fonction des boutons de luminosité, avec confirmation de détection."""
-        if self.cu.is_pressed(CosmicUnicorn.SWITCH_BRIGHTNESS_UP):  # Si le bouton pour augmenter la luminosité est pressé
+        if self.buttons.is_held(CosmicUnicorn.SWITCH_BRIGHTNESS_UP):  # Si le bouton pour augmenter la luminosité est pressé
             if self.brightness < 1.0:  # Limite supérieure pour la luminosité
                 self.brightness = min(self.brightness + 0.1, 1.0)  # Augmente la luminosité par paliers
             print(f"Luminosité augmentée à : {self.brightness}")  # Message de débogage
-        elif self.cu.is_pressed(CosmicUnicorn.SWITCH_BRIGHTNESS_DOWN):  # Si le bouton pour diminuer la luminosité est pressé
+        elif self.buttons.is_held(CosmicUnicorn.SWITCH_BRIGHTNESS_DOWN):  # Si le bouton pour diminuer la luminosité est pressé
             if self.brightness > 0.0:  # Limite inférieure pour la luminosité
                 self.brightness = max(self.brightness - 0.1, 0.0)  # Diminue la luminosité par paliers
             print(f"Luminosité diminuée à : {self.brightness}")  # Message de débogage
@@ -216,60 +564,67 @@ class CosmicUnicornDisplay:
 
     def adjust_volume(self):
         """Ajuste le volume en fonction des boutons de volume."""
-        if self.cu.is_pressed(CosmicUnicorn.SWITCH_VOLUME_UP):  # Si le bouton pour augmenter le volume est pressé.
+        if self.buttons.is_held(CosmicUnicorn.SWITCH_VOLUME_UP):  # Si le bouton pour augmenter le volume est pressé.
             if self.volume < 20000:  # Limite supérieure pour la fréquence sonore.
                 self.volume = min(self.volume + 10, 20000)  # Augmente la fréquence (volume).
                 self.channel.frequency(self.volume)  # Applique la nouvelle fréquence au canal sonore.
                 print(f"Augmentation du volume. Fréquence actuelle : {self.volume} Hz")
-        elif self.cu.is_pressed(CosmicUnicorn.SWITCH_VOLUME_DOWN):  # Si le bouton pour diminuer le volume est pressé.
+        elif self.buttons.is_held(CosmicUnicorn.SWITCH_VOLUME_DOWN):  # Si le bouton pour diminuer le volume est pressé.
             if self.volume > 10:  # Limite inférieure pour la fréquence sonore.
                 self.volume = max(self.volume - 10, 10)  # Diminue la fréquence (volume).
                 self.channel.frequency(self.volume)  # Applique la nouvelle fréquence au canal sonore.
                 print(f"Diminution du volume. Fréquence actuelle : {self.volume} Hz")
 
     # Fonction pour afficher l'heure sous forme de chiffres à l'écran.
-    def display_digit(self, digit, col_start, row_start, color):
-        """Affiche un chiffre à une position donnée sur l'écran."""
-        digits = {
-            '0': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 4), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)],
-            '1': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4)],
-            '2': [(0, 0), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (1, 4), (2, 0), (2, 1), (2, 2), (2, 4)],
-            '3': [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (1, 4), (0, 4), (1, 2), (0, 2)],
-            '4': [(0, 0), (0, 1), (0, 2), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)],
-            '5': [(0, 0), (1, 0), (2, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 3), (2, 4), (1, 4), (0, 4)],
-            '6': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 4), (2, 4), (2, 3), (2, 2), (1, 2)],
-            '7': [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (1, 2)],
-            '8': [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2), (0, 3), (2, 3), (0, 4), (1, 4), (2, 4)],
-            '9': [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2), (2, 3), (2, 4), (1, 4), (0, 4)]
-        }
+    def display_digit(self, digit, col_start, row_start, color, erase=False):
+        """Affiche un chiffre à une position donnée sur l'écran (erase : efface d'abord sa cellule 3 x 5)."""
+        if erase:
+            self.set_pen('BLACK')
+            self.graphics.rectangle(col_start, row_start, 3, 5)
+            self.frame_pixels += 15
         self.set_pen(color)  # Définit le stylo à la couleur donnée.
-        for dx, dy in digits[digit]:  # Parcourt les coordonnées du chiffre et les affiche.
-            self.graphics.pixel(col_start + dx, row_start + dy)
+        self.frame_pixels += blit_glyph(self.graphics, DIGIT_MAP[digit], 3, col_start, row_start)
         self.update()  # Met à jour l'affichage.
 
     # Fonction pour afficher l'horloge sur l'écran.
-    def display_clock(self, start_time, synced):
-        """Affiche l'heure actuelle synchronisée ou calculée avec correction de fuseau horaire."""
-        current_time = time.localtime(time.time() + 11 * 3600 if synced else start_time + 11 * 3600)
-        hour = "{:02}".format(current_time[3])  # Récupère l'heure actuelle (HH).
-        minute = "{:02}".format(current_time[4])  # Récupère les minutes actuelles (MM).
-        second = current_time[5]  # Récupère les secondes actuelles (SS).
-        self.display_digit(hour[0], 14, 1, 'YELLOW_SMILEY')  # Affiche le premier chiffre des heures.
-        self.display_digit(hour[1], 18, 1, 'YELLOW_SMILEY')  # Affiche le deuxième chiffre des heures.
-        if second % 2 == 0:  # Si les secondes sont paires, affiche les deux points de séparation.
-            self.graphics.pixel(22, 2)
-            self.graphics.pixel(22, 4)
-        else:  # Sinon, les efface.
-            self.set_pen('BLACK')
-            self.graphics.pixel(22, 2)
-            self.graphics.pixel(22, 4)
-        self.display_digit(minute[0], 24, 1, 'YELLOW_SMILEY')  # Affiche le premier chiffre des minutes.
-        self.display_digit(minute[1], 28, 1, 'YELLOW_SMILEY')  # Affiche le deuxième chiffre des minutes.
+    def display_clock(self, daytime):
+        """Affiche l'heure locale (secondes depuis minuit) en ne redessinant que ce qui a changé."""
+        digits = "{:02}{:02}".format(daytime // 3600, daytime // 60 % 60)  # HHMM
+        previous = self.clock_digits
+        if digits != previous:
+            # Seules les cellules des chiffres modifiés sont effacées puis redessinées
+            for i in range(4):
+                if previous is None or digits[i] != previous[i]:
+                    self.display_digit(digits[i], CLOCK_DIGIT_COLUMNS[i], 1, 'YELLOW_SMILEY', previous is not None)
+            self.clock_digits = digits
+
+        colon = daytime % 2 == 0  # Deux points allumés les secondes paires.
+        if colon != self.clock_colon:
+            self.set_pen('YELLOW_SMILEY' if colon else 'BLACK')
+            self.pixel(22, 2)
+            self.pixel(22, 4)
+            self.clock_colon = colon
+            self.update()  # Met à jour l'affichage.
+
+    def display_data_age(self, minutes):
+        """Affiche en rose l'âge des temps d'attente (minutes, 99 au plus) en bas à droite ; -1 le masque."""
+        if minutes == self.age_shown:
+            return
+        self.set_pen('BLACK')  # Efface les deux cellules de l'indicateur.
+        self.graphics.rectangle(AGE_COLUMNS[0], AGE_ROW, 7, 5)
+        self.frame_pixels += 35
+        if minutes >= 0:
+            digits = "{:2}".format(min(minutes, 99))
+            for i in range(2):
+                if digits[i] != ' ':
+                    self.display_digit(digits[i], AGE_COLUMNS[i], AGE_ROW, 'PINK')
+        self.age_shown = minutes
         self.update()  # Met à jour l'affichage.
 
     def set_transition_variable(self, name):
-        """Définit le texte à faire défiler."""
-        self.transition_var = name  # Définit la variable de transition avec le texte à afficher.
+        """Définit le texte à faire défiler et pré-rend son bandeau."""
+        self.transition_var = normalize_name(name)  # Texte affiché, sans accents et en majuscules.
+        self.render_scroll_strip(self.transition_var)
         self.scroll_shift = 0  # Réinitialise le décalage du texte.
 
     def display_message_frame_2(self, message):
@@ -296,6 +651,7 @@ class CosmicUnicornDisplay:
             self.play_bip(500)  # Émet un bip sonore
         else:
             print("Son désactivé")
+            self.tones.stop()  # Coupe les bips en cours ou en attente
             self.play_bip(400)  # Émet un bip différent
         self.update_led_sound_status()  # Met à jour l'état des LEDs
 
@@ -306,11 +662,11 @@ class CosmicUnicornDisplay:
             if self.sound_enabled:
                 self.set_pen('BLUE')
                 for x, y in self.led_positions_sound_on:
-                    self.graphics.pixel(x, y)
+                    self.pixel(x, y)
             else:
                 self.set_pen('RED')
                 for x, y in self.led_positions_sound_off:
-                    self.graphics.pixel(x, y)
+                    self.pixel(x, y)
             self.update()
         else:
             self.clear_sound_leds()  # Efface les LEDs si ce n'est pas le bon mode
@@ -319,7 +675,7 @@ class CosmicUnicornDisplay:
         """Efface les LEDs utilisées pour le statut du son."""
         self.set_pen('BLACK')
         for x, y in self.led_positions_sound_on:  # Même positions pour nettoyage
-            self.graphics.pixel(x, y)
+            self.pixel(x, y)
         self.update()
 
     # Fonction pour mettre en pause ou reprendre la boucle d'affichage des agences.
@@ -329,12 +685,12 @@ class CosmicUnicornDisplay:
         if self.loop_paused:  # Si la boucle est en pause.
             print("Bouton B pressé - Mise en pause de la boucle")
             self.set_pen('YELLOW')  # Allume la LED de pause.
-            self.graphics.pixel(*self.pause_led_position)
+            self.pixel(*self.pause_led_position)
             self.update()
         else:  # Si la boucle reprend.
             print("Bouton B pressé - Reprise de la boucle")
             self.set_pen('BLACK')  # Éteint la LED de pause.
-            self.graphics.pixel(*self.pause_led_position)
+            self.pixel(*self.pause_led_position)
             self.update()
             
     def update_led_wifi_status(self, wifi_status):
@@ -342,84 +698,159 @@ class CosmicUnicornDisplay:
         if wifi_status:  # Si le WiFi est connecté, éteindre les LEDs rouges.
             self.set_pen('BLACK')
             for x, y in self.led_positions_wifi_ko:
-                self.graphics.pixel(x, y)
+                self.pixel(x, y)
         else:  # Si le WiFi est déconnecté, allumer les LEDs rouges et les maintenir allumées.
             self.set_pen('RED')
             for x, y in self.led_positions_wifi_ko:
-                self.graphics.pixel(x, y)
+                self.pixel(x, y)
         self.update()  # Met à jour l'affichage pour appliquer les changements
-    
-    def check_wifi_status(self, wlan):
-        """Vérifie l'état de la connexion WiFi et met à jour l'état des LEDs."""
-        global attempts
-        if wlan.isconnected():
-            if not self.previous_wifi_status:
-                print("WIFI OK")
-                self.previous_wifi_status = True  # Mise à jour du statut
-            attempts = 0  # Réinitialiser le compteur d'échecs
-            return True
-        else:
-            if self.previous_wifi_status:
-                print("WIFI KO")
-                self.previous_wifi_status = False
-            attempts += 1  # Incrémenter la variable d'échecs
-            if attempts > 10:
-                stop_script(self, wifi_issue=True)
-            return False
 
+# Glyphes stockés sous forme de masques de bits par ligne (bit de poids fort = colonne de gauche).
+# Les tables sont construites une seule fois à l'import : dessiner un glyphe ne crée aucun objet.
 # Matrices pour les lettres avec une largeur de 3 LED et une hauteur de 5 LED
 LETTER_MAP_3 = {
-    'C': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 0), (2, 4), (1, 4)],
-    'L': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 4), (2, 4)],
-    'E': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (1, 4), (2, 0), (2, 4)],
-    'W': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 3), (2, 2), (2, 0), (2, 1), (2, 3), (2, 4)],
-    'I': [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4), (0, 4), (2, 4)],
-    'F': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (2, 0)],
-    'A': [(1, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2), (0, 3), (2, 3), (0, 4), (2, 4)],
-    'P': [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2), (0, 3), (0, 4)],
-    'O': [(1, 0), (0, 1), (2, 1), (0, 2), (2, 2), (0, 3), (2, 3), (1, 4)],
-    'K': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (2, 0), (1, 2), (2, 4)],
-    'S': [(0, 1), (0, 2), (1, 0), (2, 0), (1, 2), (2, 3), (0, 4), (1, 4)],
-    'U': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (1, 4)],
-    'N': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (1, 1), (1, 2)],
-    'D': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 1), (2, 2), (2, 3), (1, 4)],
-    'R': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 0), (1, 2), (2, 2), (1, 3), (2, 4)],
-    'G': [(1, 0), (0, 1), (2, 1), (0, 2), (2, 2), (0, 3), (2, 3), (1, 4), (2, 4)],
-    'Y': [(0, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4)],
-    'T': [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4)],
-    'H': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)],
-    'V': [(0, 0), (0, 1), (0, 2), (1, 3), (2, 0), (2, 1), (2, 2)],
-    'M': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 1), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)],
-    'X': [(0, 0), (0, 1), (0, 3), (0, 4), (2, 0), (2, 1), (2, 3), (2, 4), (1, 2)],
-
+    'C': bytes((0b111, 0b100, 0b100, 0b100, 0b111)),
+    'L': bytes((0b100, 0b100, 0b100, 0b100, 0b111)),
+    'E': bytes((0b111, 0b100, 0b110, 0b100, 0b111)),
+    'W': bytes((0b101, 0b101, 0b101, 0b111, 0b101)),
+    'I': bytes((0b111, 0b010, 0b010, 0b010, 0b111)),
+    'F': bytes((0b111, 0b100, 0b110, 0b100, 0b100)),
+    'A': bytes((0b010, 0b101, 0b111, 0b101, 0b101)),
+    'P': bytes((0b111, 0b101, 0b111, 0b100, 0b100)),
+    'O': bytes((0b010, 0b101, 0b101, 0b101, 0b010)),
+    'K': bytes((0b101, 0b100, 0b110, 0b100, 0b101)),
+    'S': bytes((0b011, 0b100, 0b110, 0b001, 0b110)),
+    'U': bytes((0b101, 0b101, 0b101, 0b101, 0b111)),
+    'N': bytes((0b101, 0b111, 0b111, 0b101, 0b101)),
+    'D': bytes((0b110, 0b101, 0b101, 0b101, 0b110)),
+    'R': bytes((0b111, 0b100, 0b111, 0b110, 0b101)),
+    'G': bytes((0b010, 0b101, 0b101, 0b101, 0b011)),
+    'Y': bytes((0b101, 0b010, 0b010, 0b010, 0b010)),
+    'T': bytes((0b111, 0b010, 0b010, 0b010, 0b010)),
+    'H': bytes((0b101, 0b101, 0b111, 0b101, 0b101)),
+    'V': bytes((0b101, 0b101, 0b101, 0b010, 0b000)),
+    'M': bytes((0b101, 0b111, 0b101, 0b101, 0b101)),
+    'X': bytes((0b101, 0b101, 0b010, 0b101, 0b101)),
 }
 
 # Matrices pour les lettres avec une largeur de 4 LED et une hauteur de 5 LED
 LETTER_MAP_4 = {
-    'C': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 4), (2, 0), (2, 4), (3, 0), (3, 4)],
-    'L': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 4), (2, 4), (3, 4)],
-    'E': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (1, 4), (2, 0), (2, 2), (2, 4), (3, 0), (3, 4)],
-    'W': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 3), (2, 3), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4)],
-    'I': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)],
-    'F': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (2, 0), (2, 2), (3, 0)],
-    'A': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 2), (2, 0), (2, 2), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4)],
-    'P': [(0, 0), (1, 0), (2, 0), (3, 0), (0, 1), (3, 1), (0, 2), (1, 2), (2, 2), (3, 2), (0, 3), (0, 4)],
-    'O': [(1, 0), (2, 0), (0, 1), (3, 1), (0, 2), (3, 2), (0, 3), (3, 3), (1, 4), (2, 4)],
-    'K': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (3, 0), (1, 2), (2, 1), (2, 3), (3, 4)],
-    'N': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 1), (1, 2), (2, 3), (2, 4), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4)],
-    'R': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (2, 2), (1, 2), (2, 3), (3, 4)],
-    'B': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 0), (3, 1), (2, 2), (1, 2), (3, 3), (3, 4), (2, 4), (1, 4)],
-    'T': [(0, 0), (1, 0), (2, 0), (3, 0), (1, 1), (2, 1), (1, 2), (2, 2), (1, 3), (2, 3), (1, 4), (2, 4)],
-    'S': [(3, 0), (2, 0), (1, 0), (0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (3, 2), (3, 3), (3, 4), (2, 4), (1, 4), (0, 4)],
-    'D': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (2, 0), (3, 1), (3, 2), (3, 3), (2, 4), (1, 4), (0, 4)],
+    'C': bytes((0b1111, 0b1000, 0b1000, 0b1000, 0b1111)),
+    'L': bytes((0b1000, 0b1000, 0b1000, 0b1000, 0b1111)),
+    'E': bytes((0b1111, 0b1000, 0b1110, 0b1000, 0b1111)),
+    'W': bytes((0b1001, 0b1001, 0b1001, 0b1111, 0b1001)),
+    'I': bytes((0b0110, 0b0110, 0b0110, 0b0110, 0b0110)),
+    'F': bytes((0b1111, 0b1000, 0b1110, 0b1000, 0b1000)),
+    'A': bytes((0b1111, 0b1001, 0b1111, 0b1001, 0b1001)),
+    'P': bytes((0b1111, 0b1001, 0b1111, 0b1000, 0b1000)),
+    'O': bytes((0b0110, 0b1001, 0b1001, 0b1001, 0b0110)),
+    'K': bytes((0b1001, 0b1010, 0b1100, 0b1010, 0b1001)),
+    'N': bytes((0b1001, 0b1101, 0b1101, 0b1011, 0b1011)),
+    'R': bytes((0b1111, 0b1001, 0b1111, 0b1010, 0b1001)),
+    'B': bytes((0b1110, 0b1001, 0b1110, 0b1001, 0b1111)),
+    'T': bytes((0b1111, 0b0110, 0b0110, 0b0110, 0b0110)),
+    'S': bytes((0b1111, 0b1000, 0b1111, 0b0001, 0b1111)),
+    'D': bytes((0b1110, 0b1001, 0b1001, 0b1001, 0b1110)),
+}
+
+# Chiffres de l'horloge (3 x 5 LED)
+DIGIT_MAP = {
+    '0': bytes((0b111, 0b101, 0b101, 0b101, 0b111)),
+    '1': bytes((0b010, 0b010, 0b010, 0b010, 0b010)),
+    '2': bytes((0b111, 0b001, 0b111, 0b100, 0b111)),
+    '3': bytes((0b111, 0b001, 0b111, 0b001, 0b111)),
+    '4': bytes((0b101, 0b101, 0b111, 0b001, 0b001)),
+    '5': bytes((0b111, 0b100, 0b111, 0b001, 0b111)),
+    '6': bytes((0b100, 0b100, 0b111, 0b101, 0b111)),
+    '7': bytes((0b111, 0b001, 0b011, 0b001, 0b001)),
+    '8': bytes((0b111, 0b101, 0b111, 0b101, 0b111)),
+    '9': bytes((0b111, 0b101, 0b111, 0b001, 0b111)),
+}
+
+# Sigle OPT (12 x 5 LED, dessiné en (1, 1))
+OPT_LOGO = array('H', (
+    0b111101110111,
+    0b100101010010,
+    0b100101110010,
+    0b100101000010,
+    0b111101000010,
+))
+
+# Contour et yeux du smiley (18 x 18 LED, dessiné en (7, 8)), sans la bouche
+SMILEY_FACE = array('I', (
+    0b000000111111000000,
+    0b000011100001110000,
+    0b000110000000011000,
+    0b001100000000001100,
+    0b011000000000000110,
+    0b010000000000000010,
+    0b110011100001110011,
+    0b100011100001110001,
+    0b100000000000000001,
+    0b100000000000000001,
+    0b100000000000000001,
+    0b110000000000000011,
+    0b010000000000000010,
+    0b011000000000000110,
+    0b001100000000001100,
+    0b000110000000011000,
+    0b000011100001110000,
+    0b000000111111000000,
+))
+
+# Zones pré-rendues de l'écran agences (x, y, largeur, hauteur) : sigle OPT, puis smiley et icône de temps
+LOGO_REGION = (1, 1, 12, 5)
+MOOD_REGION = (7, 7, 25, 19)  # Couvre l'effacement du smiley (7, 7, 19 x 19) et l'icône (24, 8, 8 x 5).
+
+# Couleur du smiley pour chaque humeur
+MOOD_COLORS = {
+    'happy': 'GREEN_SMILEY',
+    'neutral': 'YELLOW_SMILEY',
+    'sad': 'RED_SMILEY',
+}
+
+# Bouches du smiley (8 x 2 LED, dessinées en (12, 19))
+SMILEY_MOUTHS = {
+    'happy': bytes((0b11111111, 0b01111110)),
+    'neutral': bytes((0b00000000, 0b01111110)),
+    'sad': bytes((0b01111110, 0b11111111)),
+}
+
+# Icônes de temps d'attente (8 x 5 LED, dessinées en (24, 8)) : <5, <10 et >10 minutes
+TIME_ICONS = {
+    'happy': bytes((0b00000110, 0b00010100, 0b00100110, 0b00010010, 0b00000110)),
+    'neutral': bytes((0b00010111, 0b01010101, 0b10010101, 0b01010101, 0b00010111)),
+    'sad': bytes((0b00010111, 0b10010101, 0b01010101, 0b10010101, 0b00010111)),
 }
 
+# Fonction commune pour dessiner un bitmap (glyphe, chiffre ou sprite) avec le stylo courant
+def blit_glyph(graphics, rows, width, x, y):
+    """Dessine les bits à 1 d'un bitmap ligne par ligne et retourne le nombre de pixels écrits."""
+    count = 0
+    for dy in range(len(rows)):
+        bits = rows[dy]
+        px = x + width - 1  # Le bit de poids faible correspond à la colonne de droite.
+        while bits:
+            if bits & 1:
+                graphics.pixel(px, y + dy)
+                count += 1
+            bits >>= 1
+            px -= 1
+    return count
+
+# Colonnes des chiffres H, H, M, M de l'horloge (les deux points sont en colonne 22)
+CLOCK_DIGIT_COLUMNS = (14, 18, 24, 28)
+
+# Indicateur d'âge des données (coin bas droit, sous le temps d'attente)
+AGE_COLUMNS = (25, 29)
+AGE_ROW = 20
+
 # Fonction pour dessiner une lettre de la map 3 spécifique à une position donnée
 def draw_letter_3(graphics, letter, x, y, pen):
-    if letter in LETTER_MAP_3:
+    glyph = LETTER_MAP_3.get(letter)
+    if glyph:
         graphics.set_pen(pen)
-        for dx, dy in LETTER_MAP_3[letter]:
-            graphics.pixel(x + dx, y + dy)
+        blit_glyph(graphics, glyph, 3, x, y)
 
 
 # Fonction pour dessiner un mot entier en map 3
@@ -431,10 +862,10 @@ def draw_word_3(graphics, word, x, y, pen, spacing=4):
 
 # Fonction pour dessiner une lettre de la map 4 spécifique à une position donnée
 def draw_letter_4(graphics, letter, x, y, pen):
-    if letter in LETTER_MAP_4:
+    glyph = LETTER_MAP_4.get(letter)
+    if glyph:
         graphics.set_pen(pen)
-        for dx, dy in LETTER_MAP_4[letter]:
-            graphics.pixel(x + dx, y + dy)
+        blit_glyph(graphics, glyph, 4, x, y)
 
 
 # Fonction pour dessiner un mot entier en map 4
@@ -443,186 +874,240 @@ def draw_word_4(graphics, word, x, y, display, color_name, spacing=5):
     display.set_pen(color_name)  # Utilise set_pen pour appliquer la couleur
     current_x = x
     for letter in word:
-        if letter in LETTER_MAP_4:
-            for dx, dy in LETTER_MAP_4[letter]:
-                graphics.pixel(current_x + dx, y + dy)
+        glyph = LETTER_MAP_4.get(letter)
+        if glyph:
+            display.frame_pixels += blit_glyph(graphics, glyph, 4, current_x, y)
             current_x += spacing  # Espacement entre les lettres
 
-def show_loading_screen(display, step):
-    """Affiche l'animation de chargement et le texte WAIT avec la police bitmap5."""
-    display.clear()
-    display.graphics.set_font("bitmap5")  # Définit la police sur bitmap5
-    display.graphics.set_pen(display.pens['WHITE'])  # Choisit le stylo blanc
-    display.graphics.text("WAIT", 5, 12, scale=1)  # Affiche le texte "WAIT" en position (12, 14)
-    loading_animation_step(display, step)  # Exécute l'étape de l'animation de chargement
-    display.update()
-    time.sleep(0.2)  # Pause pour la synchronisation de l'animation
-
-
-def loading_animation_step(display, step):
-    """Affiche progressivement l'animation de chargement sur l'écran en fonction de l'étape."""
-    blocks = [
-        [(0, 30), (0, 31), (0, 32), (1, 30), (1, 31), (1, 32), (2, 30), (2, 31), (2, 32)],
-        [(3, 30), (3, 31), (3, 32), (4, 30), (4, 31), (4, 32), (5, 30), (5, 31), (5, 32)],
-        [(6, 30), (6, 31), (6, 32), (7, 30), (7, 31), (7, 32), (8, 30), (8, 31), (8, 32)],
-        [(9, 30), (9, 31), (9, 32), (10, 30), (10, 31), (10, 32), (11, 30), (11, 31), (11, 32)],
-        [(12, 30), (12, 31), (12, 32), (13, 30), (13, 31), (13, 32), (14, 30), (14, 31), (14, 32)],
-        [(15, 30), (15, 31), (15, 32), (16, 30), (16, 31), (16, 32), (17, 30), (17, 31), (17, 32)],
-        [(18, 30), (18, 31), (18, 32), (19, 30), (19, 31), (19, 32), (20, 30), (20, 31), (20, 32)],
-        [(21, 30), (21, 31), (21, 32), (22, 30), (22, 31), (22, 32), (23, 30), (23, 31), (23, 32)],
-        [(24, 30), (24, 31), (24, 32), (25, 30), (25, 31), (25, 32), (26, 30), (26, 31), (26, 32)],
-        [(27, 30), (27, 31), (27, 32), (28, 30), (28, 31), (28, 32), (29, 30), (29, 31), (29, 32)],
-        [(30, 30), (30, 31), (30, 32), (31, 30), (31, 31), (31, 32)]
-    ]
-
-    if step < len(blocks):
-        # Vérifie si la couleur 'WHITE' est définie
-        if 'WHITE' in display.pens:
-            display.set_pen('WHITE')
-        else:
-            print("Erreur : La couleur 'WHITE' n'est pas définie.")
-            return
-
-        # Dessine le bloc de LEDs pour l'étape en cours
-        for x, y in blocks[step]:
-            display.graphics.pixel(x, y)
-        display.update()
-        
-def display_welcome_screen(display):
-    """Affiche l'écran d'accueil avec 'UNC' défilant, puis dessine un bloc bleu autour de 'UNC' en inversant les couleurs."""
-    display.display_mode = 0
-    display.clear()  # Efface l'écran
-
-    # Utilisation des couleurs pré-définies
-    colors = {
-        'UNC': 'BLUE',
-        'OPT': 'YELLOW_SMILEY',
-    }
-    
-    # Charger la police bitmap5
-    display.graphics.set_font("bitmap5")
-
-    # Positions de départ hors écran
-    unc_x_start = display.width  # à droite, hors écran
-    opt_x_start = -display.graphics.measure_text("OPT", 1)  # à gauche, hors écran
-
-    # Positions finales
-    unc_x_final = 2
-    opt_x_final = 13
-
-    # Boucle de défilement pour les deux textes
-    while unc_x_start > unc_x_final or opt_x_start < opt_x_final:
-        display.clear()
-
-        # Afficher "UNC" en bleu, en défilant de droite à gauche
-        if unc_x_start > unc_x_final:
-            unc_x_start -= 1
-        display.set_pen(colors['UNC'])
-        display.graphics.text("UNC", unc_x_start, 1, scale=1)
-
-        # Afficher "OPT" en jaune smiley, en défilant de gauche à droite
-        if opt_x_start < opt_x_final:
-            opt_x_start += 1
-        display.set_pen(colors['OPT'])
-        display.graphics.text("OPT", opt_x_start, 24, scale=1)
-
-        # Mettre à jour l'affichage
+# Animations en frames delta : chaque frame ne contient que les pixels qui changent, sous forme de
+# triplets (x, y, couleur) dans un objet bytes. Les couleurs sont des index dans la palette de l'animation.
+class Animation:
+    def __init__(self, palette):
+        self.palette = palette  # Noms des couleurs (clés de display.pens) ; l'index 0 est le noir.
+        self.frames = []  # Une frame = bytes de triplets (x, y, index de couleur).
+        self.durations = array('H')  # Durée d'affichage de chaque frame (ms).
+        self.state = {}  # Pixels allumés à la dernière frame clé (construction seulement).
+
+    def add(self, pixels, duration):
+        """Ajoute une frame à partir d'une liste de (x, y, index de couleur)."""
+        frame = bytearray(3 * len(pixels))
+        for i in range(len(pixels)):
+            frame[3 * i], frame[3 * i + 1], frame[3 * i + 2] = pixels[i]
+        self.frames.append(bytes(frame))
+        self.durations.append(duration)
+
+    def keyframe(self, state, duration):
+        """Ajoute une frame clé {(x, y): couleur} : seule la différence avec la précédente est gardée."""
+        pixels = [(x, y, color) for (x, y), color in state.items() if self.state.get((x, y)) != color]
+        pixels += [(x, y, 0) for (x, y) in self.state if (x, y) not in state]  # Pixels éteints.
+        self.add(pixels, duration)
+        self.state = state
+
+    def freeze(self):
+        """Termine la construction (l'état des frames clés n'est plus utile). Retourne l'animation."""
+        self.state = None
+        return self
+
+    def count(self):
+        return len(self.frames)
+
+    def draw(self, display, index):
+        """Applique les pixels d'une frame sur le framebuffer, sans flush."""
+        frame = self.frames[index]
+        graphics = display.graphics
+        pens = display.pens
+        palette = self.palette
+        color = -1
+        for i in range(0, len(frame), 3):
+            if frame[i + 2] != color:
+                color = frame[i + 2]
+                graphics.set_pen(pens[palette[color]])
+            graphics.pixel(frame[i], frame[i + 1])
+        display.frame_pixels += len(frame) // 3
+
+
+async def play_animation(display, animation, first=0, last=None):
+    """
+    Joue les frames [first, last) d'une animation, cadencées sur ticks_ms (un flush par frame).
+    Un appui en attente l'interrompt : les frames restantes sont appliquées d'un coup (état final)
+    et False est retourné ; l'événement reste dans la file pour l'écran suivant.
+    """
+    last = animation.count() if last is None else min(last, animation.count())
+    deadline = time.ticks_ms()
+    for index in range(first, last):
+        animation.draw(display, index)
+        if display.buttons.pending():
+            for rest in range(index + 1, last):
+                animation.draw(display, rest)
+            display.update()
+            return False
         display.update()
-        time.sleep(0.1)  # Ajustez pour la vitesse du défilement
-
-    # Texte "UNC" en position finale avec inversion des couleurs
-    display.set_pen(colors['UNC'])
-    display.graphics.text("UNC", unc_x_final, 1, scale=1)
-    display.update()
-    time.sleep(0.5)
-    # Couleur du fond en bleu et les lettres en noir
-    display.set_pen('BLUE')
+        deadline = time.ticks_add(deadline, animation.durations[index])
+        await asyncio.sleep_ms(max(0, time.ticks_diff(deadline, time.ticks_ms())))
+    return True
+
+
+# Barre de chargement : un bloc blanc de 3 x 2 LED par étape sur les deux dernières lignes.
+LOADING_STEP_MS = 100
+
+
+def build_loading_animation():
+    """Construit les frames de la barre de chargement (une étape = un bloc)."""
+    animation = Animation(('BLACK', 'WHITE'))
+    for x in range(0, 32, 3):
+        animation.add([(x + dx, 30 + dy, 1) for dy in range(2) for dx in range(min(3, 32 - x))], LOADING_STEP_MS)
+    return animation.freeze()
+
+
+# Cœur explosant : la LED centrale, puis les LEDs du contour une à une (la centrale s'éteint à mi-parcours).
+HEART_CENTER = (15, 15)
+HEART_PIXELS = (
+    (15, 12), (14, 11), (16, 11), (13, 10), (17, 10),
+    (12, 9), (11, 9), (10, 9), (18, 9), (19, 9), (20, 9),
+    (9, 10), (21, 10), (8, 11), (22, 11), (7, 12), (7, 13),
+    (7, 14), (23, 12), (23, 13), (23, 14), (8, 15), (22, 15),
+    (9, 16), (21, 16), (10, 17), (20, 17), (11, 18), (19, 18),
+    (12, 19), (18, 19), (13, 20), (17, 20), (14, 21), (16, 21), (15, 22),
+)
+
+
+def build_heart_animation():
+    """Construit les frames du cœur explosant."""
+    animation = Animation(('BLACK', 'PINK'))
+    animation.add([(HEART_CENTER[0], HEART_CENTER[1], 1)], 200)
+    for i in range(len(HEART_PIXELS)):
+        pixels = [(HEART_PIXELS[i][0], HEART_PIXELS[i][1], 1)]
+        if i == len(HEART_PIXELS) // 2:  # Lorsque la moitié des LEDs sont allumées, éteindre la LED centrale
+            pixels.append((HEART_CENTER[0], HEART_CENTER[1], 0))
+        animation.add(pixels, 50)
+    return animation.freeze()
+
+
+# Animations construites une seule fois à l'import
+LOADING_ANIMATION = build_loading_animation()
+HEART_ANIMATION = build_heart_animation()
+
+# Écran d'accueil : UNC et OPT glissent vers leur position finale, puis chacun est inversé dans un bloc de couleur.
+WELCOME_PALETTE = ('BLACK', 'BLUE', 'YELLOW_SMILEY')
+WELCOME_UNC = (2, 1)  # Position finale du texte UNC.
+WELCOME_OPT = (13, 24)  # Position finale du texte OPT.
+WELCOME_STEP_MS = 100  # Un pixel de glissement par frame.
+WELCOME_HOLD_MS = 500  # Pause sur chaque étape de l'inversion.
+# LEDs laissées noires dans les blocs inversés (lettres UNC et OPT)
+WELCOME_UNC_HOLES = (
+    (2, 2), (2, 3), (2, 4), (2, 5), (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (6, 2), (6, 3), (6, 4), (6, 5),
+    (8, 2), (8, 3), (8, 4), (8, 5), (8, 6), (9, 2), (10, 2), (11, 2), (12, 2), (12, 3), (12, 4), (12, 5), (12, 6),
+    (14, 2), (14, 3), (14, 4), (14, 5), (14, 6), (15, 2), (16, 2), (17, 2), (15, 6), (16, 6), (17, 6),
+)
+WELCOME_OPT_HOLES = (
+    (13, 25), (13, 26), (13, 27), (13, 28), (13, 29), (14, 25), (15, 25), (16, 25), (14, 29), (15, 29), (16, 29),
+    (17, 29), (17, 26), (17, 27), (17, 28),
+    (19, 25), (19, 26), (19, 27), (19, 28), (19, 29), (20, 25), (21, 25), (22, 25), (21, 28), (22, 28), (23, 28),
+    (23, 25), (23, 26), (23, 27),
+    (25, 25), (26, 25), (27, 25), (28, 25), (29, 25), (27, 26), (27, 27), (27, 28),
+)
+
+
+def text_pixels(display, text):
+    """Relève une fois, hors écran, les pixels d'un texte en police bitmap5 (décalages depuis son origine)."""
+    graphics = display.graphics
+    batch_mode = display.batch_mode
+    display.batch_mode = True  # Aucun flush pendant le relevé.
+    display.set_pen('BLACK')
+    graphics.clear()
+    graphics.set_font("bitmap5")
+    display.set_pen('WHITE')
+    graphics.text(text, 0, 0, scale=1)
+    framebuffer = display.framebuffer
+    pixels = []
+    for y in range(8):
+        for x in range(display.width):
+            i = (y * display.width + x) * 4
+            if framebuffer[i] or framebuffer[i + 1] or framebuffer[i + 2]:
+                pixels.append((x, y))
+    display.set_pen('BLACK')
+    graphics.clear()
+    display.batch_mode = batch_mode
+    display.frame_dirty = False
+    return pixels
+
+
+def build_welcome_animation(display):
+    """Construit les frames delta de l'écran d'accueil à partir des pixels de la police de l'appareil."""
+    unc = text_pixels(display, "UNC")
+    opt = text_pixels(display, "OPT")
+    animation = Animation(WELCOME_PALETTE)
+    width = display.width
+
+    def place(state, pixels, x, y, color):
+        for dx, dy in pixels:
+            if 0 <= x + dx < width:
+                state[(x + dx, y + dy)] = color
+
+    # Glissement : UNC depuis la droite, OPT depuis la gauche, un pixel par frame
+    unc_x = width
+    opt_x = -display.graphics.measure_text("OPT", 1)
+    while unc_x > WELCOME_UNC[0] or opt_x < WELCOME_OPT[0]:
+        unc_x = max(unc_x - 1, WELCOME_UNC[0])
+        opt_x = min(opt_x + 1, WELCOME_OPT[0])
+        state = {}
+        place(state, unc, unc_x, WELCOME_UNC[1], 1)
+        place(state, opt, opt_x, WELCOME_OPT[1], 2)
+        animation.keyframe(state, WELCOME_STEP_MS)
+    animation.durations[-1] += WELCOME_HOLD_MS  # Textes en place avant l'inversion.
+
+    # Inversion : bloc bleu autour de UNC, puis bloc jaune autour de OPT, lettres en noir
+    state = dict(animation.state)
     for x in range(1, 19):
         for y in range(1, 8):
-            display.graphics.pixel(x, y)
-    # Laisser les LEDs de "UNC" en noir en repassant par-dessus
-    display.set_pen('BLACK')
-    unc_pixels = {
-        # 'U'
-        (2, 2), (2, 3), (2, 4), (2, 5), (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (6, 2), (6, 3), (6, 4), (6, 5),
-        # 'N'
-        (8, 2), (8, 3), (8, 4), (8, 5), (8, 6), (9, 2), (10, 2), (11, 2), (12, 2), (12, 3), (12, 4), (12, 5), (12, 6),
-        # 'C'
-        (14, 2), (14, 3), (14, 4), (14, 5), (14, 6), (15, 2), (16, 2), (17, 2), (15, 6), (16, 6), (17, 6),
-    }
-    for (x, y) in unc_pixels:
-        display.graphics.pixel(x, y)
-
-    # Texte "OPT" en position finale avec inversion des couleurs
-    display.set_pen(colors['OPT'])
-    display.graphics.text("OPT", opt_x_final, 24, scale=1)
-    display.update()
-    time.sleep(0.5)
-    # Couleur du fond en jaune et les lettres en noir
-    display.set_pen('YELLOW_SMILEY')
+            state[(x, y)] = 1
+    for x, y in WELCOME_UNC_HOLES:
+        del state[(x, y)]
+    animation.keyframe(state, WELCOME_HOLD_MS)
+    state = dict(state)
     for x in range(12, 31):
         for y in range(24, 31):
-            display.graphics.pixel(x, y)  
-    # Laisser les LEDs de "OPT" en noir en repassant par-dessus
-    display.set_pen('BLACK')
-    opt_pixels = {
-        # 'O'
-        (13, 25), (13, 26), (13, 27), (13, 28), (13, 29), (14, 25), (15, 25), (16, 25), (14, 29), (15, 29), (16, 29), (17, 29), (17, 26), (17, 27), (17, 28), (17, 29), 
-        # 'P'
-        (19, 25), (19, 26), (19, 27), (19, 28), (19, 29), (20, 25), (21, 25), (22, 25), (21, 28), (22, 28), (23, 28), (23, 25), (23, 26), (23, 27),
-        # 'T'
-        (25, 25), (26, 25), (27, 25), (28, 25), (29, 25), (27, 25), (27, 26), (27, 27), (27, 28),
-    }
-    for (x, y) in opt_pixels:
-        display.graphics.pixel(x, y)
+            state[(x, y)] = 2
+    for x, y in WELCOME_OPT_HOLES:
+        del state[(x, y)]
+    animation.keyframe(state, WELCOME_HOLD_MS)
+    return animation.freeze()
 
-    # Mettre à jour pour afficher les blocs finaux
-    display.update()
-    time.sleep(0.5)
 
-    # enchaîner avec l'animation
-    exploding_heart_animation(display)
+async def show_loading_screen(display, step):
+    """Affiche le texte WAIT (étape 0) puis ajoute le bloc de l'étape à la barre de chargement."""
+    if step == 0:
+        display.clear()
+        display.graphics.set_font("bitmap5")  # Définit la police sur bitmap5
+        display.set_pen('WHITE')  # Choisit le stylo blanc
+        display.graphics.text("WAIT", 5, 12, scale=1)  # Affiche le texte "WAIT" en position (5, 12)
+    await play_animation(display, LOADING_ANIMATION, step, step + 1)
 
 
-def exploding_heart_animation(display):
+async def display_welcome_screen(display):
+    """Affiche l'écran d'accueil ('UNC' et 'OPT' glissent puis sont inversés) suivi du cœur explosant.
+
+    Un appui pendant l'animation l'amène directement à son état final.
+    """
+    display.display_mode = 0
+    if display.welcome_animation is None:
+        display.welcome_animation = build_welcome_animation(display)  # Une seule fois
+    display.clear()  # Efface l'écran
+    if await play_animation(display, display.welcome_animation):
+        await exploding_heart_animation(display)  # enchaîner avec l'animation
+
+
+async def exploding_heart_animation(display):
     """Crée une animation d'un cœur explosant à partir d'une LED centrale, qui disparaît ensuite."""
-    # Définir la LED centrale de départ
-    center_led = (15, 15)
-    
-    # Liste des positions des LEDs formant le cœur final
-    heart_positions = [
-        (15, 12), (14, 11), (16, 11), (13, 10), (17, 10), 
-        (12, 9), (11, 9), (10, 9), (18, 9), (19, 9), (20, 9), 
-        (9, 10), (21, 10), (8, 11), (22, 11), (7, 12), (7, 13), 
-        (7, 14), (23, 12), (23, 13), (23, 14), (8, 15), (22, 15), 
-        (9, 16), (21, 16), (10, 17), (20, 17), (11, 18), (19, 18), 
-        (12, 19), (18, 19), (13, 20), (17, 20), (14, 21), (16, 21), (15, 22)
-    ]
-    
-    # Afficher la LED centrale
-    display.set_pen('PINK')
-    display.graphics.pixel(*center_led)
-    display.update()
-    time.sleep(0.2)  # Petite pause pour rendre l'animation visible
-
-    # Ajouter les LEDs petit à petit jusqu'à former le cœur final
-    for i, led in enumerate(heart_positions):
-        # Lorsque la moitié des LEDs sont allumées, éteindre la LED centrale
-        if i == len(heart_positions) // 2:
-            display.set_pen('BLACK')
-            display.graphics.pixel(*center_led)
-
-        # Afficher la LED courante du cœur
-        display.set_pen('PINK')
-        display.graphics.pixel(*led)
-        display.update()
-        time.sleep(0.05)  # Pause pour rendre l'animation progressive
+    await play_animation(display, HEART_ANIMATION)
 
 
-def display_info_screen(self, wifi_status, api_key_status, file_agences_status):
-    """Affiche l'état du WiFi, de la clé API, et du fichier agences.env sur l'écran d'information."""
+async def display_info_screen(self, wifi_status, api_key_status, file_agences_status, memory=None, boot=None):
+    """Affiche l'état du WiFi, de la clé API, du fichier agences.env et, si fournis, la mémoire libre minimale
+    et la durée du démarrage (secondes)."""
     self.display_mode = 1
     self.clear()  # Efface l'écran pour l'affichage des informations.
+    row = 6 if boot else 8  # Lignes resserrées pour faire tenir la durée du démarrage.
 
     # Définir la police et la couleur
     self.graphics.set_font("bitmap5")
@@ -639,24 +1124,39 @@ def display_info_screen(self, wifi_status, api_key_status, file_agences_status):
 
     # Affichage pour l'état de la clé API
     self.graphics.set_pen(self.pens['WHITE'])
-    self.graphics.text("API", 1, 8, scale=1)
+    self.graphics.text("API", 1, row, scale=1)
     if api_key_status:
         self.graphics.set_pen(self.pens['GREEN'])
-        self.graphics.text("OK", 21, 8, scale=1)
+        self.graphics.text("OK", 21, row, scale=1)
     else:
         self.graphics.set_pen(self.pens['RED'])
-        self.graphics.text("KO", 21, 8, scale=1)
+        self.graphics.text("KO", 21, row, scale=1)
 
     # Affichage pour l'état du fichier agences.env
     self.graphics.set_pen(self.pens['WHITE'])
-    self.graphics.text(".ENV", 1, 16, scale=1)
+    self.graphics.text(".ENV", 1, 2 * row, scale=1)
     if file_agences_status:
         self.graphics.set_pen(self.pens['GREEN'])
-        self.graphics.text("OK", 21, 16, scale=1)
+        self.graphics.text("OK", 21, 2 * row, scale=1)
     else:
         self.graphics.set_pen(self.pens['RED'])
-        self.graphics.text("KO", 21, 16, scale=1)
-        
+        self.graphics.text("KO", 21, 2 * row, scale=1)
+
+    # Affichage de la mémoire libre la plus basse observée (Ko)
+    if memory:
+        low = memory.lowest() // 1024
+        self.graphics.set_pen(self.pens['WHITE'])
+        self.graphics.text("MEM", 1, 3 * row, scale=1)
+        self.graphics.set_pen(self.pens['RED' if low < MEMORY_LOW_KB else 'GREEN'])
+        self.graphics.text(str(min(low, 999)), 17, 3 * row, scale=1)
+
+    # Affichage de la durée du démarrage (secondes)
+    if boot and boot.total >= 0:
+        self.graphics.set_pen(self.pens['WHITE'])
+        self.graphics.text("BOOT", 1, 4 * row, scale=1)
+        self.graphics.set_pen(self.pens['GREEN'])
+        self.graphics.text("{:.1f}".format(min(boot.total, 99900) / 1000), 19, 4 * row, scale=1)
+
     # Affichage url bitly
     #self.graphics.set_pen(self.pens['WHITE'])
     #self.graphics.text("https://bit.ly/3AJbpj2", 1, 23, scale=1)
@@ -665,7 +1165,7 @@ def display_info_screen(self, wifi_status, api_key_status, file_agences_status):
 
 
 # Fonction d'affichage de l'écran des légendes
-def display_legend_screen(display):
+async def display_legend_screen(display):
     """
     Affiche les messages en lettres spécifiques avec leur couleur et les LED icônes.
     Les messages sont ajustés pour être alignés avec leurs icônes LED.
@@ -682,7 +1182,7 @@ def display_legend_screen(display):
         # Dessiner les LED icônes
         display.set_pen(legend["color"])
         for x, y in legend["leds"]:
-            display.graphics.pixel(x, y)
+            display.pixel(x, y)
 
         # Dessiner le message en map 4 avec ajustement de position
         draw_word_4(
@@ -697,112 +1197,287 @@ def display_legend_screen(display):
     display.update()
 
       
-# QR CODE de l'adresse Bit.ly "https://bit.ly/3AJbpj2" (https://github.com/adriens/temps-attente-matrix-led)
-led_white_positions = [
-    (4, 4), (5, 4), (6, 4), (7, 4), (8, 4), (9, 4), (10, 4), (12, 4), (13, 4), 
-    (14, 4), (15, 4), (18, 4), (22, 4), (23, 4), (24, 4), (25, 4), (26, 4), (27, 4), 
-    (28, 4), (4, 5), (10, 5), (15, 5), (16, 5), (20, 5), (22, 5), (28, 5), (4, 6), 
-    (6, 6), (7, 6), (8, 6), (10, 6), (13, 6), (15, 6), (17, 6), (18, 6), (20, 6), 
-    (22, 6), (24, 6), (25, 6), (26, 6), (28, 6), (4, 7), (6, 7), (7, 7), (8, 7), 
-    (10, 7), (14, 7), (15, 7), (17, 7), (20, 7), (22, 7), (24, 7), (25, 7), (26, 7), 
-    (28, 7), (4, 8), (6, 8), (7, 8), (8, 8), (10, 8), (14, 8), (15, 8), (16, 8), 
-    (17, 8), (18, 8), (19, 8), (20, 8), (22, 8), (24, 8), (25, 8), (26, 8), (28, 8), 
-    (4, 9), (10, 9), (13, 9), (15, 9), (17, 9), (18, 9), (22, 9), (28, 9), (4, 10), 
-    (5, 10), (6, 10), (7, 10), (8, 10), (9, 10), (10, 10), (12, 10), (14, 10), 
-    (16, 10), (18, 10), (20, 10), (22, 10), (23, 10), (24, 10), (25, 10), (26, 10), 
-    (27, 10), (28, 10), (12, 11), (13, 11), (16, 11), (17, 11), (19, 11), (4, 12), 
-    (5, 12), (7, 12), (8, 12), (10, 12), (13, 12), (16, 12), (17, 12), (18, 12), 
-    (19, 12), (22, 12), (28, 12), (5, 13), (7, 13), (14, 13), (17, 13), (19, 13), 
-    (20, 13), (23, 13), (24, 13), (25, 13), (26, 13), (27, 13), (5, 14), (6, 14), 
-    (8, 14), (10, 14), (11, 14), (13, 14), (16, 14), (18, 14), (19, 14), (20, 14), 
-    (21, 14), (25, 14), (28, 14), (4, 15), (5, 15), (7, 15), (18, 15), (19, 15), 
-    (22, 15), (25, 15), (26, 15), (27, 15), (28, 15), (4, 16), (9, 16), (10, 16), 
-    (12, 16), (13, 16), (14, 16), (17, 16), (20, 16), (22, 16), (23, 16), (28, 16), 
-    (4, 17), (7, 17), (8, 17), (11, 17), (12, 17), (13, 17), (14, 17), (16, 17), 
-    (17, 17), (18, 17), (19, 17), (21, 17), (24, 17), (27, 17), (4, 18), (5, 18), 
-    (7, 18), (8, 18), (9, 18), (10, 18), (11, 18), (13, 18), (18, 18), (19, 18), 
-    (21, 18), (22, 18), (24, 18), (25, 18), (26, 18), (27, 18), (28, 18), (4, 19), 
-    (6, 19), (7, 19), (8, 19), (14, 19), (16, 19), (18, 19), (20, 19), (22, 19), 
-    (23, 19), (25, 19), (26, 19), (28, 19), (4, 20), (10, 20), (11, 20), (12, 20), 
-    (15, 20), (16, 20), (17, 20), (20, 20), (21, 20), (22, 20), (23, 20), (24, 20), 
-    (26, 20), (27, 20), (12, 21), (15, 21), (19, 21), (20, 21), (24, 21), (26, 21), 
-    (27, 21), (4, 22), (5, 22), (6, 22), (7, 22), (8, 22), (9, 22), (10, 22), 
-    (13, 22), (14, 22), (16, 22), (20, 22), (22, 22), (24, 22), (28, 22), (4, 23), 
-    (10, 23), (15, 23), (17, 23), (19, 23), (20, 23), (24, 23), (4, 24), (6, 24), 
-    (7, 24), (8, 24), (10, 24), (12, 24), (13, 24), (14, 24), (15, 24), (17, 24), 
-    (19, 24), (20, 24), (21, 24), (22, 24), (23, 24), (24, 24), (27, 24), (28, 24), 
-    (4, 25), (6, 25), (7, 25), (8, 25), (10, 25), (12, 25), (13, 25), (14, 25), 
-    (16, 25), (17, 25), (18, 25), (20, 25), (22, 25), (27, 25), (28, 25), (4, 26), 
-    (6, 26), (7, 26), (8, 26), (10, 26), (15, 26), (17, 26), (20, 26), (21, 26), 
-    (24, 26), (25, 26), (26, 26), (27, 26), (28, 26), (4, 27), (10, 27), (12, 27), 
-    (13, 27), (15, 27), (16, 27), (17, 27), (23, 27), (24, 27), (26, 27), (27, 27), 
-    (28, 27), (4, 28), (5, 28), (6, 28), (7, 28), (8, 28), (9, 28), (10, 28), (12, 28), 
-    (14, 28), (15, 28), (16, 28), (17, 28), (20, 28), (21, 28), (25, 28), (28, 28)
-    ]
-
-
-# Fonction d'affichage du QR code avec intégration de la luminosité définie dans la classe
-def display_qr_code_screen(self):
+# Code QR de l'écran 4, encodé sur l'appareil au démarrage (adresse QR_URL de information.env)
+QR_URL = "https://bit.ly/3CooYFg"  # Adresse par défaut, celle du code QR d'origine (https://github.com/adriens/temps-attente-matrix-led)
+
+# Versions 1 à 3 (21, 25 et 29 modules : le code tient dans la matrice 32 x 32), un seul bloc Reed-Solomon.
+# Pour chaque niveau de correction : (bits du format, codewords de données par version, codewords de correction par version)
+QR_LEVELS = (
+    (0b00, (16, 28, 44), (10, 16, 26)),  # M : 15 % de correction, préféré tant que l'adresse tient.
+    (0b01, (19, 34, 55), (7, 10, 15)),  # L : 7 % de correction, pour les adresses plus longues.
+)
+QR_MAX_VERSION = 3
+
+
+def qr_tables():
+    """Construit les tables exponentielle et logarithme de GF(256) (polynôme 0x11D)."""
+    exp = bytearray(512)
+    log = bytearray(256)
+    value = 1
+    for i in range(255):
+        exp[i] = value
+        log[value] = i
+        value <<= 1
+        if value & 0x100:
+            value ^= 0x11D
+    for i in range(255, 512):
+        exp[i] = exp[i - 255]  # Évite le modulo 255 dans les multiplications.
+    return exp, log
+
+
+def qr_error_codewords(data, count, exp, log):
+    """Retourne les count codewords de correction Reed-Solomon des données."""
+    generator = bytearray([1])  # Polynôme générateur (x - 2^0)...(x - 2^(count-1)), coefficient dominant en tête.
+    for i in range(count):
+        product = bytearray(len(generator) + 1)
+        for j in range(len(generator)):
+            product[j] ^= generator[j]
+            if generator[j]:
+                product[j + 1] ^= exp[log[generator[j]] + i]
+        generator = product
+    remainder = bytearray(count)
+    for byte in data:
+        factor = byte ^ remainder[0]
+        remainder[:-1] = remainder[1:]
+        remainder[-1] = 0
+        if factor:
+            for j in range(count):
+                if generator[j + 1]:
+                    remainder[j] ^= exp[log[generator[j + 1]] + log[factor]]
+    return remainder
+
+
+def qr_penalty(modules, size):
+    """Pénalité d'un masque (règles de la norme : séries, blocs 2 x 2, motifs de repère, équilibre)."""
+    penalty = 0
+    dark = 0
+    lines = []  # Lignes puis colonnes sous forme d'entiers (bit de poids fort = premier module).
+    for y in range(size):
+        row = 0
+        for x in range(size):
+            row = (row << 1) | modules[y * size + x]
+        lines.append(row)
+    for x in range(size):
+        column = 0
+        for y in range(size):
+            column = (column << 1) | modules[y * size + x]
+        lines.append(column)
+    full = (1 << size) - 1
+    for line in lines:
+        # Règle 1 : séries d'au moins 5 modules identiques.
+        run = 1
+        for i in range(size - 1):
+            if ((line >> i) ^ (line >> (i + 1))) & 1:
+                if run >= 5:
+                    penalty += run - 2
+                run = 1
+            else:
+                run += 1
+        if run >= 5:
+            penalty += run - 2
+        # Règle 3 : motifs 1:1:3:1:1 bordés de 4 modules clairs (la zone de silence compte comme claire).
+        padded = line << 4
+        for shift in range(size - 2):
+            window = (padded >> shift) & 0x7FF
+            if window == 0b10111010000 or window == 0b00001011101:
+                penalty += 40
+    for y in range(size - 1):
+        # Règle 2 : blocs 2 x 2 de même couleur (deux lignes voisines égales sur deux colonnes voisines).
+        same = ~(lines[y] ^ lines[y + 1]) & full
+        pairs = same & (same >> 1) & ~(lines[y] ^ (lines[y] >> 1)) & (full >> 1)
+        penalty += 3 * bin(pairs).count('1')
+        dark += bin(lines[y]).count('1')
+    dark += bin(lines[size - 1]).count('1')
+    # Règle 4 : écart à 50 % de modules foncés, par pas de 5 %.
+    total = size * size
+    penalty += 10 * max(0, (abs(dark * 20 - total * 10) + total - 1) // total - 1)
+    return penalty
+
+
+def qr_mask(mask, x, y):
+    """Vrai si le masque inverse le module (x, y)."""
+    if mask == 0:
+        return (x + y) % 2 == 0
+    if mask == 1:
+        return y % 2 == 0
+    if mask == 2:
+        return x % 3 == 0
+    if mask == 3:
+        return (x + y) % 3 == 0
+    if mask == 4:
+        return (x // 3 + y // 2) % 2 == 0
+    if mask == 5:
+        return x * y % 2 + x * y % 3 == 0
+    if mask == 6:
+        return (x * y % 2 + x * y % 3) % 2 == 0
+    return ((x + y) % 2 + x * y % 3) % 2 == 0
+
+
+def encode_qr(text):
+    """
+    Encode un texte (mode octet) dans le plus petit code QR de version 1 à 3 qui le contient.
+    Retourne (taille, lignes) : lignes est un array('I') d'un masque de bits par ligne
+    (bit de poids fort = colonne de gauche), dessinable avec blit_glyph. Lève ValueError si le texte est trop long.
+    """
+    payload = text.encode()
+    for level, data_counts, error_counts in QR_LEVELS:
+        for version in range(1, QR_MAX_VERSION + 1):
+            if len(payload) + 2 <= data_counts[version - 1]:  # 4 bits de mode, 8 de longueur, fin de 4 bits.
+                break
+        else:
+            continue
+        break
+    else:
+        raise ValueError(f"Adresse trop longue pour un code QR de version {QR_MAX_VERSION} ({len(payload)} octets)")
+    capacity = data_counts[version - 1]
+    size = 17 + 4 * version
+
+    # Données : mode octet (0100), longueur sur 8 bits, octets, fin (0000) puis octets de bourrage.
+    # Tout est décalé d'un quartet : chaque octet prend le quartet bas du précédent et le quartet haut du suivant.
+    data = bytearray(capacity)
+    previous = len(payload)
+    data[0] = 0x40 | (previous >> 4)
+    for i in range(len(payload)):
+        data[i + 1] = ((previous & 0x0F) << 4) | (payload[i] >> 4)
+        previous = payload[i]
+    data[len(payload) + 1] = (previous & 0x0F) << 4  # Dernier quartet suivi des 4 bits de fin.
+    for i in range(len(payload) + 2, capacity):
+        data[i] = 0xEC if (i - len(payload)) % 2 == 0 else 0x11
+    exp, log = qr_tables()
+    codewords = data + qr_error_codewords(data, error_counts[version - 1], exp, log)
+
+    # Motifs fixes : repères, séparateurs, motifs de synchronisation, alignement et module sombre.
+    modules = bytearray(size * size)
+    reserved = bytearray(size * size)  # 1 pour les modules de fonction (ni données, ni masque).
+
+    def put(x, y, dark):
+        modules[y * size + x] = dark
+        reserved[y * size + x] = 1
+
+    for i in range(size):
+        put(6, i, i % 2 == 0)
+        put(i, 6, i % 2 == 0)
+    for cx, cy in ((3, 3), (size - 4, 3), (3, size - 4)):
+        for dy in range(-4, 5):
+            for dx in range(-4, 5):
+                x, y = cx + dx, cy + dy
+                if 0 <= x < size and 0 <= y < size:
+                    distance = max(abs(dx), abs(dy))
+                    put(x, y, distance != 2 and distance != 4)
+    if version > 1:
+        center = size - 7
+        for dy in range(-2, 3):
+            for dx in range(-2, 3):
+                put(center + dx, center + dy, max(abs(dx), abs(dy)) != 1)
+    for i in range(9):  # Zones du format (écrites pour chaque masque).
+        reserved[8 * size + i] = reserved[i * size + 8] = 1
+    for i in range(8):
+        reserved[8 * size + size - 1 - i] = reserved[(size - 1 - i) * size + 8] = 1
+    put(8, size - 8, 1)
+
+    # Données en zigzag par paires de colonnes, de droite à gauche (la colonne 6 est sautée).
+    bit = 0
+    total = len(codewords) * 8
+    right = size - 1
+    while right >= 1:
+        if right == 6:
+            right = 5
+        upward = ((right + 1) & 2) == 0
+        for vert in range(size):
+            y = size - 1 - vert if upward else vert
+            for x in (right, right - 1):
+                if not reserved[y * size + x] and bit < total:
+                    modules[y * size + x] = (codewords[bit >> 3] >> (7 - (bit & 7))) & 1
+                    bit += 1
+        right -= 2
+
+    # Choix du masque de plus faible pénalité.
+    best = None
+    for mask in range(8):
+        candidate = bytearray(modules)
+        for y in range(size):
+            for x in range(size):
+                if not reserved[y * size + x] and qr_mask(mask, x, y):
+                    candidate[y * size + x] ^= 1
+        format_bits = (level << 3) | mask
+        remainder = format_bits
+        for _ in range(10):
+            remainder = (remainder << 1) ^ ((remainder >> 9) * 0x537)
+        format_bits = ((format_bits << 10) | remainder) ^ 0x5412
+        for i in range(15):
+            dark = (format_bits >> i) & 1
+            if i < 6:
+                candidate[i * size + 8] = dark
+            elif i < 8:
+                candidate[(i + 1) * size + 8] = dark
+            else:
+                candidate[8 * size + (7 if i == 8 else 14 - i)] = dark
+            if i < 8:
+                candidate[8 * size + size - 1 - i] = dark
+            else:
+                candidate[(size - 15 + i) * size + 8] = dark
+        score = qr_penalty(candidate, size)
+        if best is None or score < best[0]:
+            best = (score, candidate)
+
+    # Matrice compacte : un entier par ligne.
+    rows = array('I')
+    modules = best[1]
+    for y in range(size):
+        row = 0
+        for x in range(size):
+            row = (row << 1) | modules[y * size + x]
+        rows.append(row)
+    return size, rows
+
+# Fonction d'affichage du QR code (luminosité appliquée par la matrice via cu.set_brightness)
+async def display_qr_code_screen(self):
+    """Dessine une seule fois le code QR encodé au démarrage, avec un seul stylo blanc."""
     self.display_mode = 4
-    self.clear()  # Efface l'écran pour un nouvel affichage
-
-    # Affichage du QR code en tenant compte de la luminosité actuelle
-    led_on_intensity = int(255 * self.brightness)
-    self.graphics.set_pen(self.graphics.create_pen(0, 0, 0))
-    self.graphics.clear()
-
-    for x, y in led_white_positions:
-        self.graphics.set_pen(self.graphics.create_pen(led_on_intensity, led_on_intensity, led_on_intensity))
-        self.graphics.pixel(x, y)
-
-    # Mettre à jour l'affichage pour refléter les changements
+    self.begin_frame()  # Effacement et code QR poussés en un seul flush.
+    self.set_pen('BLACK')
+    self.graphics.clear()  # Le code QR occupe tout l'écran : pas de LEDs d'état.
+
+    if self.qr_code is None:
+        self.qr_code = encode_qr(QR_URL)
+    size, rows = self.qr_code
+    offset = (self.width - size + 1) // 2  # Centré, la zone de silence restante autour.
+    self.set_pen('WHITE')
+    self.frame_pixels += blit_glyph(self.graphics, rows, size, offset, offset)
     self.update()
-
-    # Boucle pour ajuster la luminosité en temps réel
-    while True:
-        self.adjust_brightness()  # Ajuste la luminosité en fonction des boutons de luminosité
-        led_on_intensity = int(255 * self.brightness)
-        for x, y in led_white_positions:
-            self.graphics.set_pen(self.graphics.create_pen(led_on_intensity, led_on_intensity, led_on_intensity))
-            self.graphics.pixel(x, y)
-        self.update()
-        
-        # Interruption de la boucle avec le bouton C
-        if self.cu.is_pressed(CosmicUnicorn.SWITCH_C):
-            print("Bouton C pressé - Quitter l'écran QR code.")
-            self.play_bip(500)  # Émettre un bip de confirmation
-            break  # Sortie de la boucle pour passer à l'écran suivant
-
-        time.sleep(0.1)
+    self.end_frame()
 
 
 # Attente de la pression du bouton pour démarrer le script principal
-def wait_for_start(display, cu):
+async def wait_for_start(display, cu):
     """Affiche l'écran d'accueil et attend la pression du bouton C pour lancer le script principal."""
-    display_welcome_screen(display)  # Affiche le message d'accueil
+    await display_welcome_screen(display)  # Affiche le message d'accueil
     print("Attente de la pression du bouton C pour démarrer...")
 
-    # Boucle pour attendre la pression du bouton C
+    # Attente d'un appui sur C dans la file d'événements des boutons
     while True:
-        if cu.is_pressed(CosmicUnicorn.SWITCH_C):
+        event = display.buttons.pop()
+        if event is None:
+            await display.buttons.wait()
+        elif event[0] == CosmicUnicorn.SWITCH_C and event[1]:
             print("Bouton C pressé - Lancement du script principal.")
-            time.sleep(0.5)  # Petite pause pour éviter les rebonds
             break  # Sortie de la boucle et début du script principal
-        time.sleep(0.1)  # Vérifie le bouton à intervalles réguliers
 
 # Fonction pour supprimer les accents : définit sur é et è
 def normalize_name(text):
     """Remplace manuellement les accents par leurs équivalents non accentués et met le texte en majuscules."""
     accents = {
-        'è': 'e', 'é': 'e',
+        'à': 'a', 'â': 'a', 'ç': 'c', 'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+        'î': 'i', 'ï': 'i', 'ô': 'o', 'ù': 'u', 'û': 'u', 'ü': 'u',
     }
     # Remplacer chaque caractère accentué par son équivalent non accentué
     return ''.join(accents.get(c, c) for c in text).upper()
 
 # Fonction pour arrêter proprement le script.
-def stop_script(display, wifi_issue=False, api_issue=False):
+async def stop_script(display, wifi_issue=False, api_issue=False):
     """Arrête proprement le script et attend un redémarrage via le bouton D."""
     print("Arrêt du script demandé...")
+    display.end_frame()  # Quitte un éventuel mode frame pour que l'écran d'arrêt soit bien affiché
 
     # Sélection du message en fonction de la cause
     if wifi_issue:
@@ -816,17 +1491,19 @@ def stop_script(display, wifi_issue=False, api_issue=False):
     display.set_pen('RED')
     y_offset = 2
     for line in message_lines:
-        draw_word_4(display.graphics, line, 2, y_offset, display.pens['RED'])
+        draw_word_4(display.graphics, line, 2, y_offset, display, 'RED')
         y_offset += 10
 
     display.update()
 
     while True:
-        if display.cu.is_pressed(CosmicUnicorn.SWITCH_D):
+        event = display.buttons.pop()
+        if event is None:
+            display.tones.tick()
+            await asyncio.sleep(0.1)  # Seulement pour les bips en cours : les appuis sont déjà en file
+        elif event[0] == CosmicUnicorn.SWITCH_D and event[1]:
             print("Redémarrage suite à la pression du bouton D.")
-            time.sleep(1)
             machine.reset()
-        time.sleep(0.1)
 
 # Fonction pour charger les informations de connexion WiFi et clé API depuis le fichier "information.env"
 def load_credentials(file_path):
@@ -835,27 +1512,37 @@ def load_credentials(file_path):
     try:
         with open(file_path, "r") as f:  # Ouvre le fichier contenant les informations.
             for line in f:
-                key, value = line.strip().split('=')  # Sépare les lignes par '=' pour extraire les informations.
+                if '=' not in line:
+                    continue  # Ligne vide ou sans valeur.
+                key, value = line.strip().split('=', 1)  # Coupe au premier '=' (une adresse peut en contenir).
                 credentials[key.strip()] = value.strip()  # Stocke les informations dans un dictionnaire.
     except OSError:
         print(f"Erreur : impossible de trouver ou lire le fichier {file_path}")
     return credentials  # Retourne le dictionnaire contenant les informations.
 
 # Fonction pour se connecter au WiFi
-def connect_wifi(ssid, password, display, max_attempts=10):
-    """Tente de se connecter au réseau WiFi avec un maximum de tentatives, avec animation."""
-    wlan = network.WLAN(network.STA_IF)  # Initialise l'interface WiFi en mode station (client)
+WIFI_ATTEMPT_TIMEOUT_MS = 3000  # Durée maximale d'une tentative de connexion.
+WIFI_POLL_MS = 100  # Scrutation de l'état du lien pendant une tentative.
+
+
+def connect_wifi(ssid, password, max_attempts=10, wlan=None):
+    """Tente de se connecter au réseau WiFi avec un maximum de tentatives (appelée depuis le second cœur).
+
+    Chaque tentative scrute l'état du lien et se termine dès qu'il est établi (ou refusé).
+    """
+    if wlan is None:
+        wlan = network.WLAN(network.STA_IF)  # Initialise l'interface WiFi en mode station (client)
     wlan.active(True)  # Active l'interface WiFi
     attempts = 0  # Initialise le compteur de tentatives
 
     while not wlan.isconnected() and attempts < max_attempts:
         print(f"Connexion à {ssid}... Tentative {attempts + 1}/{max_attempts}")
-
-        # Ajout de l'animation de chargement pendant la tentative de connexion
-        loading_animation_step(display, attempts)
-
         wlan.connect(ssid, password)  # Lance la connexion au réseau WiFi avec les informations fournies
-        time.sleep(3)  # Attend 3 secondes entre les tentatives
+        deadline = time.ticks_add(time.ticks_ms(), WIFI_ATTEMPT_TIMEOUT_MS)
+        while not wlan.isconnected() and time.ticks_diff(deadline, time.ticks_ms()) > 0:
+            if wlan.status() < 0:
+                break  # Échec signalé par le pilote (mot de passe, réseau absent) : tentative suivante
+            time.sleep(WIFI_POLL_MS / 1000)
         attempts += 1
 
     if wlan.isconnected():
@@ -865,81 +1552,780 @@ def connect_wifi(ssid, password, display, max_attempts=10):
         print("Échec de la connexion WiFi après plusieurs tentatives.")
         return None  # Retourne None si la connexion échoue
 
-# Fonction pour synchroniser l'heure avec un serveur NTP
-def sync_time():
-    """Synchronise l'heure locale avec un serveur NTP."""
-    ntp_servers = ['time.windows.com', 'ntp1.google.com', 'pool.ntp.org']  # Liste des serveurs NTP à contacter
-    for server in ntp_servers:  # Parcourt chaque serveur NTP
+# Surveillance du lien WiFi (second cœur, qui seul utilise la pile réseau)
+WIFI_CHECK_PERIOD_MS = 5000  # Relevé de l'état du lien quand il est établi.
+WIFI_DOWN_CHECK_PERIOD_MS = 1000  # Relevé de l'état du lien pendant une coupure.
+WIFI_RETRY_MIN_MS = 2000  # Premier délai avant une reconnexion.
+WIFI_RETRY_MAX_MS = 60000  # Délai maximal entre deux reconnexions.
+
+
+# Moniteur de connectivité : seul propriétaire de l'interface WLAN. L'état du lien est relevé à
+# basse fréquence par le second cœur et publié dans `connected`, seul attribut lu par l'affichage ;
+# après une coupure, la reconnexion est relancée en arrière-plan avec un délai qui double à chaque échec.
+class ConnectivityMonitor:
+    def __init__(self, ssid, password):
+        self.ssid = ssid
+        self.password = password
+        self.wlan = network.WLAN(network.STA_IF)  # Unique objet WLAN du programme.
+        self.connected = False  # Dernier état relevé.
+        self.seen = False  # Vrai dès la première connexion (faite au démarrage par le second cœur).
+        self.retry_delay = WIFI_RETRY_MIN_MS
+        self.next_retry = time.ticks_ms()
+        self.lost_at = time.ticks_ms()  # Début de la coupure en cours.
+        self.reconnects = 0  # Tentatives de reconnexion depuis la dernière coupure.
+        self.next_sample = time.ticks_ms()  # Instant du prochain relevé par poll().
+
+    def poll(self):
+        """Relève le lien si le délai de period() est écoulé. Retourne True si l'état a changé."""
+        if time.ticks_diff(time.ticks_ms(), self.next_sample) < 0:
+            return False
+        changed = self.sample()
+        self.next_sample = time.ticks_add(time.ticks_ms(), self.period())
+        return changed
+
+    def sample(self):
+        """Relève l'état du lien, relance la reconnexion si besoin et retourne True si l'état a changé (second cœur uniquement)."""
+        connected = self.wlan.isconnected()
+        now = time.ticks_ms()
+        changed = connected != self.connected
+        if changed:
+            self.connected = connected
+            if connected:
+                if self.seen:
+                    print(f"WIFI OK ({time.ticks_diff(now, self.lost_at) // 1000} s de coupure, {self.reconnects} reconnexions)")
+                else:
+                    print("WIFI OK")
+                self.seen = True
+                self.retry_delay = WIFI_RETRY_MIN_MS
+                self.reconnects = 0
+            else:
+                print("WIFI KO")
+                self.lost_at = now
+                self.next_retry = time.ticks_add(now, self.retry_delay)
+        elif not connected and self.seen and time.ticks_diff(now, self.next_retry) >= 0:
+            # Reconnexion non bloquante : connect() rend la main tout de suite, le lien est relevé plus tard
+            self.reconnects += 1
+            print(f"Reconnexion WiFi à {self.ssid} (tentative {self.reconnects}, prochaine dans {self.retry_delay // 1000} s)")
+            try:
+                self.wlan.connect(self.ssid, self.password)
+            except OSError as e:
+                print(f"Erreur de reconnexion WiFi : {e}")
+            self.next_retry = time.ticks_add(now, self.retry_delay)
+            self.retry_delay = min(self.retry_delay * 2, WIFI_RETRY_MAX_MS)
+        return changed
+
+    def period(self):
+        """Délai avant le prochain relevé : plus court pendant une coupure."""
+        return WIFI_CHECK_PERIOD_MS if self.connected else WIFI_DOWN_CHECK_PERIOD_MS
+
+
+# Paramètres de la synchronisation NTP
+NTP_SERVERS = ('time.windows.com', 'ntp1.google.com', 'pool.ntp.org')  # Serveurs interrogés en même temps.
+NTP_PORT = 123  # Port UDP des serveurs NTP.
+NTP_DELTA = 3155673600 if time.gmtime(0)[0] == 2000 else 2208988800  # Secondes entre 1900 (origine NTP) et l'origine de time.time().
+NTP_TIMEOUT_MS = 500  # Attente maximale des réponses d'une synchronisation, tous serveurs confondus.
+NTP_POLL_MS = 5  # Intervalle de relève des sockets non bloquants.
+NTP_RETRY_INTERVAL = 300  # Secondes avant un nouvel essai après une synchronisation ratée.
+NTP_MIN_INTERVAL = 900  # Secondes : seconde synchronisation (première mesure de la dérive) et intervalle minimal.
+NTP_MAX_INTERVAL = 86400  # Secondes : intervalle maximal entre deux synchronisations.
+NTP_MAX_ERROR_MS = 250  # Écart toléré avant resynchronisation : fixe l'intervalle d'après la dérive restante.
+NTP_MIN_SPAN_MS = 600000  # Durée minimale entre deux synchronisations pour mesurer la dérive.
+NTP_STEP_MS = 5000  # Au-delà, l'écart est un saut d'heure et n'entre pas dans la mesure de la dérive.
+NTP_MAX_DRIFT_PPM = 500  # Correction de dérive maximale (ppm).
+NTP_REBASE_MS = 3600000  # Le point de référence est avancé toutes les heures (ticks_ms reboucle tous les 12 jours).
+UTC_OFFSET = 11 * 3600  # Décalage de l'heure locale (Nouméa, UTC+11).
+
+
+def parse_ntp_reply(data, round_trip):
+    """Décode une réponse SNTP reçue après round_trip ms.
+
+    Retourne (secondes, millisecondes) UTC à la réception et l'aller-retour réseau en ms, ou None si la réponse est invalide.
+    """
+    if len(data) < 48 or data[0] & 7 != 4 or data[1] == 0:
+        return None  # Pas une réponse de serveur, ou refus du serveur (strate 0)
+    server_in, server_in_fraction, server_out, server_out_fraction = struct.unpack_from("!IIII", data, 32)
+    if server_out == 0:
+        return None
+    in_ms = (server_in_fraction >> 22) * 1000 >> 10  # Fraction de seconde (32 bits) en millisecondes
+    out_ms = (server_out_fraction >> 22) * 1000 >> 10
+    processing = (server_out - server_in) * 1000 + out_ms - in_ms  # Temps passé sur le serveur
+    rtt = max(0, round_trip - processing)
+    millis = out_ms + rtt // 2  # La réponse a voyagé pendant la moitié de l'aller-retour
+    return server_out - NTP_DELTA + millis // 1000, millis % 1000, rtt
+
+
+# Horloge synchronisée par NTP : l'heure est lue sur ticks_ms à partir d'un point de référence
+# (instant ticks_ms, heure UTC), corrigée de la dérive de l'oscillateur mesurée entre deux synchronisations.
+class NtpClock:
+    def __init__(self, servers=NTP_SERVERS):
+        self.servers = servers
+        self.addresses = {}  # Adresse résolue de chaque serveur (une seule résolution DNS).
+        self.lock = _thread.allocate_lock()  # Protège le remplacement du point de référence (lu sans verrou).
+        self.reference = self.anchor(time.ticks_ms(), time.time(), 0, 0)  # Heure du RTC jusqu'à la première synchronisation.
+        self.correction = 0  # Correction de la dérive de ticks_ms (ppm, négative si l'oscillateur avance).
+        self.synced = False  # Vrai après la première synchronisation réussie.
+        self.next_sync = time.ticks_ms()  # Instant de la prochaine synchronisation.
+
+    def anchor(self, ticks, seconds, millis, since_sync):
+        """Point de référence : (ticks, secondes UTC, ms, secondes depuis minuit en heure locale, ms depuis la synchronisation)."""
+        return (ticks, seconds, millis, (seconds + UTC_OFFSET) % 86400, since_sync)
+
+    def corrected(self, elapsed):
+        """Corrige de la dérive mesurée une durée (ms) comptée par ticks_ms."""
+        return elapsed + elapsed // 1000 * self.correction // 1000
+
+    def at(self, ticks):
+        """Retourne (secondes UTC, ms) à l'instant ticks, et les ms écoulées depuis la dernière synchronisation."""
+        reference_ticks, seconds, millis, _, since_sync = self.reference
+        elapsed = time.ticks_diff(ticks, reference_ticks)
+        millis += self.corrected(elapsed)
+        return seconds + millis // 1000, millis % 1000, since_sync + elapsed
+
+    def daytime(self):
+        """Secondes écoulées depuis minuit en heure locale (calcul sur entiers courts, sans localtime)."""
+        ticks, _, millis, day, _ = self.reference  # Une seule lecture : le tuple est remplacé d'un bloc
+        elapsed = millis + self.corrected(time.ticks_diff(time.ticks_ms(), ticks))
+        return (day + elapsed // 1000) % 86400
+
+    def rebase(self):
+        """Avance le point de référence avant que l'écart de ticks_ms ne déborde (appelée régulièrement)."""
+        ticks = time.ticks_ms()
+        if time.ticks_diff(ticks, self.reference[0]) < NTP_REBASE_MS:
+            return
+        with self.lock:
+            seconds, millis, since_sync = self.at(ticks)
+            self.reference = self.anchor(ticks, seconds, millis, since_sync)
+
+    def due(self):
+        """Retourne True quand la prochaine synchronisation est échue."""
+        return time.ticks_diff(time.ticks_ms(), self.next_sync) >= 0
+
+    def query(self):
+        """Envoie une requête SNTP à chaque serveur puis relève les réponses pendant NTP_TIMEOUT_MS au plus.
+
+        Retourne (serveur, secondes, ms, ticks de réception, aller-retour) de la réponse au plus court aller-retour, ou None.
+        """
+        for host in self.servers:
+            if host not in self.addresses:
+                try:
+                    self.addresses[host] = socket.getaddrinfo(host, NTP_PORT)[0][-1]
+                except OSError as e:
+                    print(f"Erreur de résolution du serveur NTP {host}: {e}")
+
+        # Résolutions faites avant les envois : elles ne faussent pas les allers-retours mesurés
+        request = bytearray(48)
+        request[0] = 0x1B  # Version 3, mode client
+        pending = []  # (serveur, socket, instant d'envoi) des requêtes sans réponse
+        for host in self.servers:
+            address = self.addresses.get(host)
+            if address is None:
+                continue
+            sock = None
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.setblocking(False)  # Les réponses sont relevées ensemble, sans attente par serveur
+                sent = time.ticks_ms()
+                sock.sendto(request, address)
+                pending.append((host, sock, sent))
+            except OSError as e:
+                print(f"Erreur de synchronisation NTP avec {host}: {e}")
+                self.addresses.pop(host, None)  # Nouvelle résolution au prochain essai
+                if sock:
+                    sock.close()
+
+        best = None
+        deadline = time.ticks_add(time.ticks_ms(), NTP_TIMEOUT_MS)
+        while pending and time.ticks_diff(deadline, time.ticks_ms()) > 0:
+            for entry in pending[:]:
+                host, sock, sent = entry
+                try:
+                    data = sock.recv(48)
+                except OSError:
+                    continue  # Pas encore de réponse
+                received = time.ticks_ms()
+                pending.remove(entry)
+                sock.close()
+                answer = parse_ntp_reply(data, time.ticks_diff(received, sent))
+                if answer is None:
+                    print(f"Réponse NTP invalide de {host}")
+                elif best is None or answer[2] < best[4]:
+                    best = (host, answer[0], answer[1], received, answer[2])
+            time.sleep_ms(NTP_POLL_MS)
+        for host, sock, _ in pending:
+            sock.close()
+            print(f"Pas de réponse NTP de {host} en {NTP_TIMEOUT_MS} ms")
+        return best
+
+    def sync(self):
+        """Recale l'horloge sur la meilleure réponse NTP, mesure la dérive et planifie la synchronisation suivante.
+
+        Retourne True si la synchronisation a réussi.
+        """
+        answer = self.query()
+        if answer is None:
+            print("Échec de la synchronisation NTP.")
+            self.next_sync = time.ticks_add(time.ticks_ms(), NTP_RETRY_INTERVAL * 1000)
+            return False
+        host, seconds, millis, ticks, rtt = answer
+        interval = NTP_MIN_INTERVAL
+        details = ""
+        with self.lock:
+            if self.synced:
+                predicted, predicted_ms, span = self.at(ticks)
+                if abs(seconds - predicted) <= NTP_STEP_MS // 1000:
+                    error = (seconds - predicted) * 1000 + millis - predicted_ms  # Écart de l'horloge corrigée (ms)
+                    details = f", écart {error} ms"
+                    if abs(error) <= NTP_STEP_MS and span >= NTP_MIN_SPAN_MS:
+                        residual = error * 1000 // (span // 1000)  # Dérive restante après correction (ppm)
+                        self.correction = max(-NTP_MAX_DRIFT_PPM, min(NTP_MAX_DRIFT_PPM, self.correction + residual))
+                        # L'écart toléré est atteint après NTP_MAX_ERROR_MS / dérive restante
+                        interval = NTP_MAX_ERROR_MS * 1000 // abs(residual) if residual else NTP_MAX_INTERVAL
+                        interval = max(NTP_MIN_INTERVAL, min(NTP_MAX_INTERVAL, interval))
+                        details += f", correction {self.correction} ppm"
+            self.reference = self.anchor(ticks, seconds, millis, 0)
+            self.synced = True
+        self.next_sync = time.ticks_add(ticks, interval * 1000)
+        t = time.gmtime(seconds)
+        machine.RTC().datetime((t[0], t[1], t[2], t[6] + 1, t[3], t[4], t[5], 0))  # time.time() suit l'heure NTP
+        print(f"Heure synchronisée via NTP avec {host} (aller-retour {rtt} ms{details}, prochaine dans {interval // 60} min)")
+        return True
+
+
+# Paramètres de l'API OPT
+API_HOST = "api.opt.nc"  # Hôte de l'API des temps d'attente.
+API_PORT = 443  # Port HTTPS.
+API_PATH = "/temps-attente-agences/agences"  # Chemin commun des endpoints agences.
+HTTP_CHUNK_SIZE = 512  # Taille des blocs lus sur le socket pour les réponses traitées en flux.
+CACHE_TTL = 30  # Âge minimal (secondes) avant de redemander une agence, modifiable par CACHE_TTL_S dans information.env.
+
+
+# Réponse HTTP minimale, compatible avec l'usage fait des réponses urequests.
+class HttpResponse:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code  # Code de statut HTTP.
+        self.headers = headers  # En-têtes, clés en minuscules.
+        self.content = content  # Corps brut (bytes).
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+# Client HTTP/1.1 avec une connexion TLS persistante vers un seul hôte.
+class HttpClient:
+    def __init__(self, host, api_key, port=API_PORT, timeout=10):
+        """Prépare le client : en-têtes construits une seule fois, adresse et socket mis en cache."""
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.timeout = timeout
+        self.address = None  # Résultat de getaddrinfo mis en cache.
+        self.raw = None  # Socket TCP sous-jacent (pour le timeout).
+        self.sock = None  # Flux TLS persistant.
+        self.headers = ("Host: %s\r\nx-apikey: %s\r\nAccept: application/json\r\nConnection: keep-alive\r\n\r\n" % (host, api_key)).encode()
+        self.handshakes = 0  # Nombre de connexions TLS ouvertes.
+        self.requests = 0  # Nombre total de requêtes envoyées.
+        self.connection_requests = 0  # Requêtes envoyées sur la connexion courante.
+        self.max_connection_requests = 0  # Plus grand nombre de requêtes servies par une même connexion.
+        self.dns_lookups = 0  # Résolutions DNS effectuées.
+        self.buffer = bytearray(HTTP_CHUNK_SIZE)  # Tampon de lecture réutilisé pour les réponses en flux.
+        self.view = memoryview(self.buffer)
+
+    def connect(self):
+        """Ouvre la connexion TLS (résolution DNS seulement si l'adresse n'est pas en cache)."""
+        if self.address is None:
+            self.address = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0][-1]
+            self.dns_lookups += 1
+        raw = socket.socket()
+        raw.settimeout(self.timeout)
         try:
-            ntptime.host = server  # Définit le serveur NTP à contacter
-            ntptime.settime()  # Tente de synchroniser l'heure
-            print(f"Heure synchronisée via NTP avec {server}")  # Affiche un message si la synchronisation réussit
-            return True  # Retourne True si la synchronisation est réussie
-        except OSError as e:
-            print(f"Erreur de synchronisation NTP avec {server}: {e}")  # Affiche une erreur si la synchronisation échoue
-    print("Échec de la synchronisation NTP.")  # Affiche un message si aucun serveur NTP n'a pu être contacté
-    return False  # Retourne False si la synchronisation échoue
+            raw.connect(self.address)
+            self.sock = ssl.wrap_socket(raw, server_hostname=self.host)
+        except OSError:
+            raw.close()
+            self.address = None  # L'adresse sera résolue de nouveau à la prochaine tentative.
+            raise
+        self.raw = raw
+        self.handshakes += 1
+        self.connection_requests = 0
+
+    def close(self):
+        """Ferme la connexion courante."""
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+        self.raw = None
+
+    def read_exactly(self, size):
+        """Lit exactement size octets du flux TLS."""
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.read(size - len(data))
+            if not chunk:
+                raise OSError("connexion fermée par le serveur")
+            data += chunk
+        return data
+
+    def stream_exactly(self, size, sink):
+        """Transmet size octets du flux TLS à sink.feed() par blocs de HTTP_CHUNK_SIZE octets au plus."""
+        while size > 0:
+            count = self.sock.readinto(self.buffer, min(size, HTTP_CHUNK_SIZE))
+            if not count:
+                raise OSError("connexion fermée par le serveur")
+            sink.feed(self.view[:count])
+            size -= count
+
+    def read_response(self, sink=None):
+        """Lit la ligne de statut, les en-têtes et le corps (Content-Length ou chunked).
+
+        Si sink est fourni et que le statut est 200, le corps est transmis bloc par bloc à
+        sink.feed() au lieu d'être gardé en mémoire.
+        """
+        line = self.sock.readline()
+        if not line:
+            raise OSError("connexion fermée par le serveur")
+        status_code = int(line.split(None, 2)[1])
+        headers = {}
+        while True:
+            line = self.sock.readline()
+            if not line or line == b"\r\n":
+                break
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if status_code != 200:
+            sink = None  # Les réponses d'erreur sont courtes : elles sont gardées pour les messages.
+        body = b""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.sock.readline().split(b";")[0], 16)
+                if size == 0:
+                    while self.sock.readline() not in (b"", b"\r\n"):
+                        pass  # En-têtes de fin ignorés.
+                    break
+                if sink:
+                    self.stream_exactly(size, sink)
+                else:
+                    body += self.read_exactly(size)
+                self.sock.readline()  # CRLF de fin de bloc.
+        elif sink:
+            self.stream_exactly(int(headers.get("content-length", 0)), sink)
+        else:
+            body = self.read_exactly(int(headers.get("content-length", 0)))
+        return HttpResponse(status_code, headers, body)
+
+    def get(self, path, timeout=None, sink=None, headers=b""):
+        """Envoie un GET sur la connexion persistante, avec une reconnexion si le serveur l'a fermée.
+
+        Avec sink, le corps d'une réponse 200 est passé en flux à sink.feed() (voir read_response).
+        headers contient des lignes d'en-tête supplémentaires déjà terminées par CRLF.
+        """
+        for attempt in range(2):
+            reused = self.sock is not None
+            try:
+                if self.sock is None:
+                    self.connect()
+                self.raw.settimeout(timeout or self.timeout)
+                self.sock.write(b"GET " + path.encode() + b" HTTP/1.1\r\n" + headers + self.headers)
+                response = self.read_response(sink)
+            except OSError:
+                self.close()
+                if reused and attempt == 0:
+                    continue  # Connexion inactive fermée par le serveur : on la rouvre une fois.
+                raise
+            self.requests += 1
+            self.connection_requests += 1
+            if self.connection_requests > self.max_connection_requests:
+                self.max_connection_requests = self.connection_requests
+            if response.headers.get("connection", "").lower() == "close":
+                self.close()
+            memory.sample(MEMORY_FETCH)
+            return response
+
+    def stats(self):
+        """Retourne un résumé des compteurs de connexion."""
+        per_connection = self.requests / self.handshakes if self.handshakes else 0
+        return f"{self.requests} requêtes, {self.handshakes} handshakes, {per_connection:.1f} req/connexion, {self.dns_lookups} DNS"
+
+
+# Analyseur JSON incrémental de la liste des agences (/agences/iot).
+# Il lit la réponse bloc par bloc et ne garde que la clé ou la valeur en cours : la mémoire
+# utilisée ne dépend pas de la taille de la réponse ni des champs inutilisés.
+class AgencyListParser:
+    MAX_TOKEN = 96  # Longueur maximale (octets) d'une clé ou d'une valeur capturée.
+    WANTED_KEYS = (b"idAgence", b"designation", b"realMaxWaitingTimeMs")
+    WAIT_KEYS = (b"idAgence", b"realMaxWaitingTimeMs")  # Rafraîchissement des temps seuls : aucun nom décodé.
+    ESCAPES = {0x6E: 0x0A, 0x74: 0x09, 0x72: 0x0D, 0x62: 0x08, 0x66: 0x0C}  # \n \t \r \b \f
+
+    def __init__(self, on_agency, names=True):
+        """on_agency(id, nom, temps d'attente ou None) est appelé à la fin de chaque objet agence (nom None si names est faux)."""
+        self.on_agency = on_agency
+        self.wanted = self.WANTED_KEYS if names else self.WAIT_KEYS
+        self.depth = 0  # Profondeur d'imbrication : 1 = tableau des agences, 2 = objet agence.
+        self.in_string = False
+        self.in_scalar = False  # Nombre, true, false ou null en cours de lecture.
+        self.escape = 0  # 0 : aucun, 1 : après '\', 2 à 5 : chiffres hexadécimaux d'un \uXXXX.
+        self.code = 0  # Point de code d'un \uXXXX en cours.
+        self.expect_key = False  # Vrai si la prochaine chaîne de l'objet agence est une clé.
+        self.key = None  # Clé intéressante en cours (ou None).
+        self.capture = False  # Vrai si la chaîne ou la valeur en cours doit être gardée.
+        self.token = bytearray(self.MAX_TOKEN)  # Tampon fixe de la clé ou valeur capturée.
+        self.length = 0
+        self.count = 0  # Nombre d'agences émises.
+        self.reset_agency()
+
+    def reset_agency(self):
+        self.agency_id = None
+        self.name = None
+        self.waiting_time = None
+
+    def append(self, byte):
+        if self.length < self.MAX_TOKEN:
+            self.token[self.length] = byte
+            self.length += 1
+
+    def value(self):
+        length = self.length
+        if length == self.MAX_TOKEN:
+            # Valeur tronquée : retirer un éventuel caractère UTF-8 coupé en fin de tampon.
+            end = length
+            while end > 0 and self.token[end - 1] & 0xC0 == 0x80:
+                end -= 1
+            if end > 0 and self.token[end - 1] >= 0xC0:
+                lead = self.token[end - 1]
+                size = 4 if lead >= 0xF0 else 3 if lead >= 0xE0 else 2
+                if length - end + 1 < size:
+                    length = end - 1
+        return bytes(self.token[:length])
+
+    def end_string(self):
+        if self.depth != 2:
+            return
+        if self.expect_key:
+            value = self.value()
+            self.key = value if value in self.wanted else None
+        elif self.key == b"designation":
+            self.name = self.value().decode()
+
+    def end_scalar(self):
+        if self.depth != 2 or self.key is None:
+            return
+        try:
+            number = int(self.value())
+        except ValueError:
+            return  # null, booléen ou nombre décimal : ignoré.
+        if self.key == b"idAgence":
+            self.agency_id = number
+        elif self.key == b"realMaxWaitingTimeMs":
+            self.waiting_time = number
+
+    def feed(self, chunk):
+        """Analyse un bloc d'octets de la réponse."""
+        for c in chunk:
+            if self.in_string:
+                if self.escape == 1:
+                    if c == 0x75:  # \uXXXX
+                        self.escape = 2
+                        self.code = 0
+                        continue
+                    self.escape = 0
+                    if self.capture:
+                        self.append(self.ESCAPES.get(c, c))
+                elif self.escape:
+                    self.code = self.code * 16 + int(chr(c), 16)
+                    self.escape += 1
+                    if self.escape == 6:
+                        self.escape = 0
+                        if self.capture:
+                            for byte in chr(self.code).encode():
+                                self.append(byte)
+                elif c == 0x5C:  # '\'
+                    self.escape = 1
+                elif c == 0x22:  # '"'
+                    self.in_string = False
+                    if self.capture:
+                        self.end_string()
+                elif self.capture:
+                    self.append(c)
+                continue
+
+            if self.in_scalar:
+                if c not in b",}] \t\r\n":
+                    if self.capture:
+                        self.append(c)
+                    continue
+                self.in_scalar = False
+                if self.capture:
+                    self.end_scalar()
+
+            if c == 0x22:  # Début de chaîne
+                self.in_string = True
+                self.capture = self.depth == 2 and (self.expect_key or self.key is not None)
+                self.length = 0
+            elif c == 0x7B or c == 0x5B:  # '{' ou '['
+                self.depth += 1
+                if self.depth == 2:
+                    self.reset_agency()
+                    self.expect_key = True
+            elif c == 0x7D or c == 0x5D:  # '}' ou ']'
+                if self.depth == 2 and c == 0x7D:
+                    self.count += 1
+                    self.on_agency(self.agency_id, self.name, self.waiting_time)
+                self.depth -= 1
+            elif c == 0x3A:  # ':'
+                if self.depth == 2:
+                    self.expect_key = False
+            elif c == 0x2C:  # ','
+                if self.depth == 2:
+                    self.expect_key = True
+                    self.key = None
+            elif c not in b" \t\r\n":
+                self.in_scalar = True
+                self.capture = self.depth == 2 and not self.expect_key and self.key is not None
+                self.length = 0
+                if self.capture:
+                    self.append(c)
+
+
+# Table des agences en tableaux compacts : IDs (H), temps d'attente et instants de mise à jour (I),
+# noms normalisés concaténés dans un seul objet bytes avec leurs décalages (H). Une agence coûte
+# quelques octets fixes, sans liste, entier ou chaîne par ligne sur le tas.
+NAME_MAX_BYTES = 255  # Longueur maximale d'un nom en UTF-8 (stockée sur un octet dans l'instantané).
+
+def wait_value(waiting_time):
+    """Retourne le temps d'attente (ms) borné aux entiers de 32 bits positifs, ou None si ce n'est pas un nombre."""
+    if isinstance(waiting_time, bool) or not isinstance(waiting_time, (int, float)):
+        return None  # null, texte ou booléen renvoyé par l'API.
+    return min(max(int(waiting_time), 0), 0xFFFFFFFF)
+
+def encode_name(name):
+    """Normalise et encode un nom en UTF-8, tronqué à NAME_MAX_BYTES sans couper de caractère."""
+    encoded = normalize_name(name).encode()
+    if len(encoded) <= NAME_MAX_BYTES:
+        return encoded
+    end = NAME_MAX_BYTES
+    while end > 0 and encoded[end] & 0xC0 == 0x80:
+        end -= 1  # L'octet suivant la coupure continue un caractère : on coupe avant ce caractère.
+    return encoded[:end]
+
+class AgencyStore:
+    def __init__(self):
+        self.ids = array('H')  # ID de chaque agence.
+        self.waits = array('I')  # Temps d'attente (ms).
+        self.fetched = array('I')  # Instant (ticks_ms) de la dernière mise à jour du temps d'attente.
+        self.names = b""  # Noms normalisés, concaténés.
+        self.offsets = array('H', [0])  # Le nom de l'agence i est names[offsets[i]:offsets[i + 1]].
+        self.building = None  # Noms en cours d'ajout (bytearray), figés par freeze().
+
+    def append(self, agency_id, name, waiting_time, fetched=None):
+        """Ajoute une agence pendant la construction de la table (fetched : instant du relevé, maintenant par défaut)."""
+        if not 0 < agency_id <= 0xFFFF:
+            print(f"Erreur : ID d'agence invalide ({agency_id}).")
+            return
+        if self.building is None:
+            self.building = bytearray(self.names)
+        self.building.extend(encode_name(name))
+        self.ids.append(agency_id)
+        self.waits.append(wait_value(waiting_time) or 0)  # Temps absent ou invalide : 0.
+        self.fetched.append(time.ticks_ms() if fetched is None else fetched)
+        self.offsets.append(len(self.building))
+
+    def freeze(self):
+        """Termine la construction : les noms deviennent un seul objet bytes. Retourne la table."""
+        if self.building is not None:
+            self.names = bytes(self.building)
+            self.building = None
+        return self
+
+    def copy(self):
+        """Retourne une table de travail : IDs et noms partagés (figés), temps et instants copiés."""
+        other = AgencyStore()
+        other.ids = self.ids
+        other.names = self.names
+        other.offsets = self.offsets
+        other.waits = array('I', self.waits)
+        other.fetched = array('I', self.fetched)
+        return other
+
+    def count(self):
+        """Retourne le nombre d'agences."""
+        return len(self.ids)
+
+    def find(self, agency_id):
+        """Retourne l'index de l'agence d'ID donné, ou -1."""
+        ids = self.ids
+        for index in range(len(ids)):
+            if ids[index] == agency_id:
+                return index
+        return -1
+
+    def agency_id(self, index):
+        return self.ids[index]
+
+    def name(self, index):
+        """Retourne le nom de l'agence (chaîne créée à chaque appel : à réserver aux changements d'agence)."""
+        return self.names[self.offsets[index]:self.offsets[index + 1]].decode()
+
+    def wait(self, index):
+        return self.waits[index]
+
+    def set_wait(self, index, waiting_time, fetched=None):
+        """Enregistre un temps d'attente et l'instant de sa réception."""
+        self.waits[index] = wait_value(waiting_time) or 0
+        self.fetched[index] = time.ticks_ms() if fetched is None else fetched
+
+    def sync_from(self, other, index=-1):
+        """Recopie les temps d'une autre table de même liste (une agence, ou toutes si index < 0)."""
+        indexes = range(self.count()) if index < 0 else (index,)
+        for i in indexes:
+            self.waits[i] = other.waits[i]
+            self.fetched[i] = other.fetched[i]
+
+    def age(self, index):
+        """Âge en secondes du temps d'attente de l'agence."""
+        return time.ticks_diff(time.ticks_ms(), self.fetched[index]) // 1000
 
 
 # Fonction pour charger les agences depuis l'API
-def load_agencies_from_api(api_key):
+def load_agencies_from_api(client, wait_times=None):
     """
     Charge les agences avec ID et Nom depuis le premier endpoint.
-    Retourne un tableau structuré [ID, Nom, Temps d'attente initialisé à 0].
+    Retourne une AgencyStore, ou None en cas d'échec ou de liste vide.
+    Si la liste contient 'realMaxWaitingTimeMs', le temps est repris (sinon initialisé à 0)
+    et, si un dictionnaire wait_times est fourni, il est rempli avec {ID: temps d'attente}.
     """
-    url = "https://api.opt.nc/temps-attente-agences/agences/iot"
-    headers = {"x-apikey": api_key, "Accept": "application/json"}
-    agencies = []
+    agencies = AgencyStore()
+
+    def on_agency(agency_id, agency_name, waiting_time):
+        if agency_id and agency_name:
+            if waiting_time is None:
+                waiting_time = 0  # Temps initialisé à 0, à compléter par l'endpoint de l'agence
+            elif wait_times is not None:
+                wait_times[agency_id] = waiting_time
+            agencies.append(agency_id, agency_name, waiting_time)
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        gc.collect()  # Libérer la mémoire après la requête
+        # La réponse est analysée en flux : seuls l'ID, le nom et le temps d'attente sont gardés.
+        response = client.get(API_PATH + "/iot", timeout=10, sink=AgencyListParser(on_agency))
 
         if response.status_code == 200:
-            data = response.json()
-            for agency in data:
-                agency_id = agency.get("idAgence")
-                agency_name = agency.get("designation")
-                if agency_id and agency_name:
-                    agencies.append([agency_id, agency_name, 0])  # Temps initialisé à 0
-            print("Agences chargées :", agencies)
-            return agencies
+            print(f"Agences chargées : {agencies.count()}")
+            return agencies.freeze() if agencies.count() else None
         else:
             print(f"Erreur API : {response.status_code} - {response.text}")
     except Exception as e:
         print(f"Erreur lors de la récupération des agences : {e}")
-    return []
+    return None
+
+def load_wait_times_from_api(client, agencies, received):
+    """
+    Relit la liste (/agences/iot) en n'écrivant que les temps d'attente, directement dans la table fournie.
+    received (bytearray, une case par agence) est mis à 1 pour chaque agence dont le temps est fourni.
+    Retourne True si la liste contient les mêmes agences que la table, False si elle a changé, None en cas d'échec.
+    """
+    seen = 0  # Agences de la réponse présentes dans la table.
+    unknown = False  # Vrai si la réponse contient une agence absente de la table.
+
+    def on_agency(agency_id, agency_name, waiting_time):
+        nonlocal seen, unknown
+        if not agency_id:
+            return
+        index = agencies.find(agency_id)
+        if index < 0:
+            unknown = True
+            return
+        seen += 1
+        if waiting_time is not None:
+            agencies.set_wait(index, waiting_time)
+            received[index] = 1
+
+    try:
+        response = client.get(API_PATH + "/iot", timeout=10, sink=AgencyListParser(on_agency, names=False))
+        if response.status_code == 200:
+            return not unknown and seen == agencies.count()
+        print(f"Erreur API : {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"Erreur lors de la récupération des temps d'attente : {e}")
+    return None
 
 # Fonction pour Initialise les temps d'attente pour les deux premières agences dans la liste
-def initialize_agency_wait_times(api_key, agencies):
+def initialize_agency_wait_times(client, agencies):
     """Initialise les temps d'attente pour toutes les agences."""
-    for agency in agencies:
-        if not update_single_agency(api_key, agency):
-            print(f"Erreur : Échec de l'initialisation pour l'agence {agency[1]}")
+    for index in range(agencies.count()):
+        if not update_single_agency(client, agencies, index):
+            print(f"Erreur : Échec de l'initialisation pour l'agence {agencies.name(index)}")
 
 # Fonction pour mettre à jour une seule agence avant l'affichage
-def update_single_agency(api_key, agency):
-    """Met à jour les données d'une agence spécifique en appelant l'API."""
-    agence_id, name, old_waiting_time = agency
-    url = f"https://api.opt.nc/temps-attente-agences/agences/{agence_id}"  # URL correcte
-    headers = {"x-apikey": api_key, "Accept": "application/json"}
+# Validateurs des agences : chaque appel par agence est revalidé avec If-None-Match / If-Modified-Since.
+# La fraîcheur (CACHE_TTL) est décidée par le RefreshScheduler, qui ne redemande pas une agence trop récente.
+class AgencyCache:
+    def __init__(self):
+        self.entries = {}  # ID d'agence -> (ETag, Last-Modified).
+        self.misses = 0  # Réponses 200 complètes.
+        self.not_modified = 0  # Réponses 304 (valeur inchangée, corps non transféré).
+
+    def conditional_headers(self, agency_id):
+        """Construit les en-têtes de revalidation à partir des validateurs connus."""
+        entry = self.entries.get(agency_id)
+        if entry is None:
+            return b""
+        headers = b""
+        if entry[0]:
+            headers += b"If-None-Match: " + entry[0].encode() + b"\r\n"
+        if entry[1]:
+            headers += b"If-Modified-Since: " + entry[1].encode() + b"\r\n"
+        return headers
+
+    def store(self, agency_id, headers):
+        """Enregistre les validateurs d'une réponse 200."""
+        self.misses += 1
+        self.entries[agency_id] = (headers.get("etag"), headers.get("last-modified"))
+
+    def revalidated(self, agency_id):
+        """Enregistre une réponse 304 : la valeur connue est confirmée."""
+        self.not_modified += 1
+
+    def stats(self):
+        """Retourne un résumé des compteurs du cache."""
+        return f"{self.misses} miss, {self.not_modified} non modifiées"
+
+
+def update_single_agency(client, agencies, index, cache=None):
+    """
+    Met à jour le temps d'attente de l'agence d'index donné en appelant l'API (revalidation si le cache est fourni).
+    Retourne True si le temps est mis à jour, False en cas d'échec, None si l'API répond sans temps exploitable.
+    """
+    agence_id = agencies.agency_id(index)
     
     # Vérification de la clé API
-    if not api_key:
+    if not client.api_key:
         print("Erreur : Clé API manquante.")
         return False
-    
-    # Vérification de l'ID de l'agence
-    if not isinstance(agence_id, int):
-        print(f"Erreur : ID d'agence invalide ({agence_id}).")
-        return False
 
+    name = agencies.name(index)
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        headers = cache.conditional_headers(agence_id) if cache else b""
+        response = client.get(f"{API_PATH}/{agence_id}", timeout=5, headers=headers)
+        if response.status_code == 304 and cache:
+            cache.revalidated(agence_id)
+            agencies.set_wait(index, agencies.wait(index))  # Temps confirmé : il redevient frais.
+            print(f"Temps inchangé pour {name} : {agencies.wait(index) // 60000} minutes")
+            return True
         if response.status_code == 200:
             data = response.json()
-            new_waiting_time = data.get('realMaxWaitingTimeMs', 0)
-            agency[2] = new_waiting_time
+            new_waiting_time = wait_value(data.get('realMaxWaitingTimeMs', 0))
+            if new_waiting_time is None:
+                # L'API a répondu (ce n'est pas une panne) mais sans temps utilisable : la valeur connue est gardée.
+                print(f"Temps d'attente invalide pour {name} : {data.get('realMaxWaitingTimeMs')}")
+                return None
+            agencies.set_wait(index, new_waiting_time)
+            if cache:
+                cache.store(agence_id, response.headers)
             print(f"Temps mis à jour pour {name} : {new_waiting_time // 60000} minutes")
             return True
         else:
@@ -949,220 +2335,892 @@ def update_single_agency(api_key, agency):
         print(f"Erreur réseau pour {name} (ID: {agence_id}) : {e}")
     return False
 
-def initialize_agencies(api_key, agencies):
+def initialize_agencies(client, agencies):
     """
-    Met à jour le temps d'attente pour les agences dans le tableau.
+    Met à jour le temps d'attente pour les agences de la table.
     """
-    for agency in agencies:
-        success = update_agency_waiting_time(api_key, agency)
+    for index in range(agencies.count()):
+        success = update_agency_waiting_time(client, agencies, index)
         if not success:
-            print(f"Impossible de mettre à jour {agency[1]}")
-        gc.collect()
+            print(f"Impossible de mettre à jour {agencies.name(index)}")
 
-def update_agency_waiting_time(api_key, agency):
+def update_agency_waiting_time(client, agencies, index):
     """
     Met à jour le temps d'attente pour une agence spécifique.
-    agency : [ID, Nom, Temps] -> Met à jour Temps avec 'realMaxWaitingTimeMs'.
+    agencies : AgencyStore -> met à jour le temps de l'agence index avec 'realMaxWaitingTimeMs'.
     """
-    agency_id = agency[0]  # Récupère l'ID de l'agence
-    url = f"https://api.opt.nc/temps-attente-agences/agences/{agency_id}"
-    headers = {"x-apikey": api_key, "Accept": "application/json"}
+    agency_id = agencies.agency_id(index)  # Récupère l'ID de l'agence
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        gc.collect()  # Libérer la mémoire après la requête
+        response = client.get(f"{API_PATH}/{agency_id}", timeout=10)
 
         if response.status_code == 200:
             data = response.json()
             waiting_time = data.get("realMaxWaitingTimeMs", 0)
-            agency[2] = waiting_time  # Mise à jour du temps dans le tableau
-            print(f"Temps mis à jour pour {agency[1]} : {waiting_time // 60000} minutes")
+            agencies.set_wait(index, waiting_time)  # Mise à jour du temps dans la table
+            print(f"Temps mis à jour pour {agencies.name(index)} : {waiting_time // 60000} minutes")
             return True
         else:
-            print(f"Erreur API {response.status_code} pour {agency[1]}")
+            print(f"Erreur API {response.status_code} pour {agencies.name(index)}")
     except Exception as e:
-        print(f"Erreur lors de la mise à jour pour {agency[1]} : {e}")
+        print(f"Erreur lors de la mise à jour pour {agencies.name(index)} : {e}")
     return False
 
 
 
-# Fonction pour gérer la pression des boutons
-def handle_button_press(cu, display):
-    """Gère les pressions des boutons A et D sur tous les écrans et ajuste le volume."""
-    if cu.is_pressed(CosmicUnicorn.SWITCH_A):  # Si le bouton A est pressé
-        display.toggle_sound()  # Active ou désactive le son
-    if cu.is_pressed(CosmicUnicorn.SWITCH_D):  # Si le bouton D est pressé pour redémarrer
-        print("Bouton D pressé - Redémarrage...")
-        time.sleep(1)  # Attendre 1 seconde avant le redémarrage
-        machine.reset()  # Redémarre la carte
-    display.adjust_volume()  # Ajuste le volume avec les boutons de volume
+# Instantané des agences sur la flash : affichage immédiat au démarrage, avant tout accès réseau.
+# Format : "AGC1", nombre d'agences (H), date d'enregistrement (I), puis pour chaque agence
+# ID (I), temps d'attente en ms (I), longueur du nom (B) et nom en UTF-8.
+SNAPSHOT_FILE = "agences.bin"
+SNAPSHOT_MAGIC = b"AGC1"
+SNAPSHOT_SAVE_INTERVAL = 600  # Secondes minimum entre deux écritures de l'instantané (usure de la flash).
+SNAPSHOT_MAX_AGE = 6000  # Âge (s) donné aux agences d'un instantané trop ancien ou de date inconnue (indicateur à 99 min).
 
 
-# Fonction qui gère la boucle dans la fonction principale main() pour l'affichage des agences
-def main_loop(display, start_time, synced, api_key, wlan, tableau_agences):
-    display.display_mode = 3  # Définir le mode agences
-    display.clear()
-    display.display_message_frame_2("WAIT")
-    print("Démarrage de la boucle principale - affichage initial WAIT")
-    time.sleep(2)
+def save_agency_snapshot(agencies, path=SNAPSHOT_FILE):
+    """Enregistre la table des agences (écriture dans un fichier temporaire puis renommage)."""
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack("<HI", agencies.count(), time.time()))
+            names = memoryview(agencies.names)
+            for index in range(agencies.count()):
+                start, end = agencies.offsets[index], agencies.offsets[index + 1]
+                f.write(struct.pack("<IIB", agencies.ids[index], agencies.waits[index], end - start))
+                f.write(names[start:end])
+        os.rename(temp_path, path)  # Un instantané coupé en cours d'écriture ne remplace jamais le précédent.
+        return True
+    except (OSError, ValueError) as e:
+        print(f"Erreur lors de l'enregistrement de l'instantané : {e}")
+        return False
 
-    current_index = 0
-    next_index = (current_index + 1) % len(tableau_agences)
 
-    # Mise à jour initiale uniquement pour la première agence
-    if not update_single_agency(api_key, tableau_agences[current_index]):
-        print(f"Erreur initiale de mise à jour pour {tableau_agences[current_index][1]}")
+def load_agency_snapshot(path=SNAPSHOT_FILE):
+    """Relit l'instantané des agences. Retourne (AgencyStore, date d'enregistrement) ou (None, 0)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None, 0  # Pas encore d'instantané (premier démarrage).
+    if data[:4] != SNAPSHOT_MAGIC:
+        print("Instantané des agences ignoré : format inconnu.")
+        return None, 0
+    agencies = AgencyStore()
+    try:
+        count, saved_at = struct.unpack_from("<HI", data, 4)
+        # Les temps relus ont l'âge de l'instantané ; RTC pas encore à l'heure : âge inconnu, compté comme ancien
+        now = time.time()
+        age = now - saved_at if saved_at <= now else SNAPSHOT_MAX_AGE
+        fetched = time.ticks_add(time.ticks_ms(), -min(age, SNAPSHOT_MAX_AGE) * 1000)
+        offset = 10
+        for _ in range(count):
+            agency_id, waiting_time, length = struct.unpack_from("<IIB", data, offset)
+            offset += 9
+            agencies.append(agency_id, data[offset:offset + length].decode(), waiting_time, fetched)
+            offset += length
+    except (ValueError, UnicodeError):
+        print("Instantané des agences ignoré : fichier corrompu.")
+        return None, 0
+    return (agencies.freeze() if agencies.count() else None), saved_at
+
+
+# Paramètres du second cœur réseau
+REFRESH_INTERVAL = 10  # Secondes entre deux rafraîchissements d'agence (durée d'affichage d'une agence).
+LOAD_RETRIES = 5  # Tentatives de chargement de la liste des agences au démarrage.
+LOAD_RETRY_DELAY = 5  # Secondes entre deux tentatives de chargement.
+REFRESH_BUDGET = 6  # Requêtes API par minute au plus (liste groupée et appels par agence confondus).
+REFRESH_BURST = 2  # Requêtes qui peuvent être accumulées puis envoyées d'affilée.
+REFRESH_MAX_AGE = 300  # Secondes : au-delà, une agence est rafraîchie en priorité, même si elle ne bouge pas.
+THRESHOLD_MARGIN_MS = 120000  # Proximité d'un seuil d'humeur qui augmente la priorité d'une agence.
+VOLATILITY_SCALE = 60000  # Variation (ms de temps d'attente par minute) qui double la priorité d'une agence.
+MOOD_NEUTRAL_MS = 300000  # Temps d'attente à partir duquel le smiley est neutre (5 minutes).
+MOOD_SAD_MS = 600000  # Temps d'attente à partir duquel le smiley est triste (10 minutes).
+BREAKER_THRESHOLD = 3  # Échecs consécutifs qui ouvrent le disjoncteur d'un endpoint.
+BREAKER_BASE_DELAY = 10  # Secondes d'ouverture après le premier déclenchement.
+BREAKER_MAX_DELAY = 300  # Secondes d'ouverture maximales (le délai double à chaque sonde ratée).
+
+# États d'un disjoncteur
+BREAKER_CLOSED = 0  # Appels autorisés.
+BREAKER_OPEN = 1  # Aucun appel jusqu'à l'échéance.
+BREAKER_HALF_OPEN = 2  # Un seul appel de sonde décide de la reprise.
+
+
+# Disjoncteur d'un endpoint de l'API : après BREAKER_THRESHOLD échecs consécutifs, plus aucun appel
+# pendant un délai exponentiel avec gigue ; à l'échéance, une seule requête de sonde referme le
+# disjoncteur si elle réussit, ou le rouvre pour un délai doublé.
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self.state = BREAKER_CLOSED
+        self.failures = 0  # Échecs consécutifs.
+        self.delay = BREAKER_BASE_DELAY * 1000  # Délai d'ouverture courant (ms, avant gigue).
+        self.open_until = time.ticks_ms()
+        self.trips = 0  # Nombre d'ouvertures.
+        self.skipped = 0  # Appels évités pendant l'ouverture.
+
+    def allow(self):
+        """Retourne True si un appel peut partir (en demi-ouverture : la sonde, une seule fois)."""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN and time.ticks_diff(time.ticks_ms(), self.open_until) >= 0:
+            self.state = BREAKER_HALF_OPEN
+            print(f"Disjoncteur {self.name} : sonde")
+            return True
+        self.skipped += 1
+        return False
 
-    while True:
-        try:
-            wifi_status = display.check_wifi_status(wlan)
-            display.update_led_wifi_status(wifi_status)
-
-            # Récupération des informations de l'agence
-            agence_id, name, waiting_time = tableau_agences[current_index]
-            mood = 'happy' if waiting_time < 300000 else 'neutral' if waiting_time < 600000 else 'sad'
-
-            # Affichage des informations
-            display.clear()
-            #display.draw_frame(0, 6, 'YELLOW')
-            display.draw_text_opt()  # Sigle OPT
-            display.draw_smiley(mood)
-            display.set_transition_variable(name)
-            display.update_led_sound_status()
-            print(f"Agence : {name}, Temps d'attente : {waiting_time // 60000} min")
-
-            # Gestion des boutons A, B, C, D
-            for _ in range(100):
-                if display.cu.is_pressed(display.cu.SWITCH_A):
-                    display.toggle_sound()
-
-                if display.cu.is_pressed(display.cu.SWITCH_B):
-                    display.toggle_loop_pause()
-
-                if display.cu.is_pressed(display.cu.SWITCH_C):
-                    print("Bouton C pressé - Changement d'écran.")
-                    return
-
-                if display.cu.is_pressed(display.cu.SWITCH_D):
-                    print("Bouton D pressé - Reboot de la matrice.")
-                    time.sleep(0.5)
-                    machine.reset()
-
-                if not display.loop_paused:
-                    display.scroll_text(display.transition_var)
-                    display.display_clock(start_time, synced)
+    def record(self, success):
+        """Enregistre le résultat d'un appel autorisé par allow()."""
+        if success:
+            if self.state != BREAKER_CLOSED:
+                print(f"Disjoncteur {self.name} : refermé ({self.skipped} appels évités)")
+            self.state = BREAKER_CLOSED
+            self.failures = 0
+            self.delay = BREAKER_BASE_DELAY * 1000
+            self.skipped = 0
+            return
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN:
+            self.delay = min(self.delay * 2, BREAKER_MAX_DELAY * 1000)  # Sonde ratée : délai doublé.
+            self.trip()
+        elif self.failures >= BREAKER_THRESHOLD:
+            self.trip()
+
+    def trip(self):
+        """Ouvre le disjoncteur pour une durée tirée entre la moitié et la totalité du délai courant."""
+        half = self.delay // 2
+        wait = half + (random.getrandbits(16) * half >> 16)  # Gigue : les réessais ne tombent pas en rafale.
+        self.state = BREAKER_OPEN
+        self.open_until = time.ticks_add(time.ticks_ms(), wait)
+        self.trips += 1
+        print(f"Disjoncteur {self.name} : ouvert pour {wait // 1000} s après {self.failures} échecs")
+
+    def is_closed(self):
+        return self.state == BREAKER_CLOSED
+
+
+# Ordonnanceur des rafraîchissements par agence, indépendant de l'ordre d'affichage : chaque
+# requête consomme un jeton d'un budget de REFRESH_BUDGET requêtes par minute, et l'agence appelée
+# est celle dont la priorité est la plus forte. La priorité croît avec le temps écoulé depuis le
+# dernier relevé, multiplié par la vitesse de variation récente de l'agence et par sa proximité
+# d'un seuil d'humeur (5 / 10 minutes).
+class RefreshScheduler:
+    def __init__(self, budget=REFRESH_BUDGET, min_age=CACHE_TTL):
+        self.interval = 60000 // budget  # Millisecondes de crédit par requête.
+        self.credit = self.interval  # Crédit disponible (ms), plafonné à REFRESH_BURST requêtes.
+        self.refilled = time.ticks_ms()
+        self.min_age = min_age * 1000  # Pas de nouvel appel tant que le relevé a moins de CACHE_TTL (seul juge de la fraîcheur).
+        self.fetched = array('I')  # Instant (ticks_ms) du dernier relevé de chaque agence.
+        self.values = array('I')  # Dernier temps d'attente relevé (ms).
+        self.volatility = array('I')  # Variation récente lissée (ms de temps d'attente par minute).
+        self.known = bytearray()  # 1 si l'agence a déjà été relevée au moins une fois.
+        self.requests = 0  # Requêtes accordées.
+        self.forced = 0  # Agences rafraîchies parce que trop anciennes.
+
+    def reset(self, agencies, known=True):
+        """Repart d'une nouvelle liste d'agences (known : temps d'attente déjà fournis par la liste)."""
+        count = agencies.count()
+        now = time.ticks_ms()
+        since = now if known else time.ticks_add(now, -REFRESH_MAX_AGE * 1000)  # Inconnues : à relever d'abord.
+        self.fetched = array('I', [since] * count)
+        self.values = array('I', agencies.waits)
+        self.volatility = array('I', [0] * count)
+        self.known = bytearray([1 if known else 0] * count)
+
+    def available(self):
+        """Retourne True si le budget permet une requête maintenant."""
+        now = time.ticks_ms()
+        self.credit = min(self.credit + time.ticks_diff(now, self.refilled), REFRESH_BURST * self.interval)
+        self.refilled = now
+        return self.credit >= self.interval
+
+    def spend(self):
+        """Consomme le jeton d'une requête accordée par available()."""
+        self.credit -= self.interval
+        self.requests += 1
+
+    def record(self, index, waiting_time):
+        """Enregistre un relevé et met à jour la variation lissée de l'agence."""
+        now = time.ticks_ms()
+        if self.known[index]:
+            elapsed = max(time.ticks_diff(now, self.fetched[index]), 1000)
+            change = abs(waiting_time - self.values[index]) * 60000 // elapsed  # ms par minute
+            self.volatility[index] = (self.volatility[index] * 3 + min(change, 10 * VOLATILITY_SCALE)) // 4
+        self.known[index] = 1
+        self.values[index] = waiting_time
+        self.fetched[index] = now
+
+    def priority(self, index, now, hint):
+        """Priorité de rafraîchissement d'une agence (0 = relevé encore frais)."""
+        age = time.ticks_diff(now, self.fetched[index])
+        if age < self.min_age:
+            return 0
+        if age >= REFRESH_MAX_AGE * 1000:
+            return age * 100  # Trop ancienne : passe devant toutes les autres.
+        weight = 1 + self.volatility[index] / VOLATILITY_SCALE
+        wait = self.values[index]
+        near = min(abs(wait - MOOD_NEUTRAL_MS), abs(wait - MOOD_SAD_MS))
+        if near < THRESHOLD_MARGIN_MS:
+            weight += 2 * (THRESHOLD_MARGIN_MS - near) / THRESHOLD_MARGIN_MS
+        if index == hint:
+            weight += 1  # Prochaine agence affichée : simple bonus, l'ordre d'affichage ne décide pas.
+        return age * weight
+
+    def pick(self, candidates, hint=-1):
+        """Retourne l'agence la plus prioritaire parmi candidates, ou -1 si toutes sont fraîches."""
+        now = time.ticks_ms()
+        best = -1
+        best_priority = 0
+        for index in candidates:
+            value = self.priority(index, now, hint)
+            if value > best_priority:
+                best, best_priority = index, value
+        if best >= 0 and time.ticks_diff(now, self.fetched[best]) >= REFRESH_MAX_AGE * 1000:
+            self.forced += 1
+        return best
+
+    def wait_ms(self):
+        """Délai avant le prochain jeton."""
+        return max(0, self.interval - self.credit)
+
+    def stats(self):
+        """Résumé des requêtes accordées et des variations suivies."""
+        moving = sum(1 for value in self.volatility if value >= VOLATILITY_SCALE // 4)
+        return f"{self.requests} requêtes ({self.forced} forcées), {moving}/{len(self.volatility)} agences en mouvement"
+
+
+# Classe qui exécute tout le trafic réseau (HTTP et NTP) sur le second cœur du RP2040.
+class NetworkWorker:
+    def __init__(self, api_key, cache_ttl=CACHE_TTL):
+        """Prépare la table d'agences double tampon et le verrou partagé avec le cœur d'affichage."""
+        self.client = HttpClient(API_HOST, api_key)  # Connexion HTTPS persistante, utilisée uniquement sur ce cœur.
+        self.cache = AgencyCache()  # Validateurs des appels par agence.
+        self.lock = _thread.allocate_lock()  # Protège l'échange des tampons et les demandes du cœur 0.
+        self.tables = [AgencyStore(), AgencyStore()]  # Double tampon : une table publiée (lue par l'affichage) et une table de travail.
+        self.front = 0  # Index de la table publiée.
+        self.version = 0  # Incrémenté à chaque publication.
+        self.loaded = False  # Vrai dès que la liste des agences est publiée.
+        self.load_failed = False  # Vrai si la liste n'a pas pu être chargée après LOAD_RETRIES tentatives.
+        self.clock = NtpClock()  # Heure affichée, synchronisée par NTP et corrigée de la dérive.
+        self.requested = -1  # Prochaine agence affichée (indication de l'affichage, bonus de priorité).
+        self.scheduler = RefreshScheduler(min_age=cache_ttl)  # Choix des agences à rafraîchir et budget de requêtes.
+        self.missing = []  # Index des agences absentes de la dernière réponse groupée (rafraîchies une par une).
+        self.last_batch = time.ticks_ms()  # Instant du dernier rafraîchissement groupé.
+        self.batch_supported = True  # Faux si la liste /agences/iot ne contient pas les temps d'attente.
+        self.seeded = False  # Vrai si la table publiée vient de l'instantané de la flash.
+        self.monitor = None  # Moniteur de connectivité dont ce cœur fait la connexion initiale.
+        self.wifi_failed = False  # Vrai si le WiFi n'a pas pu être connecté (démarrage sans instantané).
+        self.saved_version = -1  # Version de la table enregistrée dans l'instantané.
+        self.last_save = time.ticks_ms()
+        self.list_breaker = CircuitBreaker("liste")  # Endpoint /agences/iot.
+        self.agency_breaker = CircuitBreaker("agence")  # Endpoint /agences/{id}.
+
+    def seed(self, agencies):
+        """Publie la table lue sur la flash en attendant sa revalidation par l'API."""
+        with self.lock:
+            self.tables[1 - self.front] = agencies.copy()
+            self.tables[self.front] = agencies
+            self.version += 1
+            self.saved_version = self.version  # Déjà sur la flash.
+            self.loaded = True
+        self.seeded = True
+
+    def start(self):
+        """Lance la boucle réseau sur le second cœur."""
+        _thread.start_new_thread(self.run, ())
+
+    # --- Accès depuis le cœur d'affichage (jamais bloquants sur le réseau) ---
+
+    def count(self):
+        """Retourne le nombre d'agences publiées."""
+        return self.tables[self.front].count()
+
+    def published(self):
+        """Retourne la table publiée, lue directement par index (chaque lecture est un simple élément de tableau)."""
+        return self.tables[self.front]
+
+    def request(self, index):
+        """Indique au second cœur l'agence qui sera affichée ensuite."""
+        with self.lock:
+            self.requested = index
+
+    # --- Boucle du second cœur ---
+
+    def save_snapshot(self, force=False):
+        """Enregistre la table publiée sur la flash si elle a changé, au plus une fois par SNAPSHOT_SAVE_INTERVAL."""
+        if self.version == self.saved_version:
+            return
+        if not force and time.ticks_diff(time.ticks_ms(), self.last_save) < SNAPSHOT_SAVE_INTERVAL * 1000:
+            return
+        self.last_save = time.ticks_ms()
+        version = self.version
+        if save_agency_snapshot(self.tables[self.front]):
+            self.saved_version = version
+
+    def connect(self):
+        """Connecte le WiFi depuis ce cœur. Sur instantané, réessaie jusqu'à réussite."""
+        monitor = self.monitor
+        boot.begin(BOOT_WIFI)
+        while connect_wifi(monitor.ssid, monitor.password, wlan=monitor.wlan) is None:
+            if not self.seeded:
+                self.wifi_failed = True  # Rien à afficher sans WiFi : le cœur 0 affiche NO WIFI.
+                return False
+            time.sleep(LOAD_RETRY_DELAY)
+        monitor.sample()  # Publie le lien établi pour l'affichage
+        boot.done(BOOT_WIFI)
+        return True
+
+    def sync_clock(self):
+        """Synchronise l'heure par NTP (appelée uniquement depuis ce cœur)."""
+        boot.begin(BOOT_NTP)
+        self.clock.sync()
+        boot.done(BOOT_NTP)
+
+    def publish(self, index, waiting_time):
+        """Écrit un temps d'attente dans la table de travail puis l'échange avec la table publiée."""
+        back = 1 - self.front
+        self.tables[back].set_wait(index, waiting_time)
+        with self.lock:
+            self.front = back  # Échange des tampons : la table de travail devient la table publiée.
+            self.version += 1
+        self.tables[1 - back].sync_from(self.tables[back], index)  # Resynchronise l'ancienne table publiée.
+
+    def publish_all(self):
+        """Publie toute la table de travail (après un rafraîchissement groupé)."""
+        back = 1 - self.front
+        with self.lock:
+            self.front = back
+            self.version += 1
+        self.tables[1 - back].sync_from(self.tables[back])  # Resynchronise l'ancienne table publiée.
+
+    def find_missing(self, agencies, wait_times):
+        """Retourne les index des agences sans temps d'attente dans la réponse groupée."""
+        return [index for index in range(agencies.count()) if agencies.ids[index] not in wait_times]
+
+    def refresh_batch(self):
+        """Rafraîchit les temps d'attente de toutes les agences avec une seule requête sur /agences/iot.
+
+        Les temps sont écrits directement dans la table de travail ; la table n'est reconstruite
+        (noms compris) que si la liste des agences a changé.
+        """
+        self.last_batch = time.ticks_ms()
+        back = self.tables[1 - self.front]
+        received = bytearray(back.count())
+        same = load_wait_times_from_api(self.client, back, received)
+        if same is None:
+            back.sync_from(self.tables[self.front])  # Annule les temps écrits avant l'échec.
+            self.missing = list(range(back.count()))  # Échec : repli sur les appels par agence.
+            return False
+        if not same:
+            print("Liste des agences modifiée : rechargement complet.")
+            back.sync_from(self.tables[self.front])
+            return self.reload()
+        self.publish_all()
+        self.missing = [index for index in range(back.count()) if not received[index]]
+        for index in range(back.count()):
+            if received[index]:
+                self.scheduler.record(index, back.waits[index])
+        print(f"Rafraîchissement groupé : {back.count() - len(self.missing)}/{back.count()} agences à jour")
+        print(f"HTTP : {self.client.stats()}")
+        return True
+
+    def install(self, agencies, wait_times):
+        """Publie une nouvelle liste d'agences (wait_times : {ID: temps} fournis par la liste)."""
+        self.last_batch = time.ticks_ms()
+        self.missing = self.find_missing(agencies, wait_times)
+        self.batch_supported = bool(wait_times)
+        self.scheduler.reset(agencies, self.batch_supported)
+        if 0 in self.missing:
+            update_single_agency(self.client, agencies, 0, self.cache)  # Première agence prête à l'affichage.
+            self.scheduler.record(0, agencies.wait(0))
+        back = agencies.copy()
+        with self.lock:
+            self.tables[1 - self.front] = back
+            self.tables[self.front] = agencies
+            self.version += 1
+            self.loaded = True
+
+    def reload(self):
+        """Recharge la liste complète (agences ajoutées ou retirées) et la publie."""
+        wait_times = {}
+        agencies = load_agencies_from_api(self.client, wait_times)
+        if not agencies:
+            return False
+        self.install(agencies, wait_times)
+        self.save_snapshot(force=True)  # Nouvelle liste : l'instantané est remplacé tout de suite.
+        return True
+
+    def load(self):
+        """Charge la liste des agences avec plusieurs tentatives puis la publie."""
+        boot.begin(BOOT_LIST)
+        for attempt in range(LOAD_RETRIES):
+            wait_times = {}
+            agencies = load_agencies_from_api(self.client, wait_times)
+            if agencies:
+                self.install(agencies, wait_times)
+                boot.done(BOOT_LIST)
+                self.save_snapshot(force=True)  # Nouvelle liste : l'instantané est remplacé tout de suite.
+                return True
+            print(f"Chargement des agences : tentative {attempt + 1}/{LOAD_RETRIES} échouée")
+            time.sleep(LOAD_RETRY_DELAY)
+        if self.seeded:
+            print("Liste des agences non revalidée : affichage de l'instantané conservé.")
+        else:
+            self.load_failed = True
+        return False
 
-                display.adjust_brightness()
-                display.adjust_volume()
-                time.sleep(0.1)
+    def degraded(self):
+        """Retourne True si le disjoncteur d'un endpoint utilisé n'est pas refermé : les temps affichés ne sont plus rafraîchis."""
+        if self.batch_supported and not self.list_breaker.is_closed():
+            return True
+        return bool(self.missing) and not self.agency_breaker.is_closed()
 
-            # Mise à jour de l'agence suivante
-            if not update_single_agency(api_key, tableau_agences[next_index]):
-                print(f"Échec de mise à jour pour {tableau_agences[next_index][1]}")
+    def run(self):
+        """Boucle du second cœur : WiFi, NTP et chargement de la liste, puis rafraîchissement des agences."""
+        if self.monitor and not self.connect():
+            return
+        self.sync_clock()  # Une seule requête UDP par serveur, relevées ensemble : la liste n'attend que NTP_TIMEOUT_MS au plus
+        if not self.load():
+            if not self.seeded:
+                return
+            self.scheduler.reset(self.tables[self.front], False)  # Instantané : tout est à relever.
+
+        while True:
+            if self.monitor:
+                self.monitor.poll()  # Lien WiFi relevé (et reconnexion relancée) depuis ce cœur uniquement
+            if self.clock.due():
+                self.sync_clock()  # Resynchronisation planifiée d'après la dérive, ou nouvel essai après un échec
+            self.clock.rebase()
+
+            scheduler = self.scheduler
+
+            # Une requête groupée par rotation complète de l'affichage (reportée tant que son disjoncteur est ouvert)
+            if self.batch_supported and time.ticks_diff(time.ticks_ms(), self.last_batch) >= self.count() * REFRESH_INTERVAL * 1000:
+                if scheduler.available() and self.list_breaker.allow():
+                    scheduler.spend()
+                    self.list_breaker.record(self.refresh_batch())
+
+            # Appel par agence uniquement pour celles absentes de la réponse groupée, choisies par priorité
+            if self.missing and scheduler.available():
+                index = scheduler.pick(self.missing, self.requested)
+                if index >= 0 and self.agency_breaker.allow():
+                    scheduler.spend()
+                    back = self.tables[1 - self.front]
+                    updated = update_single_agency(self.client, back, index, self.cache)
+                    if updated:
+                        self.publish(index, back.waits[index])
+                        scheduler.record(index, back.waits[index])
+                    self.agency_breaker.record(updated is not False)  # Une réponse sans temps valide n'est pas une panne.
+                    if scheduler.requests % self.count() == 0:
+                        print(f"Rafraîchissements : {scheduler.stats()} / Cache : {self.cache.stats()} / HTTP : {self.client.stats()}")
+
+            self.save_snapshot()
+
+            # Attend le prochain jeton du budget de requêtes (au moins 100 ms, au plus 1 s)
+            time.sleep(min(max(scheduler.wait_ms(), 100), 1000) / 1000)
+
+
+# Périodes des tâches du runtime uasyncio (millisecondes)
+FRAME_RATE = 10  # Frames par seconde de l'écran agences, modifiable par FRAME_RATE dans information.env.
+FRAME_PERIOD_MS = 100  # Période des tâches de fond cadencées comme l'affichage par défaut.
+REPEAT_PERIOD_MS = 100  # Répétition des boutons maintenus (volume, luminosité).
+TONE_PERIOD_MS = 20  # Cadence du séquenceur de bips pendant qu'un bip joue.
+AGENCY_POLL_PERIOD_MS = 200  # Surveillance des publications du second cœur.
+CLOCK_PERIOD_MS = 250  # Mise à jour de l'heure affichée.
+WIFI_DISPLAY_PERIOD_MS = 500  # Lecture de l'état du lien publié par le second cœur.
+TASK_STATS_INTERVAL = 60  # Secondes entre deux affichages des latences des tâches.
+
+
+# Cadenceur de frames à fréquence fixe : les échéances sont absolues (ticks_ms), la tâche ne dort
+# que le reste du budget de la frame et, en cas de surcharge, saute les créneaux manqués au lieu
+# de dériver. Mesure aussi le temps de rendu de chaque frame, ses flushes et ses pixels écrits.
+class FrameScheduler:
+    def __init__(self, rate=FRAME_RATE):
+        self.rate = rate  # Frames par seconde visées.
+        self.period = 1000 // rate  # Budget d'une frame (ms).
+        self.frame = 0  # Numéro du créneau courant (les créneaux sautés sont comptés).
+        self.steps = 1  # Créneaux écoulés depuis la frame précédente (1 sans surcharge).
+        self.deadline = time.ticks_ms()  # Début du créneau courant.
+        self.started = self.deadline  # Début du rendu de la frame courante.
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0  # Frames rendues.
+        self.total = 0  # Somme des temps de rendu (ms).
+        self.min = 0
+        self.max = 0
+        self.overruns = 0  # Frames plus longues que le budget.
+        self.skipped = 0  # Créneaux sautés à cause des dépassements.
+        self.max_flushes = 0  # Plus grand nombre de flushes dans une frame (1 attendu au plus).
+        self.pixels = 0  # Pixels écrits sur l'ensemble des frames.
+
+    def start(self):
+        """(Re)cale les échéances sur l'instant présent, par exemple après une pause."""
+        self.deadline = time.ticks_ms()
+        self.steps = 1
+
+    def begin(self):
+        """Marque le début du rendu de la frame."""
+        self.started = time.ticks_ms()
+
+    def output(self, flushes, pixels):
+        """Enregistre le bilan d'une frame retourné par end_frame() : flushes vers la matrice et pixels écrits."""
+        if flushes > self.max_flushes:
+            self.max_flushes = flushes
+        self.pixels += pixels
+
+    async def wait(self, stats=None):
+        """Termine la frame : enregistre son temps de rendu puis dort jusqu'au prochain créneau."""
+        now = time.ticks_ms()
+        elapsed = time.ticks_diff(now, self.started)
+        if self.frames == 0 or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.frames += 1
+        self.total += elapsed
+
+        # Prochaine échéance absolue ; les créneaux déjà passés sont sautés
+        self.steps = 1
+        self.deadline = time.ticks_add(self.deadline, self.period)
+        late = time.ticks_diff(now, self.deadline)
+        if late >= 0:
+            self.overruns += 1
+            missed = late // self.period + 1
+            self.skipped += missed
+            self.steps += missed
+            self.deadline = time.ticks_add(self.deadline, missed * self.period)
+        self.frame += self.steps
+
+        delay = time.ticks_diff(self.deadline, time.ticks_ms())
+        await asyncio.sleep_ms(delay)
+        if stats:
+            stats.record(time.ticks_diff(time.ticks_ms(), self.deadline))
+
+    def summary(self):
+        """Retourne les temps de rendu min/moy/max, les dépassements, créneaux sautés, flushes et pixels par frame puis remet à zéro."""
+        average = self.total // self.frames if self.frames else 0
+        text = (f"{self.frames} frames à {self.rate} fps, rendu {self.min}/{average}/{self.max} ms, {self.overruns} dépassements, "
+                f"{self.skipped} sautées, {self.max_flushes} flush/frame au plus, {self.pixels} pixels écrits")
+        self.reset_stats()
+        return text
+
+
+# Latence d'une tâche : retard entre l'échéance demandée à l'ordonnanceur et le réveil effectif
+# (ou, pour les boutons, entre l'interruption et le traitement de l'appui).
+class TaskStats:
+    def __init__(self, name):
+        self.name = name
+        self.count = 0  # Réveils mesurés.
+        self.total = 0  # Somme des retards (ms).
+        self.max = 0  # Plus grand retard (ms).
+
+    async def sleep_ms(self, ms):
+        """Rend la main pendant ms millisecondes et mesure le retard du réveil."""
+        deadline = time.ticks_add(time.ticks_ms(), ms)
+        await asyncio.sleep_ms(ms)
+        self.record(time.ticks_diff(time.ticks_ms(), deadline))
+
+    def record(self, late):
+        """Enregistre un retard (ms)."""
+        late = max(0, late)
+        self.count += 1
+        self.total += late
+        if late > self.max:
+            self.max = late
+
+    def summary(self):
+        """Retourne 'nom moyenne/max ms' puis remet les compteurs à zéro."""
+        average = self.total // self.count if self.count else 0
+        text = f"{self.name} {average}/{self.max} ms"
+        self.count = self.total = self.max = 0
+        return text
+
+
+# Runtime coopératif : une tâche par activité (rendu de l'écran courant, boutons, agences,
+# WiFi, horloge). Aucune ne bloque : le réseau tourne sur le second cœur et n'est qu'attendu ici.
+class App:
+    def __init__(self, display, worker, monitor, screens, frame_rate=FRAME_RATE):
+        self.display = display
+        self.worker = worker  # Second cœur : NTP, HTTP et table des agences.
+        self.monitor = monitor
+        self.screens = screens  # Fonctions app -> coroutine de chaque écran, dans l'ordre du bouton C.
+        self.mode = 0  # Index de l'écran courant.
+        self.screen_task = None  # Tâche de rendu de l'écran courant.
+        self.next_index = 0  # Agence affichée après la courante (préchargée par le second cœur).
+        self.prefetched = -1  # Dernière agence indiquée au second cœur.
+        self.clock_time = worker.clock.daytime()  # Heure locale affichée (secondes depuis minuit).
+        self.frames = FrameScheduler(frame_rate)  # Cadence de l'écran agences.
+        self.render_stats = TaskStats("rendu")
+        self.input_stats = TaskStats("appui")  # Délai entre l'interruption et la réaction à l'appui.
+        self.agency_stats = TaskStats("agences")
+        self.wifi_stats = TaskStats("wifi")
+        self.clock_stats = TaskStats("horloge")
+        self.task_stats = [self.render_stats, self.input_stats, self.agency_stats, self.wifi_stats, self.clock_stats]
+
+    def show(self, mode):
+        """Remplace la tâche de rendu par celle de l'écran demandé."""
+        if self.screen_task:
+            self.screen_task.cancel()
+        self.mode = mode
+        self.screen_task = asyncio.create_task(self.screens[mode](self))
+        memory.sample(MEMORY_SCREEN)
+
+    def on_press(self, switch):
+        """Traite un appui (front montant) sur A, B, C ou D."""
+        display = self.display
+        if switch == CosmicUnicorn.SWITCH_A:
+            display.toggle_sound()  # Active ou désactive le son
+        elif switch == CosmicUnicorn.SWITCH_B:
+            if display.display_mode == 3:
+                display.toggle_loop_pause()
+        elif switch == CosmicUnicorn.SWITCH_C:
+            display.play_bip(500)
+            print("Passage à l'écran suivant.")
+            self.show((self.mode + 1) % len(self.screens))
+        elif switch == CosmicUnicorn.SWITCH_D:
+            print("Bouton D pressé - Redémarrage...")
+            machine.reset()  # Redémarre la carte
+
+    async def input_task(self):
+        """Consomme la file des boutons : appuis sur A à D, volume et luminosité tant qu'ils sont maintenus."""
+        display = self.display
+        buttons = display.buttons
+        repeat = (CosmicUnicorn.SWITCH_VOLUME_UP, CosmicUnicorn.SWITCH_VOLUME_DOWN,
+                  CosmicUnicorn.SWITCH_BRIGHTNESS_UP, CosmicUnicorn.SWITCH_BRIGHTNESS_DOWN)
+        while True:
+            buttons.settle()  # Fronts ignorés par l'anti-rebond : niveau relu à la fin du délai
+            event = buttons.pop()
+            while event:
+                switch, pressed, at = event
+                if pressed and switch not in repeat:
+                    self.on_press(switch)
+                    self.input_stats.record(time.ticks_diff(time.ticks_ms(), at))
+                event = buttons.pop()
+            if any(buttons.is_held(switch) for switch in repeat):
+                display.adjust_volume()  # Premier pas immédiat, puis répétition tant que le bouton est maintenu
+                display.adjust_brightness()
+                await asyncio.sleep_ms(REPEAT_PERIOD_MS)
+            elif buttons.unsettled_any():
+                await asyncio.sleep_ms(BUTTON_DEBOUNCE_MS)  # Relecture à la fin de l'anti-rebond
+            else:
+                await buttons.wait()  # Aucune scrutation : réveil par l'interruption
+
+    async def sound_task(self):
+        """Fait avancer le séquenceur de bips (cadence rapide seulement pendant un bip)."""
+        tones = self.display.tones
+        while True:
+            tones.tick()
+            await asyncio.sleep_ms(TONE_PERIOD_MS if tones.busy() else FRAME_PERIOD_MS)
+
+    async def agency_task(self):
+        """Indique au second cœur l'agence affichée ensuite."""
+        worker = self.worker
+        while True:
+            if self.display.display_mode == 3 and self.prefetched != self.next_index:
+                self.prefetched = self.next_index
+                worker.request(self.next_index)  # Simple indication : le second cœur choisit lui-même quoi rafraîchir
+            await self.agency_stats.sleep_ms(AGENCY_POLL_PERIOD_MS)
+
+    async def wifi_task(self):
+        """Suit l'état du lien publié par le second cœur et tient à jour les LEDs de l'écran agences."""
+        display = self.display
+        monitor = self.monitor
+        while True:
+            connected = monitor.connected  # Simple lecture : le relevé est fait par le second cœur
+            if connected != display.wifi_status:
+                display.wifi_status = connected
+                if display.display_mode == 3:
+                    display.update_led_wifi_status(connected)
+            await self.wifi_stats.sleep_ms(WIFI_DISPLAY_PERIOD_MS)
+
+    async def clock_task(self):
+        """Calcule l'heure locale affichée (Nouméa, UTC+11) sur l'horloge corrigée de la dérive."""
+        clock = self.worker.clock
+        while True:
+            self.clock_time = clock.daytime()
+            await self.clock_stats.sleep_ms(CLOCK_PERIOD_MS)
+
+    async def run(self):
+        """Lance les tâches, affiche le premier écran puis publie régulièrement les latences."""
+        for task in (self.input_task, self.sound_task, self.agency_task, self.wifi_task, self.clock_task):
+            asyncio.create_task(task())
+        self.show(self.mode)
+        while True:
+            await asyncio.sleep(TASK_STATS_INTERVAL)
+            print("Latence des tâches (moy/max) : " + ", ".join(stats.summary() for stats in self.task_stats))
+            print(f"Frames : {self.frames.summary()}")
+            print(f"Mémoire : {memory.summary()}")
+
+
+# Écran des agences : tâche de rendu à FRAME_RATE frames par seconde (l'agence change toutes les
+# REFRESH_INTERVAL secondes, comptées en créneaux de frame)
+async def main_loop(app):
+    display = app.display
+    worker = app.worker
+    frames = app.frames
+    display.display_mode = 3  # Définir le mode agences
+    if worker.count() == 0:
+        # Table pas encore publiée : WAIT jusqu'à sa publication, sinon la première agence est dessinée tout de suite
+        display.clear()
+        display.display_message_frame_2("WAIT")
+        print("Démarrage de la boucle principale - affichage initial WAIT")
+        while worker.count() == 0:
+            await asyncio.sleep_ms(AGENCY_POLL_PERIOD_MS)
 
-            current_index = next_index
-            next_index = (current_index + 1) % len(tableau_agences)
+    current_index = 0
+    app.next_index = (current_index + 1) % worker.count()
+    shown_id = -1  # ID de l'agence actuellement dessinée (-1 : dessin complet à faire).
+    shown_wait = -1  # Temps d'attente actuellement dessiné.
+    dwell = REFRESH_INTERVAL * frames.rate  # Durée d'affichage d'une agence, en créneaux de frame.
+    frames.start()
+    shown_frame = frames.frame
 
+    while True:
+        try:
+            frames.begin()
+            display.begin_frame()  # Un seul flush pour tout l'écran agence
+
+            # Passage à l'agence suivante (déjà rafraîchie par le second cœur)
+            if frames.frame - shown_frame >= dwell:
+                current_index = app.next_index
+                shown_id = -1
+            store = worker.published()  # Lecture par index de la table publiée, sans copie
+            if current_index >= store.count():
+                current_index = 0  # La liste a été remplacée par une liste plus courte.
+            app.next_index = (current_index + 1) % store.count()
+
+            # Dessin complet seulement pour une nouvelle agence ou un nouveau temps d'attente
+            agence_id = store.agency_id(current_index)
+            waiting_time = store.wait(current_index)
+            if agence_id != shown_id or waiting_time != shown_wait:
+                new_agency = agence_id != shown_id
+                mood = 'happy' if waiting_time < MOOD_NEUTRAL_MS else 'neutral' if waiting_time < MOOD_SAD_MS else 'sad'
+
+                # Affichage des informations : fond pré-rendu de l'humeur (sigle OPT et smiley) en une copie
+                display.draw_mood_screen(mood)
+                if new_agency:
+                    display.set_transition_variable(store.name(current_index))  # Seule chaîne créée par agence
+                display.update_led_sound_status()
+                print(f"Agence : {agence_id}, Temps d'attente : {waiting_time // 60000} min")
+                if new_agency:
+                    shown_frame = frames.frame
+                    display.play_mood_bips(mood)  # Bips en arrière-plan, sans retarder le rendu
+                shown_id = agence_id
+                shown_wait = waiting_time
+
+            if not display.loop_paused:
+                display.scroll_text(frames.steps)
+                display.display_clock(app.clock_time)
+
+            # Données plus rafraîchies (API en panne) : les derniers temps connus restent affichés avec leur âge
+            age = store.age(current_index)  # Âge du temps d'attente de l'agence affichée
+            stale = worker.degraded() or age > REFRESH_MAX_AGE + store.count() * REFRESH_INTERVAL
+            display.display_data_age(age // 60 if stale else -1)
+            if frames.frame % frames.rate < frames.steps:
+                memory.sample(MEMORY_RENDER)  # Une mesure par seconde de rendu
+
+            flushes, pixels = display.end_frame()  # Flush unique de la frame
+            frames.output(flushes, pixels)
         except Exception as e:
             print(f"Erreur dans la boucle : {e}")
-            time.sleep(2)
+            display.end_frame()
+        await frames.wait(app.render_stats)  # Même cadence après une erreur : l'écran reste réactif
 
 
 # Fonction main pour accéder aux différents affichages
-def main():
+async def main():
     """Fonction principale avec initialisation, gestion des écrans et affichage des agences."""
+    boot.begin(BOOT_DISPLAY)
     display = CosmicUnicornDisplay()
-    cu = display.cu  # Gestion des boutons
+    memory.sample(MEMORY_BOOT)
 
     # Étape 1 : Affichage "WAIT" initial
-    show_loading_screen(display, 0)
+    await show_loading_screen(display, 0)
     print("Affichage initial 'WAIT'")
+    boot.done(BOOT_DISPLAY)
 
     # Charger les informations WiFi et API
+    boot.begin(BOOT_CONFIG)
     credentials = load_credentials("information.env")
     if not credentials:
         print("Erreur : Informations de connexion non trouvées.")
-        stop_script(display)
+        await stop_script(display)
         return
 
     api_key = credentials.get('API_KEY')
     if not api_key:
         print("Erreur : Clé API manquante.")
-        stop_script(display)
+        await stop_script(display)
         return
 
-    wlan = connect_wifi(credentials['SSID'], credentials['WIFI_PASSWORD'], display)
-    if not wlan:
-        stop_script(display, wifi_issue=True)
-        return
-
-    show_loading_screen(display, 1)
-
-    # Synchronisation NTP
-    if not sync_time():
-        print("Échec de la synchronisation NTP.")
-    else:
-        print("Synchronisation NTP réussie.")
-    display.update_led_wifi_status(wlan.isconnected())
-
-    # Charger les agences via le premier endpoint
-    tableau_agences = load_agencies_from_api(api_key)
-    if not tableau_agences:
-        print("Erreur : Impossible de charger les agences.")
-        stop_script(display, api_issue=True)
-        return
-    print(f"{len(tableau_agences)} agences chargées avec succès.")
-
-    # Mise à jour uniquement de la première agence
-    if not update_single_agency(api_key, tableau_agences[0]):
-        print(f"Erreur : Échec de mise à jour initiale pour {tableau_agences[0][1]}.")
-
-    show_loading_screen(display, 2)
-
-    # Synchronisation de l'heure
-    synced = sync_time() if wlan else False
-    start_time = time.time()
+    # Le second cœur prend en charge le WiFi, NTP, le chargement des agences et leur rafraîchissement
+    try:
+        cache_ttl = int(credentials.get('CACHE_TTL_S', CACHE_TTL))
+    except ValueError:
+        print("Erreur : CACHE_TTL_S invalide, valeur par défaut utilisée.")
+        cache_ttl = CACHE_TTL
+    try:
+        frame_rate = max(1, min(50, int(credentials.get('FRAME_RATE', FRAME_RATE))))
+    except ValueError:
+        print("Erreur : FRAME_RATE invalide, valeur par défaut utilisée.")
+        frame_rate = FRAME_RATE
+    try:
+        display.qr_code = encode_qr(credentials.get('QR_URL', QR_URL))  # Encodé une seule fois, pour l'écran QR
+    except ValueError as e:
+        print(f"Erreur : {e}, adresse par défaut utilisée.")
+        display.qr_code = encode_qr(QR_URL)
+    boot.done(BOOT_CONFIG)
+    worker = NetworkWorker(api_key, cache_ttl)
+    monitor = ConnectivityMonitor(credentials['SSID'], credentials['WIFI_PASSWORD'])
+    worker.monitor = monitor  # Le second cœur fait la connexion initiale sur l'interface du moniteur.
+
+    # Avec un instantané sur la flash, l'affichage démarre tout de suite : la revalidation
+    # de la liste se fait en arrière-plan.
+    snapshot, saved_at = load_agency_snapshot()
+    if snapshot:
+        print(f"Instantané de {snapshot.count()} agences chargé (enregistré à {saved_at}), revalidation en arrière-plan.")
+        worker.seed(snapshot)
+    memory.sample(MEMORY_BOOT)
+    worker.start()
+
+    # Attente de la publication de la liste des agences (le cœur 0 ne fait aucun appel réseau)
+    wifi_shown = False
+    while not worker.loaded:
+        if worker.wifi_failed:
+            await stop_script(display, wifi_issue=True)
+            return
+        if worker.load_failed:
+            print("Erreur : Impossible de charger les agences.")
+            await stop_script(display, api_issue=True)
+            return
+        display.wifi_status = monitor.connected  # Publié par le second cœur
+        if not wifi_shown and monitor.connected:
+            wifi_shown = True
+            await show_loading_screen(display, 1)
+        await asyncio.sleep(0.1)
+    print(f"{worker.count()} agences chargées avec succès.")
+
+    await show_loading_screen(display, 2)
+    memory.sample(MEMORY_BOOT)
+    memory.configure()  # Collectes par seuil à partir d'ici
+    boot.finish()
+    print(boot.summary())
 
     # Initialisation des LEDs pour le son
     display.update_led_sound_status()
 
     # Configuration des modes d'affichage
     display_modes = [
-        display_welcome_screen,  # Écran d'accueil UNC/OPT
-        lambda d: display_info_screen(d, wlan.isconnected(), True, True),  # Statut API/WiFi/ENV
-        lambda d: display_legend_screen(d),  # Légendes des LEDs
-        lambda d: main_loop(d, start_time, synced, api_key, wlan, tableau_agences),  # Affichage des agences
-        lambda d: display_qr_code_screen(d)  # Écran QR Code Bit.ly
+        lambda app: display_welcome_screen(app.display),  # Écran d'accueil UNC/OPT
+        lambda app: display_info_screen(app.display, app.monitor.connected, True, True, memory, boot),  # Statut API/WiFi/ENV
+        lambda app: display_legend_screen(app.display),  # Légendes des LEDs
+        main_loop,  # Affichage des agences
+        lambda app: display_qr_code_screen(app.display)  # Écran QR Code (adresse QR_URL)
     ]
 
-    current_mode = 0
-    display_modes[current_mode](display)
-
-    # Boucle principale pour gérer les changements d'écran avec le bouton C
-    while True:
-        handle_button_press(cu, display)
-
-        # Bouton A : Activation/désactivation du son
-        if cu.is_pressed(cu.SWITCH_A):
-            display.toggle_sound()  # Change l'état du son et met à jour les LEDs
-            time.sleep(0.5)
-
-        # Bouton C : Basculer vers l'écran suivant
-        if cu.is_pressed(CosmicUnicorn.SWITCH_C):
-            current_mode = (current_mode + 1) % len(display_modes)
-            display.play_bip(500)
-            print("Passage à l'écran suivant.")
-            time.sleep(0.5)
-            display_modes[current_mode](display)
-
-        time.sleep(0.1)
+    await App(display, worker, monitor, display_modes, frame_rate).run()
 
 
 # Démarrer le programme avec la fonction main()
-main()
-
-
-
-
-
-
+asyncio.run(main())